@@ -3,13 +3,269 @@
 This compiler is written using 'rply' project 'https://github.com/alex/rply'
 For proper work of my compiler you need to install 'rply' from github manually
 because on PYPI there is older version.
+
+When paths of source files are passed as arguments, all of them are compiled
+in batch mode and report with result of every file is printed. With
+'--jobs' option files are compiled in several processes. Options '--check',
+'--emit' and '--stop-after' select which phases of compilation are run.
+Option '-O' selects optimization level, and '--enable-pass' and
+'--disable-pass' switch single passes of the level. Option '--profile'
+writes JSON report with time and memory of every phase of compilation.
 """
 
-from compiler.compiler import Compiler
-from config import PATH_TO_SOURCE_FILE, PATH_TO_OUTPUT_FILE
+import argparse
+import cProfile
+import sys
+import time
+from collections import Counter
+from dataclasses import replace
+
+from compiler.compiler import Compiler, CompilationResult
+from compiler.compilation_cache import CompilationCache
+from compiler.options import (CompilerOptions, EMIT_KINDS, PHASES,
+                              OPTIMIZATION_LEVELS)
+from compiler.pass_manager import PASSES, PassStatistics, get_options_of_pass
+from compiler.peephole import RULES as PEEPHOLE_RULES
+from compiler.profiler import write_profile_report, write_collapsed_stacks
+from compiler.parallel_compiler import compile_in_parallel
+
+
+def parse_arguments() -> argparse.Namespace:
+    argument_parser = argparse.ArgumentParser(
+        description="Translates simple 'C' code into 'masm' code")
+    argument_parser.add_argument(
+        'sources', nargs='*',
+        help="source files to compile, by default file from 'settings.json'")
+    argument_parser.add_argument(
+        '-o', '--output-dir', default=None,
+        help='directory for generated files, by default near source files')
+    argument_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of processes for batch mode, 0 means one per processor')
+    argument_parser.add_argument(
+        '--cache-dir', default=None,
+        help='directory of cache with results of previous compilations')
+    argument_parser.add_argument(
+        '--cache-size', type=int, default=64,
+        help='maximal size of the cache in megabytes')
+    argument_parser.add_argument(
+        '--check', action='store_true',
+        help='only report errors in source files, do not generate anything')
+    argument_parser.add_argument(
+        '--emit', action='append', choices=sorted(EMIT_KINDS),
+        help="kind of generated file, could be repeated, by default 'asm'")
+    argument_parser.add_argument(
+        '--stop-after', choices=PHASES, default=None,
+        help='last phase of compilation to run')
+    argument_parser.add_argument(
+        '-O', dest='optimization_level', type=int, default=2,
+        choices=sorted(OPTIMIZATION_LEVELS),
+        help='optimization level, 0 disables all optimizations except '
+             'short-circuit evaluation, that C requires, 1 runs only fast '
+             'local ones, by default 2')
+    argument_parser.add_argument(
+        '--enable-pass', action='append', default=[], choices=list(PASSES),
+        metavar='PASS',
+        help='run the pass at any optimization level, could be repeated, '
+             f"passes: {', '.join(PASSES)}")
+    argument_parser.add_argument(
+        '--disable-pass', action='append', default=[], choices=list(PASSES),
+        metavar='PASS', help='do not run the pass, could be repeated')
+    argument_parser.add_argument(
+        '--no-fold-constants', action='store_true',
+        help='disable constant folding and propagation')
+    argument_parser.add_argument(
+        '--helper-calls', action='store_true',
+        help='compute operations by calls of helper procedures')
+    argument_parser.add_argument(
+        '--keep-dead-functions', action='store_true',
+        help="generate functions, that are never called from 'main'")
+    argument_parser.add_argument(
+        '--warn-dead-functions', action='store_true',
+        help="warn about functions, that are never called from 'main'")
+    argument_parser.add_argument(
+        '--inline-threshold', type=int, default=None, metavar='N',
+        help='inline calls of not recursive functions with at most N nodes '
+             'in body, 0 disables inlining')
+    argument_parser.add_argument(
+        '--no-tail-calls', action='store_true',
+        help='disable elimination of tail calls and recursion')
+    argument_parser.add_argument(
+        '--no-strength-reduction', action='store_true',
+        help='multiply and divide by constants with imul and idiv')
+    argument_parser.add_argument(
+        '--no-fuse-comparisons', action='store_true',
+        help='compute values of conditions before jumps')
+    argument_parser.add_argument(
+        '--no-short-circuit', action='store_true',
+        help='evaluate both operands of && and ||')
+    argument_parser.add_argument(
+        '--disable-peephole', action='append', default=[],
+        choices=sorted(PEEPHOLE_RULES), metavar='RULE',
+        help='disable rule of peephole optimizer, could be repeated, '
+             f"rules: {', '.join(PEEPHOLE_RULES)}")
+    argument_parser.add_argument(
+        '--optimization-report', action='store_true',
+        help='print time and change of number of instructions of every '
+             'pass and number of instructions removed by every peephole '
+             'rule')
+    argument_parser.add_argument(
+        '--profile', default=None, metavar='REPORT',
+        help='write JSON report with wall and processor time, peak memory, '
+             'tokens and nodes of every phase of compilation')
+    argument_parser.add_argument(
+        '--profile-stats', default=None, metavar='FILE',
+        help="write 'cProfile' statistics of the whole run")
+    argument_parser.add_argument(
+        '--profile-stacks', default=None, metavar='FILE',
+        help='write collapsed stacks of the whole run for flame graphs')
+    arguments = argument_parser.parse_args()
+
+    profiles_run = (arguments.profile or arguments.profile_stats
+                    or arguments.profile_stacks)
+    if profiles_run and not arguments.sources:
+        argument_parser.error('profiling needs source files')
+    if ((arguments.profile_stats or arguments.profile_stacks)
+            and arguments.jobs != 1):
+        # Compilation in other processes is not seen by 'cProfile'
+        argument_parser.error(
+            "'cProfile' profiles compilation only with '--jobs 1'")
+    return arguments
+
+
+def get_compiler_options(arguments: argparse.Namespace) -> CompilerOptions:
+    if arguments.check:
+        return replace(CompilerOptions.check_only(),
+                       profile=arguments.profile is not None)
+    emit = arguments.emit if arguments.emit is not None else ['asm']
+    options = dict(OPTIMIZATION_LEVELS[arguments.optimization_level])
+    for name in arguments.enable_pass:
+        options.update(get_options_of_pass(name, enabled=True))
+    for name in arguments.disable_pass:
+        options.update(get_options_of_pass(name, enabled=False))
+
+    # Flags of single optimizations change options of the level only when
+    # they are passed
+    flags = {
+        'fold_constants': arguments.no_fold_constants,
+        'eliminate_dead_functions': arguments.keep_dead_functions,
+        'eliminate_tail_calls': arguments.no_tail_calls,
+        'reduce_strength': arguments.no_strength_reduction,
+        'fuse_comparisons': arguments.no_fuse_comparisons,
+        'short_circuit': arguments.no_short_circuit,
+        'inline_operations': arguments.helper_calls,
+    }
+    options.update((option, False) for option, is_disabled in flags.items()
+                   if is_disabled)
+    if arguments.warn_dead_functions:
+        options['warn_dead_functions'] = True
+    if arguments.inline_threshold is not None:
+        options['inline_threshold'] = arguments.inline_threshold
+    peephole_rules = options.get('peephole_rules', PEEPHOLE_RULES)
+    options['peephole_rules'] = frozenset(peephole_rules).difference(
+        arguments.disable_peephole)
+
+    return CompilerOptions(
+        emit=frozenset(emit),
+        stop_after=arguments.stop_after,
+        measure_passes=arguments.optimization_report,
+        profile=arguments.profile is not None,
+        **options
+    )
+
+
+def print_compilation_report(results: list[CompilationResult],
+                             wall_time: float) -> None:
+    for result in results:
+        status = 'OK' if result.succeeded else 'FAIL'
+        cached = ', cached' if result.from_cache else ''
+        emitted = ''
+        if result.emitted_files:
+            emitted = f" -> {', '.join(result.emitted_files)}"
+        print(f'{status:<4} {result.path_to_source_file}{emitted} '
+              f'({result.elapsed_time * 1000:.2f} ms{cached})')
+        if not result.succeeded:
+            print(f'     {result.message}'.replace('\n', '\n     '))
+        for warning in result.warnings:
+            print(f'     {warning}')
+
+    failed = sum(not result.succeeded for result in results)
+    total_time = sum(result.elapsed_time for result in results)
+    print(f'\nCompiled {len(results) - failed}/{len(results)} files'
+          f' in {total_time * 1000:.2f} ms'
+          f' (wall time {wall_time * 1000:.2f} ms)')
+
+
+def print_optimization_report(results: list[CompilationResult]) -> None:
+    pass_statistics: dict[str, PassStatistics] = dict()
+    removed_instructions = Counter()
+    for result in results:
+        for name, statistics in result.pass_statistics.items():
+            pass_statistics.setdefault(name, PassStatistics()).add(statistics)
+        removed_instructions.update(result.removed_instructions)
+
+    print('\nPasses:')
+    print(f'  {"pass":<26} {"runs":>6} {"time, ms":>10} {"instructions":>12}')
+    for name, statistics in pass_statistics.items():
+        print(f'  {name:<26} {statistics.runs:>6} '
+              f'{statistics.elapsed_time * 1000:>10.2f} '
+              f'{statistics.instruction_delta:>+12}')
+
+    print('\nInstructions removed by peephole rules:')
+    for rule in PEEPHOLE_RULES:
+        print(f'  {rule:<24} {removed_instructions[rule]:>8}')
+    print(f'  {"total":<24} {sum(removed_instructions.values()):>8}')
+
+
+def main() -> int:
+    arguments = parse_arguments()
+    options = get_compiler_options(arguments)
+
+    if not arguments.sources:
+        from config import PATH_TO_SOURCE_FILE, PATH_TO_OUTPUT_FILE
+
+        cmp = Compiler(PATH_TO_SOURCE_FILE, PATH_TO_OUTPUT_FILE,
+                       options=options)
+        cmp.compile()
+        if options.runs_phase('ast'):
+            cmp.print_abstract_syntax_tree()
+        input("\nProgram has finished. To exit press <Enter>\n")
+        return 0
+
+    cache_max_size = arguments.cache_size * 1024 * 1024
+    profile = None
+    if arguments.profile_stats or arguments.profile_stacks:
+        profile = cProfile.Profile()
+        profile.enable()
+    start_time = time.perf_counter()
+    if arguments.jobs == 1:
+        cache = None
+        if arguments.cache_dir is not None:
+            cache = CompilationCache(arguments.cache_dir, cache_max_size)
+        results = Compiler.compile_many(arguments.sources,
+                                        arguments.output_dir, cache=cache,
+                                        options=options)
+    else:
+        results = compile_in_parallel(arguments.sources, arguments.output_dir,
+                                      workers=arguments.jobs or None,
+                                      cache_directory=arguments.cache_dir,
+                                      cache_max_size=cache_max_size,
+                                      options=options)
+    wall_time = time.perf_counter() - start_time
+    if profile is not None:
+        profile.disable()
+        if arguments.profile_stats:
+            profile.dump_stats(arguments.profile_stats)
+        if arguments.profile_stacks:
+            write_collapsed_stacks(arguments.profile_stacks, profile)
+
+    print_compilation_report(results, wall_time)
+    if arguments.optimization_report:
+        print_optimization_report(results)
+    if arguments.profile:
+        write_profile_report(arguments.profile, results)
+    return 0 if all(result.succeeded for result in results) else 1
 
 
-cmp = Compiler(PATH_TO_SOURCE_FILE, PATH_TO_OUTPUT_FILE)
-cmp.compile()
-cmp.print_abstract_syntax_tree()
-input("\nProgram has finished. To exit press <Enter>\n")
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Benchmark of building AST of a big program
+
+Compares the old way of building AST, where json string is concatenated by
+nodes and parsed again, with building of native dicts directly and with
+writing of them into a file part by part, as '--emit ast' does. Nodes do not concatenate json any more, so
+copy of the old serializer is kept here. Run from the root of the
+repository:
+
+    python benchmarks/ast_benchmark.py [--functions N] [--statements N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler import json_writer  # noqa: E402
+from compiler.context import CompilationContext  # noqa: E402
+from compiler.lexer_wrapper import lexer_generator  # noqa: E402
+from compiler.miscellaneous import is_number  # noqa: E402
+from compiler.nodes import (BinaryExpression, DoWhileLoop,  # noqa: E402
+                            Expression, Function, FunctionCall, Program,
+                            Return, TernaryExpression, UnaryExpression,
+                            Variable, VariableInitialization)
+from compiler.parse_table_cache import build_parser  # noqa: E402
+
+
+def generate_source(functions: int, statements: int) -> str:
+    source = []
+    for function_idx in range(functions):
+        body = ['\tint v0 = n + 1;']
+        for statement_idx in range(1, statements):
+            body.append(f'\tint v{statement_idx} = (v{statement_idx - 1} + n)'
+                        f' * 2 - (n < {statement_idx} == 0) / 3;')
+        body.append(f'\treturn v{statements - 1};')
+        source.append(f'int f{function_idx}(int n) {{\n'
+                      + '\n'.join(body) + '\n}\n')
+    source.append('int main() {\n\treturn f0(1);\n}\n')
+    return '\n'.join(source)
+
+
+def _stringify_operand(operand) -> str:
+    if isinstance(operand, Expression):
+        return generate_ast_representation(operand)
+    elif isinstance(operand, Variable):
+        return f'"{operand.name}"'
+    elif is_number(operand):
+        return f'"{operand}"'
+    return ""
+
+
+def generate_ast_representation(node) -> str:
+    """Copy of the old serializer, that nodes had before they built native
+    dicts: json string is concatenated recursively and has to be parsed"""
+    if isinstance(node, Program):
+        contents = ', '.join(generate_ast_representation(function)
+                             for function in node.contents
+                             if function is not None)
+        return f'{{"id":"{node.id}", "contents":[{contents}]}}'
+    elif isinstance(node, Function):
+        arguments = ', '.join(generate_ast_representation(argument)
+                              for argument in node.arguments)
+        body = ', '.join(generate_ast_representation(instruction)
+                         for instruction in node.body
+                         if instruction is not None)
+        return (f'{{"id":"{node.id}", "name":"{node.name}",'
+                f' "type":"{node.type}",'
+                f' "arguments":[{arguments}],'
+                f' "body":[{body}]}}')
+    elif isinstance(node, DoWhileLoop):
+        if isinstance(node.expression, (Expression, Variable)):
+            expression = _stringify_operand(node.expression)
+        else:
+            expression = f'"{node.expression}"'
+        body = ', '.join(generate_ast_representation(instruction)
+                         for instruction in node.body
+                         if instruction not in ('break', 'continue', None))
+        return (f'{{"id":"{node.id}", "expression":{expression},'
+                f' "body":[{body}]}}')
+    elif isinstance(node, Return):
+        if isinstance(node.argument, (Expression, Variable)):
+            argument = _stringify_operand(node.argument)
+        else:
+            argument = f'"{node.argument}"'
+        return f'{{"id":"{node.id}", "argument":{argument}}}'
+    elif isinstance(node, Variable):
+        return (f'{{"id":"{node.id}", "type":"{node.type}",'
+                f' "name":"{node.name}"}}')
+    elif isinstance(node, VariableInitialization):
+        return (f'{{"id":"{node.id}", "name":"{node.name}",'
+                f' "expression":{_stringify_operand(node.expression)}}}')
+    elif isinstance(node, FunctionCall):
+        return (f'{{"id":"{node.id}", "function_name":"{node.function_name}",'
+                f' "arguments":[]}}')
+    elif isinstance(node, UnaryExpression):
+        return (f'{{"id":"{node.id}", "operator":"{node.operator}",'
+                f' "value":{_stringify_operand(node.value)}}}')
+    elif isinstance(node, BinaryExpression):
+        # Variable on the right was written as the whole node
+        if isinstance(node.right_operand, Variable):
+            right_operand = generate_ast_representation(node.right_operand)
+        else:
+            right_operand = _stringify_operand(node.right_operand)
+        return (f'{{"id":"{node.id}", "operator":"{node.operator}",'
+                f' "left_operand":{_stringify_operand(node.left_operand)},'
+                f' "right_operand":{right_operand}}}')
+    elif isinstance(node, TernaryExpression):
+        return (f'{{"id":"{node.id}",'
+                f' "condition":{_stringify_operand(node.condition)},'
+                f' "left_operand":{_stringify_operand(node.left_operand)},'
+                f' "right_operand":'
+                f'{_stringify_operand(node.right_operand)}}}')
+    raise TypeError(f'Node {type(node).__name__} is not serialized')
+
+
+def measure(function, repeats: int) -> tuple[float, int]:
+    """Best time of the function and peak of allocated memory"""
+    best_time = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_time, peak_memory
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    argument_parser.add_argument('--functions', type=int, default=200)
+    argument_parser.add_argument('--statements', type=int, default=50)
+    argument_parser.add_argument('--repeats', type=int, default=5)
+    arguments = argument_parser.parse_args()
+
+    source_code = generate_source(arguments.functions, arguments.statements)
+    lexer = lexer_generator.build()
+    parser = build_parser()
+    program = parser.parse(lexer.lex(source_code), state=CompilationContext())
+
+    with open(os.devnull, 'w') as null_file:
+        paths = (
+            ('json string + json.loads',
+             lambda: json.loads(generate_ast_representation(program))),
+            ('native dicts',
+             lambda: program.generate_ast()),
+            ('native dicts + json.dump',
+             lambda: json.dump(program.generate_ast(), null_file, indent=4)),
+            ('native dicts + json_writer.dump',
+             lambda: json_writer.dump(program.generate_ast(), null_file,
+                                      indent=4)),
+        )
+
+        print(f'{arguments.functions} functions, {len(source_code)} bytes'
+              ' of source code\n')
+        print(f'{"path":<32} {"time, ms":>10} {"peak memory, KiB":>18}')
+        for name, function in paths:
+            best_time, peak_memory = measure(function, arguments.repeats)
+            print(f'{name:<32} {best_time * 1000:>10.2f}'
+                  f' {peak_memory / 1024:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Check of linear scan register allocator on code of generated programs
+
+Code of every statement of generated programs is recorded, while they are
+compiled with different options: with strength reduction (one operand
+'imul'), with 'idiv' and with calls of helper procedures ('invoke').
+Temporaries of the code are allocated with all registers, without the
+scratch register and with only three registers, so many of them are
+spilled. Allocated code is executed symbolically: every location keeps
+the temporary or the fixed register value, that was written into it last,
+and every read checks, that the location still keeps the read value, so
+temporaries are never overwritten by other ones or by registers, that
+'idiv', 'cdq', 'invoke' and one operand 'imul' change implicitly. Code
+generated by the compiler is also checked to have no instruction with two
+memory operands. Balanced expressions keep many temporaries live at once,
+so some of them are spilled by the compiler as well. Run from the root of
+the repository:
+
+    python benchmarks/check_register_allocator.py [--programs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compile_benchmark import ProgramGenerator, compile_file  # noqa: E402
+from compiler.lexer_wrapper import lexer_generator  # noqa: E402
+from compiler.miscellaneous import is_number  # noqa: E402
+from compiler.options import CompilerOptions  # noqa: E402
+from compiler.parse_table_cache import build_parser  # noqa: E402
+from compiler.register_allocator import (  # noqa: E402
+    ALLOCATABLE_REGISTERS, SCRATCH_REGISTER, Address, LinearScanAllocator,
+    StatementCode, Temporary, get_name_of_spill_slot)
+
+
+# Function with balanced expression is not called, so it is kept alive
+OPTIONS = {
+    'strength reduction': CompilerOptions.at_level(
+        2, eliminate_dead_functions=False),
+    'idiv': CompilerOptions.at_level(2, eliminate_dead_functions=False,
+                                     reduce_strength=False),
+    'helper calls': CompilerOptions.at_level(2, eliminate_dead_functions=False,
+                                             reduce_strength=False,
+                                             inline_operations=False),
+}
+REGISTER_SETS = {
+    'all registers': ALLOCATABLE_REGISTERS,
+    'without scratch': tuple(register for register in ALLOCATABLE_REGISTERS
+                             if register != SCRATCH_REGISTER),
+    'three registers': ('eax', 'ecx', 'edx'),
+}
+REGISTER_PARTS = {'al': 'eax', 'dl': 'edx'}
+# Registers, that instructions change besides their operands
+CLOBBERED_REGISTERS = {'cdq': ('edx',), 'idiv': ('eax', 'edx'),
+                       'invoke': ('eax', 'ecx', 'edx')}
+READ_ONLY_MNEMONICS = frozenset(('cmp', 'test', 'push', 'invoke', 'idiv',
+                                 'ret'))
+WRITE_ONLY_MNEMONICS = frozenset(('mov', 'movzx', 'lea'))
+
+
+def generate_balanced_expression(depth: int, rng: random.Random) -> str:
+    """Expression, whose operations have nested expressions on both sides,
+    so a value of every level is live while the other side is computed"""
+    if depth <= 0:
+        return rng.choice(('a', 'b', 'c'))
+    left_operand = generate_balanced_expression(depth - 1, rng)
+    right_operand = generate_balanced_expression(depth - 1, rng)
+    operator = rng.choice(('+', '-', '*', '/', '<', '&&'))
+    return f'({left_operand} {operator} {right_operand})'
+
+
+def get_accesses(mnemonic: str, operands: tuple) -> tuple[list, list]:
+    """Read and written operands of instruction"""
+    if not operands:
+        return [], []
+    first, rest = operands[0], list(operands[1:])
+    if isinstance(first, Address):
+        return [first.base], []
+    if (mnemonic in READ_ONLY_MNEMONICS or mnemonic.startswith('j')
+            or mnemonic == 'imul' and not rest):
+        return [first, *rest], []
+    if (mnemonic in WRITE_ONLY_MNEMONICS or mnemonic.startswith('set')
+            or mnemonic == 'imul' and len(rest) == 2):
+        return rest, [first]
+    return [first, *rest], [first]
+
+
+def check_allocation(instructions: list, locations: dict) -> list[str]:
+    """Errors of symbolic execution of code with allocated temporaries"""
+    errors = []
+    values = dict()
+
+    def get_location(operand):
+        if isinstance(operand, Address):
+            operand = operand.base
+        if isinstance(operand, Temporary):
+            return locations[operand]
+        return REGISTER_PARTS.get(operand, operand)
+
+    for position, instruction in enumerate(instructions):
+        if instruction.is_label():
+            continue
+        mnemonic, operands = instruction.mnemonic, instruction.operands
+        reads, writes = get_accesses(mnemonic, operands)
+        for operand in reads:
+            if isinstance(operand, Address):
+                operand = operand.base
+            location = get_location(operand)
+            if isinstance(operand, Temporary):
+                expected = operand
+            elif location in ALLOCATABLE_REGISTERS:
+                expected = values.get(location)
+                if isinstance(expected, Temporary):
+                    errors.append(f'{position}: {mnemonic} reads {location},'
+                                  f' which keeps {expected}')
+                continue
+            else:
+                continue
+            if values.get(location) != expected:
+                errors.append(f'{position}: {mnemonic} reads {expected} from'
+                              f' {location}, which keeps'
+                              f' {values.get(location)}')
+
+        clobbered = CLOBBERED_REGISTERS.get(mnemonic, ())
+        if mnemonic == 'imul' and len(operands) == 1:
+            clobbered = ('eax', 'edx')
+        for register in clobbered:
+            values[register] = f'{register} of {mnemonic} at {position}'
+        for operand in writes:
+            location = get_location(operand)
+            if isinstance(operand, Temporary):
+                values[location] = operand
+            elif location in ALLOCATABLE_REGISTERS:
+                values[location] = f'{location} written at {position}'
+    return errors
+
+
+def allocate(instructions: list, registers: tuple) -> dict:
+    locations = dict()
+    for interval in LinearScanAllocator(registers).allocate(instructions):
+        if interval.register is not None:
+            locations[interval.temporary] = interval.register
+        else:
+            locations[interval.temporary] = \
+                get_name_of_spill_slot(interval.spill_slot)
+    return locations
+
+
+def check_legality(asm_code: list) -> list[str]:
+    """Instructions, that have two memory operands"""
+    errors = []
+    for line in asm_code:
+        mnemonic, _, operands = line.strip().partition(' ')
+        if not operands or mnemonic == 'invoke':
+            continue
+        memory_operands = [
+            operand for operand in operands.split(', ')
+            if not is_number(operand) and operand not in ALLOCATABLE_REGISTERS
+            and operand not in REGISTER_PARTS and not operand.startswith('[')]
+        if len(memory_operands) > 1:
+            errors.append(f'two memory operands: {line.strip()}')
+    return errors
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    argument_parser.add_argument('--programs', type=int, default=20)
+    argument_parser.add_argument('--functions', type=int, default=5)
+    argument_parser.add_argument('--statements', type=int, default=10)
+    argument_parser.add_argument('--depth', type=int, default=5,
+                                 help='depth of expressions')
+    argument_parser.add_argument('--seed', type=int, default=0)
+    arguments = argument_parser.parse_args()
+
+    recorded_statements = []
+    errors = []
+    generate_asm_code = StatementCode.generate_asm_code
+
+    def record_statement(code: StatementCode) -> list:
+        recorded_statements.append(list(code.instructions))
+        asm_code = generate_asm_code(code)
+        errors.extend(check_legality(asm_code))
+        return asm_code
+
+    StatementCode.generate_asm_code = record_statement
+    lexer = lexer_generator.build()
+    parser = build_parser()
+    with tempfile.TemporaryDirectory() as directory:
+        path_to_source_file = os.path.join(directory, 'program.c')
+        path_to_output_file = os.path.join(directory, 'program.asm')
+        for program_idx in range(arguments.programs):
+            seed = arguments.seed + program_idx
+            generator = ProgramGenerator(arguments.statements,
+                                         arguments.depth, 1, seed)
+            source_code = generator.generate_program(arguments.functions)
+            expression = generate_balanced_expression(8, random.Random(seed))
+            source_code += (f'\nint balanced(int a, int b, int c) {{\n'
+                            f'\treturn {expression};\n}}\n')
+            with open(path_to_source_file, 'w') as source_file:
+                source_file.write(source_code)
+            for options in OPTIONS.values():
+                compile_file(path_to_source_file, path_to_output_file,
+                             lexer, parser, options)
+    StatementCode.generate_asm_code = generate_asm_code
+
+    number_of_temporaries = 0
+    for instructions in recorded_statements:
+        for name, registers in REGISTER_SETS.items():
+            locations = allocate(instructions, registers)
+            number_of_temporaries += len(locations)
+            errors.extend(f'{name}, {error}' for error
+                          in check_allocation(instructions, locations))
+
+    for error in errors[:20]:
+        print(error)
+    print(f'Checked {len(recorded_statements)} statements and'
+          f' {number_of_temporaries} allocated temporaries,'
+          f' {len(errors)} errors')
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
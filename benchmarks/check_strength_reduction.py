@@ -0,0 +1,163 @@
+"""Check of strength reduction of multiplication and division by constants
+
+Code, that multiplies or divides by a constant, is generated for dividends
+in a temporary, in a variable and given as a number, and executed by a
+small interpreter of 32-bit instructions. Products are compared with
+products after wrap-around, like results of 'imul', and quotients with
+quotients truncated toward zero, like results of 'idiv'. Constants are all
+small numbers, powers of two, their neighbours, the largest and the
+smallest 32-bit numbers and random ones, positive and negative, dividends
+include INT_MIN and INT_MAX. Run from the root of the repository:
+
+    python benchmarks/check_strength_reduction.py [--random N]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler.miscellaneous import is_number, to_int32  # noqa: E402
+from compiler.register_allocator import (Address, StatementCode,  # noqa: E402
+                                         Temporary)
+from compiler.strength_reduction import (divide_by_constant,  # noqa: E402
+                                         multiply_by_constant)
+
+
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+VARIABLE = 'xhsl'
+
+
+def execute(instructions: list, values: dict) -> dict:
+    """Values of registers, variables and temporaries after instructions"""
+
+    def read(operand) -> int:
+        if isinstance(operand, Address):
+            return to_int32(read(operand.base) * (operand.scale + 1))
+        if isinstance(operand, str) and is_number(operand):
+            return to_int32(int(operand))
+        return values[operand]
+
+    for instruction in instructions:
+        mnemonic, operands = instruction.mnemonic, instruction.operands
+        destination = operands[0]
+        if mnemonic == 'imul' and len(operands) == 1:
+            product = values['eax'] * read(destination)
+            values['eax'] = to_int32(product)
+            values['edx'] = to_int32(product >> 32)
+            continue
+        if mnemonic == 'neg':
+            values[destination] = to_int32(-values[destination])
+            continue
+        source = read(operands[1])
+        if mnemonic in ('mov', 'lea'):
+            result = source
+        elif mnemonic == 'imul' and len(operands) == 3:
+            result = source * read(operands[2])
+        elif mnemonic == 'imul':
+            result = values[destination] * source
+        elif mnemonic == 'add':
+            result = values[destination] + source
+        elif mnemonic == 'sub':
+            result = values[destination] - source
+        elif mnemonic == 'shl':
+            result = values[destination] << source
+        elif mnemonic == 'sar':
+            result = values[destination] >> source
+        elif mnemonic == 'shr':
+            result = (values[destination] & 0xFFFFFFFF) >> source
+        else:
+            raise ValueError(f'Unknown instruction: {mnemonic}')
+        values[destination] = to_int32(result)
+    return values
+
+
+def divide(dividend: int, divisor: int) -> int:
+    """Quotient truncated toward zero, like result of 'idiv'"""
+    quotient = abs(dividend) // abs(divisor)
+    return to_int32(quotient if (dividend < 0) == (divisor < 0)
+                    else -quotient)
+
+
+def get_constants(number_of_random: int, rng: random.Random) -> list[int]:
+    constants = set(range(1, 1025))
+    for power in range(31):
+        constants.update((2 ** power - 1, 2 ** power, 2 ** power + 1))
+    constants.update(rng.randint(1, INT_MAX) for _ in range(number_of_random))
+    constants.add(INT_MAX)
+    return sorted({*constants, *(-constant for constant in constants),
+                   INT_MIN})
+
+
+def get_dividends(constant: int, rng: random.Random) -> list[int]:
+    dividends = {0, 1, -1, 2, -2, INT_MIN, INT_MIN + 1, INT_MAX, INT_MAX - 1,
+                 constant, constant - 1, constant + 1}
+    dividends.update(rng.randint(INT_MIN, INT_MAX) for _ in range(8))
+    dividends.update(rng.randint(-1000, 1000) for _ in range(4))
+    return sorted(to_int32(dividend) for dividend in dividends)
+
+
+def check_operation(operation, expected, constant: int,
+                    dividends: list[int]) -> tuple[int, list[str]]:
+    """Number of checked operations and their errors for every kind of
+    dividend"""
+    errors = []
+    checked = 0
+    for kind in ('temporary', 'variable', 'number'):
+        for dividend in dividends:
+            code = StatementCode(context=None)
+            if kind == 'temporary':
+                operand = code.load(VARIABLE)
+            elif kind == 'variable':
+                operand = VARIABLE
+            else:
+                operand = f'{dividend}'
+            result = operation(operand, constant, code)
+            if result is None:
+                # Operation is done by 'imul' or 'idiv'
+                return checked, errors
+            values = execute(code.instructions, {VARIABLE: dividend})
+            checked += 1
+            if not isinstance(result, Temporary) or \
+                    values[result] != expected(dividend, constant):
+                errors.append(f'{operation.__name__}({dividend}, {constant})'
+                              f' with {kind} = {values.get(result)},'
+                              f' expected {expected(dividend, constant)}')
+    return checked, errors
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    argument_parser.add_argument('--random', type=int, default=200,
+                                 help='number of random constants')
+    argument_parser.add_argument('--seed', type=int, default=0)
+    arguments = argument_parser.parse_args()
+
+    rng = random.Random(arguments.seed)
+    operations = (
+        (multiply_by_constant,
+         lambda multiplicand, multiplier: to_int32(multiplicand * multiplier)),
+        (divide_by_constant, divide),
+    )
+    errors = []
+    for operation, expected in operations:
+        checked = 0
+        for constant in get_constants(arguments.random, rng):
+            checked_with_constant, errors_with_constant = check_operation(
+                operation, expected, constant, get_dividends(constant, rng))
+            checked += checked_with_constant
+            errors.extend(errors_with_constant)
+        print(f'{operation.__name__}: checked {checked} operations')
+
+    for error in errors[:20]:
+        print(error)
+    print(f'{len(errors)} errors')
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
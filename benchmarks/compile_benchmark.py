@@ -0,0 +1,289 @@
+"""Benchmark of compilation of generated programs of growing size
+
+Programs are generated from the supported subset of 'C': functions with
+arguments, variables, assignments, nested 'do/while' loops, ternary
+operators, nested expressions and calls. Every function calls the previous
+one, so no function is dead. Size of programs is tuned by number of
+functions, length of their bodies, depth of expressions and nesting of
+loops, and every program is compiled at several scales of number of
+functions to show how compilation scales.
+
+Time and peak of allocated memory are measured for the whole compilation
+and throughput is computed from them. Time, memory, tokens and nodes of
+every phase are taken from profile of another compilation, memory tracing
+slows it down, so its times are only comparable between themselves.
+Results are printed and written as JSON, that could be compared between
+revisions. Run from the root of the repository:
+
+    python benchmarks/compile_benchmark.py [--functions N] [--statements N]
+        [--depth N] [--loop-nesting N] [--scales 1,2,4] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler.compiler import Compiler  # noqa: E402
+from compiler.lexer_wrapper import lexer_generator  # noqa: E402
+from compiler.options import CompilerOptions  # noqa: E402
+from compiler.parse_table_cache import build_parser  # noqa: E402
+
+
+BINARY_OPERATORS = ('+', '-', '*', '/', '<', '==', '&&', '||')
+
+
+class ProgramGenerator:
+    """Generates valid programs, that are the same for the same seed"""
+
+    def __init__(self, statements: int, depth: int, loop_nesting: int,
+                 seed: int):
+        self.statements = statements
+        self.depth = depth
+        self.loop_nesting = loop_nesting
+        self.random = random.Random(seed)
+        self.number_of_variables = 0
+
+    def __new_variable(self, prefix: str) -> str:
+        self.number_of_variables += 1
+        return f'{prefix}{self.number_of_variables}'
+
+    def __generate_operand(self, scope: list[str]) -> str:
+        if scope and self.random.random() < 0.7:
+            return self.random.choice(scope)
+        return str(self.random.randint(1, 100))
+
+    def generate_expression(self, scope: list[str], depth: int,
+                            callee: Optional[tuple[str, int]] = None) -> str:
+        """Expression with the depth, one operand of every operation is
+        nested, so size of expression grows linearly with its depth"""
+        if depth <= 0:
+            return self.__generate_operand(scope)
+        nested = self.generate_expression(scope, depth - 1, callee)
+        operand = self.__generate_operand(scope)
+        choice = self.random.random()
+        if callee is not None and choice < 0.1:
+            name, number_of_arguments = callee
+            arguments = [operand] * number_of_arguments
+            if arguments:
+                arguments[0] = nested
+            return f'{name}({", ".join(arguments)})'
+        if choice < 0.25:
+            condition = self.generate_expression(scope, 1)
+            return f'({condition} ? {nested} : {operand})'
+        if choice < 0.3:
+            return f'(-{nested})'
+        operator = self.random.choice(BINARY_OPERATORS)
+        if operator == '/':
+            # Divisor is never zero
+            return f'({nested} / {self.random.randint(1, 9)})'
+        if self.random.random() < 0.5:
+            return f'({nested} {operator} {operand})'
+        return f'({operand} {operator} {nested})'
+
+    def generate_block(self, scope: list[str], counters: list[str],
+                       statements: int, loop_nesting: int, indent: str,
+                       callee: Optional[tuple[str, int]] = None
+                       ) -> list[str]:
+        """Statements of block, variables declared in it are added to the
+        scope and counters of loops are never assigned in their bodies"""
+        lines = []
+        for _ in range(statements):
+            choice = self.random.random()
+            assignable = [variable for variable in scope
+                          if variable not in counters]
+            expression = self.generate_expression(scope, self.depth, callee)
+            if choice < 0.4 or not assignable:
+                variable = self.__new_variable('v')
+                lines.append(f'{indent}int {variable} = {expression};')
+                scope.append(variable)
+            elif choice < 0.75 or loop_nesting <= 0:
+                variable = self.random.choice(assignable)
+                lines.append(f'{indent}{variable} = {expression};')
+            else:
+                counter = self.__new_variable('i')
+                lines.append(f'{indent}int {counter} = 0;')
+                scope.append(counter)
+                counters.append(counter)
+                lines.append(f'{indent}do {{')
+                lines.extend(self.generate_block(
+                    scope, counters, statements // 4 + 1, loop_nesting - 1,
+                    indent + '\t', callee))
+                lines.append(f'{indent}\t{counter} = {counter} + 1;')
+                lines.append(f'{indent}}} while ({counter} < '
+                             f'{self.random.randint(2, 10)});')
+        return lines
+
+    def generate_function(self, name: str, number_of_arguments: int,
+                          callee: Optional[tuple[str, int]] = None) -> str:
+        arguments = [f'a{idx}' for idx in range(number_of_arguments)]
+        scope = list(arguments)
+        lines = self.generate_block(scope, [], self.statements,
+                                    self.loop_nesting, '\t', callee)
+        expression = self.generate_expression(scope, self.depth)
+        if callee is not None:
+            # Every function calls the previous one, so no one is dead
+            name_of_callee, number_of_callee_arguments = callee
+            call_arguments = ', '.join(
+                self.__generate_operand(scope)
+                for _ in range(number_of_callee_arguments))
+            expression = (f'{name_of_callee}({call_arguments}) + '
+                          f'{expression}')
+        lines.append(f'\treturn {expression};')
+        parameters = ', '.join(f'int {argument}' for argument in arguments)
+        return (f'int {name}({parameters}) {{\n' + '\n'.join(lines)
+                + '\n}\n')
+
+    def generate_program(self, functions: int) -> str:
+        source = []
+        callee = None
+        for function_idx in range(functions):
+            name = f'f{function_idx}'
+            number_of_arguments = self.random.randint(0, 3)
+            source.append(self.generate_function(name, number_of_arguments,
+                                                 callee))
+            callee = (name, number_of_arguments)
+        source.append(self.generate_function('main', 0, callee))
+        return '\n'.join(source)
+
+
+def compile_file(path_to_source_file: str, path_to_output_file: str,
+                 lexer, parser, options: CompilerOptions):
+    compiler = Compiler(path_to_source_file, path_to_output_file,
+                        lexer=lexer, parser=parser, options=options)
+    result = compiler.try_compile()
+    if not result.succeeded:
+        raise RuntimeError(f'Generated program is not compiled: '
+                           f'{result.message}')
+    return result
+
+
+def measure_program(source_code: str, repeats: int, lexer, parser,
+                    options: CompilerOptions, directory: str) -> dict:
+    path_to_source_file = os.path.join(directory, 'program.c')
+    path_to_output_file = os.path.join(directory, 'program.asm')
+    with open(path_to_source_file, 'w') as source_file:
+        source_file.write(source_code)
+
+    def compile_program(compiler_options: CompilerOptions):
+        return compile_file(path_to_source_file, path_to_output_file,
+                            lexer, parser, compiler_options)
+
+    best_time = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        compile_program(options)
+        best_time = min(best_time, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    compile_program(options)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    profiled_options = replace(options, profile=True)
+    phases = [asdict(profile)
+              for profile in compile_program(profiled_options).profile]
+    tokens = sum(phase['tokens'] for phase in phases)
+    nodes = next((phase['nodes'] for phase in phases
+                  if phase['phase'] == 'parse'), None)
+    with open(path_to_output_file) as output_file:
+        asm_lines = sum(1 for _ in output_file)
+
+    source_lines = source_code.count('\n') + 1
+    return {
+        'source_bytes': len(source_code),
+        'source_lines': source_lines,
+        'tokens': tokens,
+        'nodes': nodes,
+        'asm_lines': asm_lines,
+        'time': best_time,
+        'peak_memory': peak_memory,
+        'lines_per_second': source_lines / best_time,
+        'tokens_per_second': tokens / best_time,
+        'phases': [dict(phase, lines_per_second=(
+                        source_lines / phase['wall_time']
+                        if phase['wall_time'] else None))
+                   for phase in phases],
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    argument_parser.add_argument('--functions', type=int, default=20)
+    argument_parser.add_argument('--statements', type=int, default=20,
+                                 help='statements in body of function')
+    argument_parser.add_argument('--depth', type=int, default=4,
+                                 help='depth of expressions')
+    argument_parser.add_argument('--loop-nesting', type=int, default=2)
+    argument_parser.add_argument('--scales', default='1,2,4',
+                                 help='multipliers of number of functions')
+    argument_parser.add_argument('-O', dest='optimization_level', type=int,
+                                 default=2)
+    argument_parser.add_argument('--seed', type=int, default=0)
+    argument_parser.add_argument('--repeats', type=int, default=3)
+    argument_parser.add_argument('--output', default=None,
+                                 help='file for JSON with results')
+    arguments = argument_parser.parse_args()
+
+    lexer = lexer_generator.build()
+    parser = build_parser()
+    options = CompilerOptions.at_level(arguments.optimization_level)
+    scales = [int(scale) for scale in arguments.scales.split(',')]
+
+    print(f'{"functions":>9} {"lines":>8} {"tokens":>8} {"time, ms":>10}'
+          f' {"lines/s":>10} {"peak memory, KiB":>18}')
+    programs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            functions = arguments.functions * scale
+            generator = ProgramGenerator(arguments.statements, arguments.depth,
+                                         arguments.loop_nesting,
+                                         arguments.seed)
+            source_code = generator.generate_program(functions)
+            measurement = measure_program(source_code, arguments.repeats,
+                                          lexer, parser, options, directory)
+            programs.append({'functions': functions, **measurement})
+            print(f'{functions:>9} {measurement["source_lines"]:>8}'
+                  f' {measurement["tokens"]:>8}'
+                  f' {measurement["time"] * 1000:>10.2f}'
+                  f' {measurement["lines_per_second"]:>10.0f}'
+                  f' {measurement["peak_memory"] / 1024:>18.1f}')
+
+    print(f'\n{"phase":<10} {"time, ms":>10} {"cpu time, ms":>13}'
+          f' {"peak memory, KiB":>18}  (largest program, traced)')
+    for phase in programs[-1]['phases']:
+        print(f'{phase["phase"]:<10} {phase["wall_time"] * 1000:>10.2f}'
+              f' {phase["cpu_time"] * 1000:>13.2f}'
+              f' {phase["peak_memory"] / 1024:>18.1f}')
+
+    if arguments.output is not None:
+        report = {
+            'python': platform.python_version(),
+            'parameters': {
+                'functions': arguments.functions,
+                'statements': arguments.statements,
+                'depth': arguments.depth,
+                'loop_nesting': arguments.loop_nesting,
+                'scales': scales,
+                'optimization_level': arguments.optimization_level,
+                'seed': arguments.seed,
+                'repeats': arguments.repeats,
+            },
+            'programs': programs,
+        }
+        with open(arguments.output, 'w') as output_file:
+            json.dump(report, output_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark of compiler startup with different sources of parser tables
+
+Every mode is measured in a fresh python process:
+    cold        - LALR tables are generated from the grammar
+    warm        - LALR tables are loaded from the cache file
+    precomputed - LALR tables are imported from 'compiler/parsetab.py'
+
+Run from the root of the repository:
+
+    python benchmarks/startup_benchmark.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPT = '''
+import time
+start_time = time.perf_counter()
+from compiler.parse_table_cache import build_parser
+from compiler.lexer_wrapper import lexer_generator
+lexer_generator.build()
+build_parser(cache_directory={cache_directory!r},
+             use_precomputed={use_precomputed!r})
+print(time.perf_counter() - start_time)
+'''
+
+
+def measure_startup(cache_directory, use_precomputed) -> tuple[float, float]:
+    """Time of imports with building of lexer and parser and total time
+    of the process"""
+    script = STARTUP_SCRIPT.format(cache_directory=cache_directory,
+                                   use_precomputed=use_precomputed)
+    start_time = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT_DIRECTORY,
+                            capture_output=True, text=True, check=True).stdout
+    process_time = time.perf_counter() - start_time
+    return float(output.strip().splitlines()[-1]), process_time
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    argument_parser.add_argument('--runs', type=int, default=10)
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        # Fill the cache before measuring warm startup
+        measure_startup(cache_directory, use_precomputed=False)
+
+        modes = (
+            ('cold', None, False),
+            ('warm', cache_directory, False),
+            ('precomputed', None, True),
+        )
+
+        print(f'{"mode":<12} {"startup, ms":>12} {"process, ms":>12}')
+        for mode, mode_cache_directory, use_precomputed in modes:
+            build_times, process_times = [], []
+            for _ in range(arguments.runs):
+                build_time, process_time = measure_startup(
+                    mode_cache_directory, use_precomputed)
+                build_times.append(build_time)
+                process_times.append(process_time)
+            print(f'{mode:<12} {statistics.median(build_times) * 1000:>12.2f}'
+                  f' {statistics.median(process_times) * 1000:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
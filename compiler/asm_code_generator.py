@@ -1,153 +1,197 @@
+from typing import Iterator, TextIO
+
+from compiler.masm_backend import MasmBackend
+from compiler.usage_tracking import collect_runtime_usage
+
+
+HEADER = (
+    '.486',
+    '.model flat, stdcall',
+    'option casemap :none',
+)
+# Includes, that are needed by every program
+BASE_INCLUDES = (
+    'include \\masm32\\include\\windows.inc',
+    'include \\masm32\\macros\\macros.asm',
+)
+# Libraries in the order they are included
+LIBRARIES = ('masm32', 'kernel32', 'msvcrt')
+
+# Code of helper procedures in the order they are emitted
+HELPER_PROCEDURES: dict[str, tuple] = {
+    'multiply': (
+        'multiply proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  cdq',
+        '  imul num2',
+        '  ret',
+        'multiply endp'
+    ),
+    'divide': (
+        'divide proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  cdq',
+        '  idiv num2',
+        '  ret',
+        'divide endp'
+    ),
+    'summarize': (
+        'summarize proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  add eax, num2',
+        '  ret',
+        'summarize endp'
+    ),
+    'subtract': (
+        'subtract proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  sub eax, num2',
+        '  ret',
+        'subtract endp'
+    ),
+    'compare': (
+        'compare proc num1:DWORD, num2:DWORD',
+        '  mov eax, num2',
+        '  cmp num1, eax',
+        '  je equal',
+        '  jne notequal',
+        '  equal:',
+        '    mov eax, 1',
+        '    jmp stop',
+        '  notequal:',
+        '    mov eax, 0',
+        '    jmp stop',
+        '  stop:',
+        '    ret',
+        '  jmp stop',
+        'compare endp'
+    ),
+    'lcompare': (
+        'lcompare proc num1:DWORD, num2:DWORD',
+        '  mov eax, num2',
+        '  cmp num1, eax',
+        '  jl less',
+        '  jge notless',
+        '  less:',
+        '    mov eax, 1',
+        '    jmp stop',
+        '  notless:',
+        '    mov eax, 0',
+        '    jmp stop',
+        '  stop:',
+        '    ret',
+        '  jmp stop',
+        'lcompare endp'
+    ),
+    'logical_and': (
+        'logical_and proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  cmp eax, 0',
+        '  je retfalse',
+        '  jne secondcheck',
+        '  secondcheck:',
+        '    mov eax, num2',
+        '    cmp eax, 0',
+        '    je retfalse',
+        '    jne rettrue',
+        '  rettrue:',
+        '    mov eax, 1',
+        '    jmp stop',
+        '  retfalse:',
+        '    mov eax, 0',
+        '    jmp stop',
+        '  stop:',
+        '    ret',
+        '  jmp stop',
+        'logical_and endp'
+    ),
+    'logical_or': (
+        'logical_or proc num1:DWORD, num2:DWORD',
+        '  mov eax, num1',
+        '  cmp eax, 0',
+        '  je secondcheck',
+        '  jne rettrue',
+        '  secondcheck:',
+        '    mov eax, num2',
+        '    cmp eax, 0',
+        '    je retfalse',
+        '    jne rettrue',
+        '  rettrue:',
+        '    mov eax, 1',
+        '    jmp stop',
+        '  retfalse:',
+        '    mov eax, 0',
+        '    jmp stop',
+        '  stop:',
+        '    ret',
+        '  jmp stop',
+        'logical_or endp'
+    ),
+}
+
+
 class AsmCodeGenerator:
     """Class that creates assembly (masm) code from 'C' source code"""
 
     def __init__(self, program):
         self.program = program
-        self.procedures_from_source_code = None
-
-    def __initialize_masm(self):
-        header = (
-            '.486',
-            '.model flat, stdcall',
-            'option casemap :none',
-        )
+        self.backend = MasmBackend(program.context)
 
-        # TODO?: Add return_result procedure to masm
-        includes = (
-            'include \\masm32\\include\\windows.inc',
-            'include \\masm32\\macros\\macros.asm',
-            'include \\masm32\\include\\masm32.inc',
-            'include \\masm32\\include\\gdi32.inc',
-            'include \\masm32\\include\\user32.inc',
-            'include \\masm32\\include\\kernel32.inc',
-            'include \\masm32\\include\\msvcrt.inc',
-            'includelib \\masm32\\lib\\masm32.lib',
-            'includelib \\masm32\\lib\\gdi32.lib',
-            'includelib \\masm32\\lib\\user32.lib',
-            'includelib \\masm32\\lib\\kernel32.lib',
-            'includelib \\masm32\\lib\\msvcrt.lib',
-        )
-
-        division_procedure = (
-            'divide proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  cdq',
-            '  idiv num2',
-            '  ret',
-            'divide endp'
-        )
-
-        multiplication_procedure = (
-            'multiply proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  cdq',
-            '  imul num2',
-            '  ret',
-            'multiply endp'
-        )
+    def __generate_optimized_code_of_function(self, function) -> list:
+        context = self.program.context
+        function_in_ir = function.lower(context.options)
+        if context.pass_manager is not None:
+            context.pass_manager.run_ir_passes(function_in_ir)
+        asm_code = self.backend.generate_code_of_function(function_in_ir)
+        if context.peephole_optimizer is not None:
+            asm_code = context.peephole_optimizer.optimize(asm_code)
+        return asm_code
 
-        summarization_procedure = (
-            'summarize proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  add eax, num2',
-            '  ret',
-            'summarize endp'
-        )
+    def __generate_code_of_function(self, function) -> list:
+        cache = self.program.context.function_code_cache
+        if cache is None:
+            return self.__generate_optimized_code_of_function(function)
 
-        subtraction_procedure = (
-            'subtract proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  sub eax, num2',
-            '  ret',
-            'subtract endp'
-        )
+        key = cache.make_key(function)
+        asm_code = cache.get(key)
+        if asm_code is None:
+            asm_code = self.__generate_optimized_code_of_function(function)
+            cache.put(key, asm_code)
+        return asm_code
 
-        comparison_procedure = (
-            'compare proc num1:DWORD, num2:DWORD',
-            '  mov eax, num2',
-            '  cmp num1, eax',
-            '  je equal',
-            '  jne notequal',
-            '  equal:',
-            '    mov eax, 1',
-            '    jmp stop',
-            '  notequal:',
-            '    mov eax, 0',
-            '    jmp stop',
-            '  stop:',
-            '    ret',
-            '  jmp stop',
-            'compare endp'
-        )
+    def __generate_code_of_functions(self) -> Iterator[list]:
+        """Code of every function is generated only when it is needed"""
+        for function in self.program.contents:
+            if function is None or function.name == 'main':
+                continue
+            yield self.__generate_code_of_function(function)
 
-        lcomparison_procedure = (
-            'lcompare proc num1:DWORD, num2:DWORD',
-            '  mov eax, num2',
-            '  cmp num1, eax',
-            '  jl less',
-            '  jge notless',
-            '  less:',
-            '    mov eax, 1',
-            '    jmp stop',
-            '  notless:',
-            '    mov eax, 0',
-            '    jmp stop',
-            '  stop:',
-            '    ret',
-            '  jmp stop',
-            'lcompare endp'
-        )
+        yield self.__generate_code_of_function(
+            self.program.get_function('main'))
 
-        logical_AND_procedure = (
-            'logical_and proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  cmp eax, 0',
-            '  je retfalse',
-            '  jne secondcheck',
-            '  secondcheck:',
-            '    mov eax, num2',
-            '    cmp eax, 0',
-            '    je retfalse',
-            '    jne rettrue',
-            '  rettrue:',
-            '    mov eax, 1',
-            '    jmp stop',
-            '  retfalse:',
-            '    mov eax, 0',
-            '    jmp stop',
-            '  stop:',
-            '    ret',
-            '  jmp stop',
-            'logical_and endp'
-        )
+    def __generate_chunks_of_masm(self) -> Iterator[tuple]:
+        """Code is produced in chunks: header with helper procedures and
+        code of every function separately"""
+        usage = collect_runtime_usage(self.program)
+        libraries = [library for library in LIBRARIES
+                     if library in usage.libraries]
 
-        logical_OR_procedure = (
-            'logical_or proc num1:DWORD, num2:DWORD',
-            '  mov eax, num1',
-            '  cmp eax, 0',
-            '  je secondcheck',
-            '  jne rettrue',
-            '  secondcheck:',
-            '    mov eax, num2',
-            '    cmp eax, 0',
-            '    je retfalse',
-            '    jne rettrue',
-            '  rettrue:',
-            '    mov eax, 1',
-            '    jmp stop',
-            '  retfalse:',
-            '    mov eax, 0',
-            '    jmp stop',
-            '  stop:',
-            '    ret',
-            '  jmp stop',
-            'logical_or endp'
+        # TODO?: Add return_result procedure to masm
+        includes = (
+            *BASE_INCLUDES,
+            *(f'include \\masm32\\include\\{library}.inc'
+              for library in libraries),
+            *(f'includelib \\masm32\\lib\\{library}.lib'
+              for library in libraries),
         )
 
-        code_of_program = self.program.generate_asm_code()
+        helper_procedures = []
+        for name, code_of_procedure in HELPER_PROCEDURES.items():
+            if name in usage.helper_procedures:
+                helper_procedures.extend((*code_of_procedure, ''))
 
-        masm_code = (
-            *header,
+        yield (
+            *HEADER,
             '',
             *includes,
             '',
@@ -158,29 +202,29 @@ class AsmCodeGenerator:
             '  mov eax, input("To exit press <Enter>")',
             '  exit',
             '',
-            *multiplication_procedure,
-            '',
-            *division_procedure,
-            '',
-            *summarization_procedure,
-            '',
-            *subtraction_procedure,
-            '',
-            *comparison_procedure,
-            '',
-            *lcomparison_procedure,
-            '',
-            *logical_AND_procedure,
-            '',
-            *logical_OR_procedure,
-            '',
-            *code_of_program,
+            *helper_procedures,
+        )
+        yield from self.__generate_code_of_functions()
+        yield (
             '',
             'end start'
         )
 
-        self.generated_code = '\n'.join(masm_code)
+    def generate_lines_of_asm_code(self) -> Iterator[str]:
+        for chunk in self.__generate_chunks_of_masm():
+            yield from chunk
+
+    def generate_asm_code(self) -> str:
+        return '\n'.join(self.generate_lines_of_asm_code())
 
-    def generate_asm_code(self, ):
-        self.__initialize_masm()
-        return self.generated_code
+    def write_asm_code(self, file: TextIO) -> None:
+        """Write code to the file as soon as every function is generated,
+        so code of whole program is never kept in memory at once"""
+        is_first = True
+        for chunk in self.__generate_chunks_of_masm():
+            if not chunk:
+                continue
+            if not is_first:
+                file.write('\n')
+            is_first = False
+            file.write('\n'.join(chunk))
@@ -0,0 +1,58 @@
+"""Module contains elimination of functions, that are never called
+
+Call graph is built from calls of functions in their bodies. Functions,
+that are not reachable from 'main' through it, could never run, so they
+are removed from the program before code generation or reported as
+warnings.
+"""
+
+from compiler.nodes import FunctionCall, Program, iterate_nodes
+
+
+def build_call_graph(program: Program) -> dict[str, set]:
+    """Names of functions called by every function"""
+    call_graph = dict()
+    for function in program.contents:
+        if function is None:
+            continue
+        call_graph[function.name] = {
+            node.function_name for node in iterate_nodes(function)
+            if isinstance(node, FunctionCall)
+        }
+    return call_graph
+
+
+def get_reachable_functions(call_graph: dict[str, set],
+                            root: str = 'main') -> set:
+    reachable_functions = {root}
+    stack = [root]
+    while stack:
+        for callee in call_graph.get(stack.pop(), ()):
+            if callee not in reachable_functions:
+                reachable_functions.add(callee)
+                stack.append(callee)
+    return reachable_functions
+
+
+def find_dead_functions(program: Program) -> list[str]:
+    """Names of functions, that are unreachable from 'main'"""
+    reachable_functions = get_reachable_functions(build_call_graph(program))
+    return [function.name for function in program.contents
+            if function is not None
+            and function.name not in reachable_functions]
+
+
+def eliminate_functions(program: Program, function_names: list[str]) -> None:
+    program.contents = [function for function in program.contents
+                        if function is not None
+                        and function.name not in function_names]
+
+
+def warn_about_dead_functions(program: Program) -> None:
+    program.context.warnings.extend(
+        f'WARNING: function <{function_name}> is never called'
+        for function_name in find_dead_functions(program))
+
+
+def eliminate_dead_functions(program: Program) -> None:
+    eliminate_functions(program, find_dead_functions(program))
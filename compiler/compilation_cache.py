@@ -0,0 +1,143 @@
+"""Module contains on-disk cache of compilation results
+
+Entry of the cache is keyed by hash of the source code, sources of the
+compiler itself and options of compilation, and contains generated 'masm'
+code with AST of the program and warnings about it. Generated code of
+separate functions is kept in the same storage. Total size of the cache is
+bounded, least recently used entries are removed first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+from compiler import json_writer
+
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+_compiler_fingerprint: Optional[str] = None
+
+
+def get_compiler_fingerprint() -> str:
+    """Hash of sources of the compiler, changes with every its update"""
+    global _compiler_fingerprint
+    if _compiler_fingerprint is None:
+        hasher = hashlib.sha256()
+        compiler_directory = os.path.dirname(os.path.abspath(__file__))
+        for file_name in sorted(os.listdir(compiler_directory)):
+            if file_name.endswith('.py'):
+                hasher.update(file_name.encode())
+                path_to_file = os.path.join(compiler_directory, file_name)
+                with open(path_to_file, 'rb') as source_file:
+                    hasher.update(source_file.read())
+        _compiler_fingerprint = hasher.hexdigest()
+    return _compiler_fingerprint
+
+
+class CompilationCache:
+    """Content-addressed storage of generated code with LRU eviction"""
+
+    ENTRY_EXTENSION = '.json'
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        # Size is computed lazily and then only updated on writes, so
+        # directory is scanned again only when the limit is exceeded
+        self.__size: Optional[int] = None
+
+    @staticmethod
+    def make_key(source_code: str, options: Optional[dict] = None,
+                 kind: str = 'program') -> str:
+        hasher = hashlib.sha256()
+        hasher.update(get_compiler_fingerprint().encode())
+        hasher.update(kind.encode())
+        hasher.update(json.dumps(options or {}, sort_keys=True).encode())
+        hasher.update(source_code.encode())
+        return hasher.hexdigest()
+
+    def __get_path_to_entry(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}{self.ENTRY_EXTENSION}')
+
+    def get(self, key: str) -> Optional[tuple[str, dict, list[str]]]:
+        """Generated code, AST and warnings saved for the key, or None"""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        return entry['generated_code'], entry['ast'], entry['warnings']
+
+    def put(self, key: str, generated_code: str, ast: dict,
+            warnings: list[str]) -> None:
+        self.put_entry(key, {'generated_code': generated_code, 'ast': ast,
+                             'warnings': warnings})
+
+    def get_entry(self, key: str) -> Optional[dict]:
+        path_to_entry = self.__get_path_to_entry(key)
+        try:
+            with open(path_to_entry, 'r') as entry_file:
+                entry = json.load(entry_file)
+            # Modification time is the time of last usage of the entry
+            os.utime(path_to_entry)
+        except (OSError, ValueError, RecursionError):
+            # Decoder of 'json' recurses into nested values, so entries
+            # with too deep AST are not read
+            return None
+        return entry
+
+    def put_entry(self, key: str, entry: dict) -> None:
+        entry_file = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=self.directory,
+                                             delete=False) as entry_file:
+                json_writer.dump(entry, entry_file)
+            os.replace(entry_file.name, self.__get_path_to_entry(key))
+            entry_size = os.path.getsize(self.__get_path_to_entry(key))
+        except BaseException as err:
+            if entry_file is not None and os.path.exists(entry_file.name):
+                os.remove(entry_file.name)
+            if isinstance(err, OSError):
+                # Cache is only an optimization, so failed write is ignored
+                return
+            raise
+
+        if self.__size is None:
+            self.__size = self.__scan()[1]
+        else:
+            self.__size += entry_size
+
+        if self.__size > self.max_size:
+            self.__evict()
+
+    def __scan(self) -> tuple[list[tuple[float, int, str]], int]:
+        """Entries as (last usage, size, path) and their total size"""
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if not directory_entry.name.endswith(self.ENTRY_EXTENSION):
+                    continue
+                try:
+                    stat = directory_entry.stat()
+                except OSError:
+                    continue
+                entries.append(
+                    (stat.st_mtime, stat.st_size, directory_entry.path))
+        return entries, sum(size for _, size, _ in entries)
+
+    def __evict(self) -> None:
+        """Remove least recently used entries until cache takes less than
+        90% of the limit, to not scan directory on every next write"""
+        entries, self.__size = self.__scan()
+        entries.sort()
+        target_size = self.max_size * 0.9
+        for _, size, path_to_entry in entries:
+            if self.__size <= target_size:
+                break
+            try:
+                os.remove(path_to_entry)
+            except OSError:
+                continue
+            self.__size -= size
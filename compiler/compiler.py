@@ -1,80 +1,334 @@
-import json
+import filecmp
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional, TextIO
 
 from rply.errors import LexingError
 
 from compiler.lexer_wrapper import lexer_generator
-from compiler.parser_wrapper import parser_generator
+from compiler.parse_table_cache import build_parser
 from compiler.asm_code_generator import AsmCodeGenerator
-from compiler import errors
+from compiler import errors, json_writer
 from compiler.nodes import Program
+from compiler.context import CompilationContext
+from compiler.compilation_cache import CompilationCache
+from compiler.function_cache import FunctionCodeCache
+from compiler.options import CompilerOptions
+from compiler.peephole import PeepholeOptimizer
+from compiler.pass_manager import PassManager, PassStatistics
+from compiler.profiler import PhaseProfiler, count_nodes
 from compiler.miscellaneous import exit_compiler
 
 
+# Size of buffer of streamed output files
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class CompilationResult:
+    """Outcome of compilation of one source file"""
+
+    path_to_source_file: str
+    path_to_output_file: str
+    succeeded: bool
+    message: str = ''
+    elapsed_time: float = 0.0
+    from_cache: bool = False
+    emitted_files: tuple = ()
+    removed_instructions: dict = field(default_factory=dict)
+    warnings: tuple = ()
+    pass_statistics: dict[str, PassStatistics] = field(default_factory=dict)
+    profile: tuple = ()
+
+
 class Compiler():
 
     def __init__(self, path_to_source_file: str = 'source.c',
-                 path_to_output_file: str = 'generated.asm'):
+                 path_to_output_file: str = 'generated.asm',
+                 lexer=None, parser=None,
+                 cache: Optional[CompilationCache] = None,
+                 function_code_cache: Optional[FunctionCodeCache] = None,
+                 options: Optional[CompilerOptions] = None):
         self.path_to_source_file = path_to_source_file
         self.path_to_output_file = path_to_output_file
+        self.path_to_ast_file = \
+            f'{os.path.splitext(path_to_output_file)[0]}.json'
+        self.options = options or CompilerOptions()
 
-        self.parsed_program: Program
-        self.ast: dict
+        # Built lexer and parser could be shared between compilers,
+        # otherwise they are built on first use
+        self.lexer = lexer
+        self.parser = parser
+        self.cache = cache
+        self.function_code_cache = function_code_cache
+        self.from_cache = False
+        self.emitted_files: list[str] = []
+        self.warnings: list[str] = []
+        self.peephole_optimizer: Optional[PeepholeOptimizer] = None
+        if self.options.peephole_rules:
+            self.peephole_optimizer = \
+                PeepholeOptimizer(self.options.peephole_rules)
+        self.pass_manager = PassManager(self.options)
+        self.profiler: Optional[PhaseProfiler] = None
+        if self.options.profile:
+            self.profiler = PhaseProfiler()
+
+        self.context: CompilationContext
+        self.parsed_program: Optional[Program] = None
+        self.ast: Optional[dict] = None
         self.tokens: list
         self.source_code: str
-        self.generated_code: str
+        self.generated_code: Optional[str] = None
+        self.code_generator: Optional[AsmCodeGenerator] = None
 
     def __read_source_file(self):
         try:
             with open(self.path_to_source_file, 'r') as source_file:
                 self.source_code = source_file.read()
         except FileNotFoundError:
-            print(f"ERROR: no source file '{self.path_to_source_file}'")
-            exit_compiler(1)
+            raise errors.SourceFileDoesNotExistsError(
+                self.path_to_source_file)
 
     def __do_lexing(self):
-        lexer = lexer_generator.build()
-        self.tokens = lexer.lex(self.source_code)
+        if self.lexer is None:
+            self.lexer = lexer_generator.build()
+        self.tokens = self.lexer.lex(self.source_code)
+        if self.profiler is not None:
+            self.tokens = self.profiler.count_tokens(self.tokens)
+        if self.options.stop_after == 'lex':
+            # Tokens are produced lazily while parsing, so without parsing
+            # they have to be produced here to find lexing errors
+            try:
+                self.tokens = list(self.tokens)
+            except LexingError as l_err:
+                raise errors.CodeError(l_err)
 
     def __do_parsing(self):
-        parser = parser_generator.build()
+        if self.parser is None:
+            self.parser = build_parser()
+        self.context = CompilationContext(self.function_code_cache,
+                                          self.peephole_optimizer,
+                                          self.options, self.pass_manager)
         try:
-            self.parsed_program = parser.parse(self.tokens)
-        except (errors.CodeError,
-                errors.VariableIsNotInitializedError,
-                errors.VariableDoesNotExistsError,
-                errors.DivisionByZeroError,
-                errors.VariableAlreadyExistsError,
-                errors.NoReturnStatementInFunctionError,
-                errors.FunctionDoesNotExistsError,
-                errors.MainFunctionDoesNotExistsError,
-                errors.FunctionAlreadyExistsError,
-                errors.ArgumentsDidNotMatchError) as err:
-            print(err.message)
-            exit_compiler(1)
+            self.parsed_program = self.parser.parse(self.tokens,
+                                                    state=self.context)
         except LexingError as l_err:
-            l_err = errors.CodeError(l_err)
-            print(l_err.message)
-            exit_compiler(1)
+            raise errors.CodeError(l_err)
 
     def __build_abstract_syntax_tree(self):
-        stringified_ast = self.parsed_program.generate_ast_representation()
-        self.ast = json.loads(stringified_ast)
+        self.ast = self.parsed_program.generate_ast()
+
+    def __optimize(self):
+        self.pass_manager.run_ast_passes(self.parsed_program)
+        self.warnings.extend(self.context.warnings)
+
+    def __streams_asm_code(self) -> bool:
+        # Code is written to the file while it is generated, unless whole
+        # code is needed for the cache
+        return self.options.runs_phase('write') and not self.__uses_cache()
 
     def __generate_asm_code(self):
-        code_generator = AsmCodeGenerator(self.parsed_program)
-        self.generated_code = code_generator.generate_asm_code()
+        self.code_generator = AsmCodeGenerator(self.parsed_program)
+        if not self.__streams_asm_code():
+            self.generated_code = self.code_generator.generate_asm_code()
+
+    def __uses_cache(self) -> bool:
+        # Only complete compilations with some output are cached
+        return (self.cache is not None and self.options.stop_after is None
+                and bool(self.options.emit))
+
+    def __get_cache_key(self) -> str:
+        return self.cache.make_key(self.source_code,
+                                   self.options.get_cache_key())
+
+    def __load_from_cache(self) -> bool:
+        if not self.__uses_cache():
+            return False
+        cached = self.cache.get(self.__get_cache_key())
+        if cached is None:
+            return False
+        self.generated_code, self.ast, warnings = cached
+        self.warnings.extend(warnings)
+        self.from_cache = True
+        return True
+
+    def __save_to_cache(self):
+        if self.__uses_cache():
+            self.cache.put(self.__get_cache_key(), self.generated_code,
+                           self.ast, self.warnings)
+
+    def __write_file_if_changed(self, path_to_file: str, content: str):
+        # Unchanged file is not rewritten, so its modification time
+        # does not trigger assembling of it again
+        self.emitted_files.append(path_to_file)
+        try:
+            with open(path_to_file, 'r') as file:
+                if file.read() == content:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+        with open(path_to_file, 'w') as file:
+            file.write(content)
+
+    def __stream_file_if_changed(self, path_to_file: str,
+                                 write_content: Callable[[TextIO], None]):
+        # Content is written into temporary file first, which replaces
+        # the file only when their contents differ
+        self.emitted_files.append(path_to_file)
+        path_to_temporary_file = f'{path_to_file}.{os.getpid()}.tmp'
+        try:
+            with open(path_to_temporary_file, 'w',
+                      buffering=WRITE_BUFFER_SIZE) as file:
+                write_content(file)
+            if (os.path.isfile(path_to_file)
+                    and filecmp.cmp(path_to_file, path_to_temporary_file,
+                                    shallow=False)):
+                os.remove(path_to_temporary_file)
+            else:
+                os.replace(path_to_temporary_file, path_to_file)
+        except BaseException:
+            if os.path.exists(path_to_temporary_file):
+                os.remove(path_to_temporary_file)
+            raise
 
     def __write_generated_code_to_file(self):
-        with open(self.path_to_output_file, 'w') as asm_file:
-            asm_file.write(self.generated_code)
+        if 'asm' in self.options.emit:
+            if self.generated_code is None:
+                self.__stream_file_if_changed(
+                    self.path_to_output_file,
+                    self.code_generator.write_asm_code)
+            else:
+                self.__write_file_if_changed(self.path_to_output_file,
+                                             self.generated_code)
+        if 'ast' in self.options.emit:
+            self.__stream_file_if_changed(self.path_to_ast_file,
+                                          self.write_abstract_syntax_tree)
+
+    def __run_phase(self, phase: str, run_phase: Callable[[], None]):
+        if self.profiler is None:
+            run_phase()
+            return
+        profile = self.profiler.run_phase(phase, run_phase)
+        if phase in ('parse', 'ast', 'optimize'):
+            profile.nodes = count_nodes(self.parsed_program)
+
+    def __run_phases(self):
+        if self.profiler is None:
+            self.__run_all_phases()
+            return
+        self.profiler.start()
+        try:
+            self.__run_all_phases()
+        finally:
+            self.profiler.stop()
+
+    def __run_all_phases(self):
+        self.__run_phase('read', self.__read_source_file)
+        if not self.__load_from_cache():
+            phases = (
+                ('lex', self.__do_lexing),
+                ('parse', self.__do_parsing),
+                ('ast', self.__build_abstract_syntax_tree),
+                ('optimize', self.__optimize),
+                ('codegen', self.__generate_asm_code),
+            )
+            for phase, run_phase in phases:
+                if self.options.runs_phase(phase):
+                    self.__run_phase(phase, run_phase)
+            self.__save_to_cache()
+        if self.options.runs_phase('write'):
+            self.__run_phase('write', self.__write_generated_code_to_file)
 
     def compile(self):
-        self.__read_source_file()
-        self.__do_lexing()
-        self.__do_parsing()
-        self.__build_abstract_syntax_tree()
-        self.__generate_asm_code()
-        self.__write_generated_code_to_file()
+        try:
+            self.__run_phases()
+        except errors.CompilerError as err:
+            print(err.message)
+            exit_compiler(1)
+        for warning in self.warnings:
+            print(warning)
+
+    def try_compile(self) -> CompilationResult:
+        """Compile source file, but return errors instead of exiting"""
+        start_time = time.perf_counter()
+        try:
+            self.__run_phases()
+        except errors.CompilerError as err:
+            succeeded, message = False, err.message
+        except Exception as err:
+            succeeded, message = False, f'INTERNAL ERROR: {err!r}'
+        else:
+            succeeded, message = True, ''
+        return CompilationResult(
+            path_to_source_file=self.path_to_source_file,
+            path_to_output_file=self.path_to_output_file,
+            succeeded=succeeded,
+            message=message,
+            elapsed_time=time.perf_counter() - start_time,
+            from_cache=self.from_cache,
+            emitted_files=tuple(self.emitted_files),
+            removed_instructions=self.get_removed_instructions(),
+            warnings=tuple(self.warnings),
+            pass_statistics=self.pass_manager.statistics,
+            profile=tuple(self.profiler.profiles
+                          if self.profiler is not None else ())
+        )
+
+    @staticmethod
+    def get_output_path(path_to_source_file: str,
+                        output_directory: Optional[str] = None) -> str:
+        """Path of '.asm' file generated for source file"""
+        path_without_extension, _ = os.path.splitext(path_to_source_file)
+        if output_directory is not None:
+            path_without_extension = os.path.join(
+                output_directory, os.path.basename(path_without_extension))
+        return f'{path_without_extension}.asm'
+
+    @classmethod
+    def compile_many(cls, paths_to_source_files: Iterable[str],
+                     output_directory: Optional[str] = None,
+                     cache: Optional[CompilationCache] = None,
+                     options: Optional[CompilerOptions] = None
+                     ) -> list[CompilationResult]:
+        """Compile every source file with lexer and parser built once"""
+        lexer = lexer_generator.build()
+        parser = build_parser()
+
+        # Code of functions is shared between files too, so functions that
+        # are repeated in many files are generated once
+        options = options or CompilerOptions()
+        function_code_cache = FunctionCodeCache(
+            storage=cache, options=options.get_cache_key())
+
+        if output_directory is not None:
+            os.makedirs(output_directory, exist_ok=True)
+
+        results = []
+        for path_to_source_file in paths_to_source_files:
+            compiler = cls(
+                path_to_source_file,
+                cls.get_output_path(path_to_source_file, output_directory),
+                lexer=lexer,
+                parser=parser,
+                cache=cache,
+                function_code_cache=function_code_cache,
+                options=options
+            )
+            results.append(compiler.try_compile())
+        return results
+
+    def get_removed_instructions(self) -> dict:
+        """Number of instructions removed by every peephole rule"""
+        if self.peephole_optimizer is None:
+            return {}
+        return dict(self.peephole_optimizer.removed_instructions)
 
     def print_abstract_syntax_tree(self):
-        print(json.dumps(self.ast, indent=4))
+        self.write_abstract_syntax_tree(sys.stdout)
+        print()
+
+    def write_abstract_syntax_tree(self, file: TextIO):
+        """Stream AST as json to the file without building its string"""
+        json_writer.dump(self.ast, file, indent=4)
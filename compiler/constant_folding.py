@@ -0,0 +1,173 @@
+"""Module contains constant folding and propagation over AST of functions
+
+Subexpressions with constant operands are replaced by their values, and
+values of local variables assigned from constants are propagated through
+straight-line code. Values are computed the same way as generated code
+does it, with 32-bit wrap-around and division that truncates toward zero.
+"""
+
+from typing import Optional
+
+from compiler.miscellaneous import Recursion, run_iteratively, to_int32
+from compiler.nodes import (DoWhileLoop, Function, Return, UnaryExpression,
+                            BinaryExpression, TernaryExpression, FunctionCall,
+                            VariableInitialization, Variable, Program, Operand)
+
+
+INT32_MIN = -2 ** 31
+
+
+def evaluate_binary_operation(operator: str, left: int,
+                              right: int) -> Optional[int]:
+    """Result of operation on constants or None, when it traps at runtime"""
+    left, right = to_int32(left), to_int32(right)
+    if operator == '+':
+        return to_int32(left + right)
+    elif operator == '-':
+        return to_int32(left - right)
+    elif operator == '*':
+        return to_int32(left * right)
+    elif operator == '/':
+        if right == 0 or (left == INT32_MIN and right == -1):
+            return None
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    elif operator == '<':
+        return int(left < right)
+    elif operator == '==':
+        return int(left == right)
+    elif operator == '&&':
+        return int(left != 0 and right != 0)
+    elif operator == '||':
+        return int(left != 0 or right != 0)
+    return None
+
+
+def _simplify_binary_expression(expression: BinaryExpression) -> Operand:
+    """Drop operations with neutral constant operand"""
+    left, right = expression.left_operand, expression.right_operand
+    operator = expression.operator
+
+    if isinstance(right, int):
+        if (operator in ('+', '-') and right == 0
+                or operator in ('*', '/') and right == 1):
+            return left
+    if isinstance(left, int):
+        if operator == '+' and left == 0 or operator == '*' and left == 1:
+            return right
+        # Right operand is not evaluated in 'C' in these cases
+        if operator == '&&' and left == 0:
+            return 0
+        if operator == '||' and left != 0:
+            return 1
+    return expression
+
+
+def _fold_operand(operand: Operand, known_values: dict
+                  ) -> Recursion[Operand]:
+    if isinstance(operand, Variable):
+        return known_values.get(operand, operand)
+
+    if isinstance(operand, FunctionCall):
+        arguments = []
+        for argument in operand.arguments:
+            arguments.append((yield _fold_operand(argument, known_values)))
+        operand.arguments = arguments
+    elif isinstance(operand, UnaryExpression):
+        operand.value = yield _fold_operand(operand.value, known_values)
+        if isinstance(operand.value, int):
+            return to_int32(-operand.value)
+        if isinstance(operand.value, UnaryExpression):
+            return operand.value.value
+    elif isinstance(operand, BinaryExpression):
+        operand.left_operand = yield _fold_operand(operand.left_operand,
+                                                   known_values)
+        operand.right_operand = yield _fold_operand(operand.right_operand,
+                                                    known_values)
+        if (isinstance(operand.left_operand, int)
+                and isinstance(operand.right_operand, int)):
+            value = evaluate_binary_operation(operand.operator,
+                                              operand.left_operand,
+                                              operand.right_operand)
+            if value is not None:
+                return value
+        return _simplify_binary_expression(operand)
+    elif isinstance(operand, TernaryExpression):
+        operand.condition = yield _fold_operand(operand.condition,
+                                                known_values)
+        if isinstance(operand.condition, int):
+            # Only one branch is ever evaluated
+            if operand.condition != 0:
+                return (yield _fold_operand(operand.left_operand,
+                                            known_values))
+            return (yield _fold_operand(operand.right_operand, known_values))
+        operand.left_operand = yield _fold_operand(operand.left_operand,
+                                                   known_values)
+        operand.right_operand = yield _fold_operand(operand.right_operand,
+                                                    known_values)
+    return operand
+
+
+def fold_operand(operand: Operand, known_values: dict) -> Operand:
+    """Folded operand, subexpressions are folded in place"""
+    return run_iteratively(_fold_operand(operand, known_values))
+
+
+def _get_assigned_variables(body: list) -> set:
+    assigned_variables = set()
+    for instruction in body:
+        if (isinstance(instruction, VariableInitialization)
+                and instruction.expression is not None):
+            assigned_variables.add(instruction.variable)
+        elif isinstance(instruction, DoWhileLoop):
+            assigned_variables |= _get_assigned_variables(instruction.body)
+    return assigned_variables
+
+
+def _fold_loop(loop: DoWhileLoop, known_values: dict) -> None:
+    # Variables assigned in the loop have different values on every
+    # iteration, other values stay known inside and after the loop
+    for variable in _get_assigned_variables(loop.body):
+        known_values.pop(variable, None)
+
+    values_in_body = dict(known_values)
+    if _fold_body(loop.body, values_in_body):
+        loop.expression = fold_operand(loop.expression, values_in_body)
+    else:
+        # Condition could be reached by 'continue' from the middle of body
+        loop.expression = fold_operand(loop.expression, dict(known_values))
+
+
+def _fold_body(body: list, known_values: dict) -> bool:
+    """Fold instructions of the body in place, returns False when end of
+    the body is not reached after 'break' or 'continue'"""
+    reaches_end = True
+    for instruction in body:
+        if isinstance(instruction, VariableInitialization):
+            if instruction.expression is None:
+                continue
+            instruction.expression = fold_operand(instruction.expression,
+                                                  known_values)
+            if isinstance(instruction.expression, int):
+                known_values[instruction.variable] = instruction.expression
+            else:
+                known_values.pop(instruction.variable, None)
+        elif isinstance(instruction, Return):
+            instruction.argument = fold_operand(instruction.argument,
+                                                known_values)
+        elif isinstance(instruction, DoWhileLoop):
+            _fold_loop(instruction, known_values)
+        elif instruction in ('break', 'continue'):
+            reaches_end = False
+    return reaches_end
+
+
+def fold_constants_of_function(function: Function) -> None:
+    _fold_body(function.body, dict())
+
+
+def fold_constants(program: Program) -> None:
+    """Fold constants in every function of the program in place"""
+    for function in program.contents:
+        if function is not None:
+            fold_constants_of_function(function)
@@ -0,0 +1,82 @@
+"""Module contains state of one compilation
+
+Every compilation gets its own context, so compilations that run one after
+another or in different threads do not see functions, labels and registers
+of each other.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+from compiler.options import CompilerOptions
+from compiler.register_allocator import CALLEE_SAVED_REGISTERS
+
+if TYPE_CHECKING:
+    from compiler.nodes import Function
+    from compiler.function_cache import FunctionCodeCache
+    from compiler.peephole import PeepholeOptimizer
+    from compiler.pass_manager import PassManager
+
+
+class CompilationContext:
+    """State shared by parser productions and nodes of one program"""
+
+    __slots__ = ('__all_functions', '__current_function_name',
+                 '__used_registers', '__number_of_spill_slots',
+                 'function_code_cache',
+                 'peephole_optimizer', 'pass_manager', 'options',
+                 'warnings')
+
+    def __init__(self,
+                 function_code_cache: Optional[FunctionCodeCache] = None,
+                 peephole_optimizer: Optional[PeepholeOptimizer] = None,
+                 options: Optional[CompilerOptions] = None,
+                 pass_manager: Optional[PassManager] = None):
+        self.__all_functions: dict[str, Function] = dict()
+        self.__current_function_name: Optional[str] = None
+        self.__used_registers: set[str] = set()
+        self.__number_of_spill_slots = 0
+        self.function_code_cache = function_code_cache
+        self.peephole_optimizer = peephole_optimizer
+        self.pass_manager = pass_manager
+        self.options = options or CompilerOptions()
+        self.warnings: list[str] = []
+
+    def add_function(self, function: Function) -> None:
+        self.__all_functions[function.name] = function
+
+    def get_function(self, function_name: str) -> Union[Function, None]:
+        return self.__all_functions.get(function_name)
+
+    def get_functions(self) -> dict:
+        return self.__all_functions.copy()
+
+    def get_current_function(self) -> Union[Function, None]:
+        return self.__all_functions.get(self.__current_function_name)
+
+    def set_current_function(self, function_unique_name: str) -> None:
+        self.__current_function_name = function_unique_name
+
+    def reset_function_state(self) -> None:
+        """Start usage of registers and spill slots from scratch, so code of
+        a function does not depend on functions before it"""
+        self.__used_registers = set()
+        self.__number_of_spill_slots = 0
+
+    def use_register(self, register: str) -> None:
+        """Register, that is saved by the current function"""
+        self.__used_registers.add(register)
+
+    def get_used_registers(self) -> list[str]:
+        return [register for register in CALLEE_SAVED_REGISTERS
+                if register in self.__used_registers]
+
+    def use_spill_slot(self, slot: int) -> None:
+        self.__number_of_spill_slots = max(self.__number_of_spill_slots,
+                                           slot + 1)
+
+    def get_number_of_spill_slots(self) -> int:
+        """Number of stack slots of spilled temporaries of the current
+        function"""
+        return self.__number_of_spill_slots
@@ -0,0 +1,42 @@
+"""Module contains passes, that simplify control-flow graph of functions
+
+Jumps to empty blocks, that only jump further, go straight to the final
+target, and jumps to empty blocks, that only return, are replaced by the
+return. Blocks, that could not be reached from the entry after that, are
+removed, so no code is generated for them.
+"""
+
+from compiler.ir import BasicBlock, Branch, IRFunction, Jump, Return
+
+
+def _get_final_target(block: BasicBlock) -> BasicBlock:
+    """Block, that control reaches from the block through empty blocks"""
+    visited = {block}
+    while (not block.instructions and isinstance(block.terminator, Jump)
+           and block.terminator.target not in visited):
+        block = block.terminator.target
+        visited.add(block)
+    return block
+
+
+def thread_jumps(function: IRFunction) -> None:
+    for block in function.blocks:
+        terminator = block.terminator
+        if isinstance(terminator, Jump):
+            terminator.target = _get_final_target(terminator.target)
+        elif isinstance(terminator, Branch):
+            terminator.if_true = _get_final_target(terminator.if_true)
+            terminator.if_false = _get_final_target(terminator.if_false)
+
+
+def duplicate_returns(function: IRFunction) -> None:
+    for block in function.blocks:
+        terminator = block.terminator
+        if (isinstance(terminator, Jump)
+                and not terminator.target.instructions
+                and isinstance(terminator.target.terminator, Return)):
+            block.terminator = Return(terminator.target.terminator.value)
+
+
+def remove_unreachable_blocks(function: IRFunction) -> None:
+    function.remove_unreachable_blocks()
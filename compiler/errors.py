@@ -3,7 +3,21 @@
 from rply.errors import LexingError
 
 
-class CodeError(Exception):
+class CompilerError(Exception):
+    """Base class for errors that stop compilation of a source file"""
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class SourceFileDoesNotExistsError(CompilerError):
+
+    def __init__(self, path_to_source_file):
+        super().__init__(f"ERROR: no source file '{path_to_source_file}'")
+
+
+class CodeError(CompilerError):
 
     def __init__(self, err):
         self.err = err
@@ -20,7 +34,7 @@ class CodeError(Exception):
         super().__init__(self.message)
 
 
-class VariableDoesNotExistsError(Exception):
+class VariableDoesNotExistsError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -30,7 +44,7 @@ class VariableDoesNotExistsError(Exception):
         super().__init__(self.message)
 
 
-class VariableIsNotInitializedError(Exception):
+class VariableIsNotInitializedError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -41,7 +55,7 @@ class VariableIsNotInitializedError(Exception):
         super().__init__(self.message)
 
 
-class VariableAlreadyExistsError(Exception):
+class VariableAlreadyExistsError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -52,7 +66,7 @@ class VariableAlreadyExistsError(Exception):
         super().__init__(self.message)
 
 
-class DivisionByZeroError(Exception):
+class DivisionByZeroError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -61,7 +75,7 @@ class DivisionByZeroError(Exception):
         super().__init__(self.message)
 
 
-class NoReturnStatementInFunctionError(Exception):
+class NoReturnStatementInFunctionError(CompilerError):
 
     def __init__(self, function_name):
         self.message = (f'ERROR: Function <{function_name}> should return '
@@ -69,7 +83,7 @@ class NoReturnStatementInFunctionError(Exception):
         super().__init__(self.message)
 
 
-class FunctionDoesNotExistsError(Exception):
+class FunctionDoesNotExistsError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -79,7 +93,7 @@ class FunctionDoesNotExistsError(Exception):
         super().__init__(self.message)
 
 
-class FunctionAlreadyExistsError(Exception):
+class FunctionAlreadyExistsError(CompilerError):
 
     def __init__(self, token):
         token_position = token.getsourcepos()
@@ -90,7 +104,7 @@ class FunctionAlreadyExistsError(Exception):
         super().__init__(self.message)
 
 
-class MainFunctionDoesNotExistsError(Exception):
+class MainFunctionDoesNotExistsError(CompilerError):
 
     def __init__(self):
         self.message = ('ERROR: No entry point in program. '
@@ -98,7 +112,7 @@ class MainFunctionDoesNotExistsError(Exception):
         super().__init__(self.message)
 
 
-class ArgumentsDidNotMatchError(Exception):
+class ArgumentsDidNotMatchError(CompilerError):
 
     def __init__(self, function_name, token):
         token_position = token.getsourcepos()
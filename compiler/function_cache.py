@@ -0,0 +1,120 @@
+"""Module contains memo cache of generated code of separate functions
+
+Labels and registers are numbered from scratch in every function, so
+generated code of a function depends only on its own subtree. Code is
+cached by structural hash of that subtree, and when one function of a big
+file is edited, only this function is generated again.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Optional
+
+from compiler.compilation_cache import CompilationCache
+from compiler.nodes import (DoWhileLoop, Function, Return, UnaryExpression,
+                            BinaryExpression, TernaryExpression, FunctionCall,
+                            VariableInitialization, Variable, TailCall)
+
+
+def _describe_nodes(nodes: list) -> list:
+    """Structure of the nodes as flat json-serializable list in prefix
+    order, lists of nodes are preceded by their lengths, so nodes are
+    described without recursion"""
+    description = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node is None or isinstance(node, str):
+            # Empty instruction, 'break' or 'continue'
+            description.append(node)
+        elif isinstance(node, Variable):
+            description.extend(('variable', node.name))
+        elif isinstance(node, FunctionCall):
+            description.extend(('call', node.function.name_with_salt,
+                                len(node.arguments)))
+            stack.extend(reversed(node.arguments))
+        elif isinstance(node, UnaryExpression):
+            description.extend(('unary', node.operator))
+            stack.append(node.value)
+        elif isinstance(node, BinaryExpression):
+            description.extend(('binary', node.operator))
+            stack.extend((node.right_operand, node.left_operand))
+        elif isinstance(node, TernaryExpression):
+            description.append('ternary')
+            stack.extend((node.right_operand, node.left_operand,
+                          node.condition))
+        elif isinstance(node, Return):
+            description.append('return')
+            stack.append(node.argument)
+        elif isinstance(node, VariableInitialization):
+            description.extend(('assign', node.variable.name))
+            stack.append(node.expression)
+        elif isinstance(node, TailCall):
+            description.append('tail_call')
+            stack.extend((node.accumulation, node.call))
+        elif isinstance(node, DoWhileLoop):
+            description.extend(('do_while', len(node.body)))
+            stack.append(node.expression)
+            stack.extend(reversed(node.body))
+        else:
+            description.extend(('number', node))
+    return description
+
+
+def describe_function(function: Function) -> list:
+    return [
+        'function',
+        function.name_with_salt,
+        [argument.name for argument in function.arguments],
+        [variable.name for variable in function.get_variables().values()
+         if not variable.is_function_argument],
+        len(function.body),
+        *_describe_nodes(function.body),
+    ]
+
+
+class FunctionCodeCache:
+    """In-memory LRU cache of generated code of functions, optionally
+    backed by on-disk compilation cache"""
+
+    def __init__(self, max_entries: int = 4096,
+                 storage: Optional[CompilationCache] = None,
+                 options: Optional[dict] = None):
+        self.max_entries = max_entries
+        self.storage = storage
+        self.options = options
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[str, list] = OrderedDict()
+
+    def make_key(self, function: Function) -> str:
+        return CompilationCache.make_key(
+            json.dumps(describe_function(function)), self.options,
+            kind='function')
+
+    def get(self, key: str) -> Optional[list]:
+        asm_code = self.__entries.get(key)
+        if asm_code is not None:
+            self.__entries.move_to_end(key)
+        elif self.storage is not None:
+            entry = self.storage.get_entry(key)
+            if entry is not None:
+                asm_code = entry['asm_code']
+                self.__remember(key, asm_code)
+
+        if asm_code is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(asm_code)
+
+    def put(self, key: str, asm_code: list) -> None:
+        self.__remember(key, list(asm_code))
+        if self.storage is not None:
+            self.storage.put_entry(key, {'asm_code': asm_code})
+
+    def __remember(self, key: str, asm_code: list) -> None:
+        self.__entries[key] = asm_code
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
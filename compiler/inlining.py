@@ -0,0 +1,244 @@
+"""Module contains inlining of small functions at places of their calls
+
+Body of a small not recursive function, that ends with its only 'return',
+is copied before the statement with the call. Arguments and local
+variables of the copy are renamed into new local variables of the caller,
+arguments are assigned values of passed expressions, and the call is
+replaced by the expression of 'return'. Only calls, that are always
+evaluated with the statement, are inlined, so operands of '&&', '||' and
+branches of ternary operator are not moved before it.
+"""
+
+from itertools import islice
+from typing import Optional
+
+from compiler.call_graph import build_call_graph, get_reachable_functions
+from compiler.miscellaneous import Recursion, run_iteratively
+from compiler.nodes import (DoWhileLoop, Function, Return, UnaryExpression,
+                            BinaryExpression, TernaryExpression, FunctionCall,
+                            VariableInitialization, Variable, Program,
+                            Operand, iterate_nodes)
+
+
+# Operators, whose right operand is evaluated only for some values of left
+SHORT_CIRCUIT_OPERATORS = ('&&', '||')
+
+
+def get_size_of_function(function: Function,
+                         limit: Optional[int] = None) -> int:
+    """Number of nodes in the body of the function, nodes after the limit
+    are not counted"""
+    nodes = (node for instruction in function.body
+             for node in iterate_nodes(instruction))
+    return sum(1 for _ in islice(nodes, limit))
+
+
+def _has_single_return(function: Function) -> bool:
+    """Function returns only by 'return' at the end of its body"""
+    if not function.body or not isinstance(function.body[-1], Return):
+        return False
+    return not any(isinstance(node, Return)
+                   for instruction in function.body[:-1]
+                   for node in iterate_nodes(instruction))
+
+
+class FunctionInliner:
+    """Inlines calls of functions, whose size does not exceed threshold"""
+
+    def __init__(self, program: Program, threshold: int):
+        self.program = program
+        self.context = program.context
+        self.threshold = threshold
+        self.__call_graph = build_call_graph(program)
+        self.__number_of_copies = 0
+        # Whether functions could be inlined, computed once for every
+        # function and again after calls are inlined into its body
+        self.__inlinable_functions: dict[Function, bool] = dict()
+
+    def __is_recursive(self, function: Function) -> bool:
+        return any(function.name in get_reachable_functions(
+                       self.__call_graph, callee)
+                   for callee in self.__call_graph.get(function.name, ()))
+
+    def __is_inlinable(self, function: Function) -> bool:
+        if function not in self.__inlinable_functions:
+            self.__inlinable_functions[function] = (
+                function.name != 'main'
+                and get_size_of_function(function, self.threshold + 1)
+                <= self.threshold
+                and _has_single_return(function)
+                and not self.__is_recursive(function))
+        return self.__inlinable_functions[function]
+
+    def __can_inline(self, call: FunctionCall) -> bool:
+        function = call.function
+        return (len(call.arguments) == len(function.arguments)
+                and self.__is_inlinable(function))
+
+    def __get_new_name(self, caller: Function, variable: Variable) -> str:
+        """Name of a local variable of the caller, that is not used by its
+        variables and functions"""
+        while True:
+            name = f'{variable.name}_{self.__number_of_copies}'
+            self.__number_of_copies += 1
+            if (not caller.variable_exists(name)
+                    and self.context.get_function(name) is None):
+                return name
+
+    def __iterate_copy(self, operand: Operand,
+                       variables: dict[Variable, Variable]
+                       ) -> Recursion[Operand]:
+        if isinstance(operand, Variable):
+            return variables[operand]
+        if isinstance(operand, FunctionCall):
+            arguments = []
+            for argument in operand.arguments:
+                arguments.append(
+                    (yield self.__iterate_copy(argument, variables)))
+            return FunctionCall(operand.function_name, self.context,
+                                arguments)
+        if isinstance(operand, UnaryExpression):
+            return UnaryExpression(
+                (yield self.__iterate_copy(operand.value, variables)),
+                operand.operator)
+        if isinstance(operand, BinaryExpression):
+            return BinaryExpression(
+                (yield self.__iterate_copy(operand.left_operand, variables)),
+                (yield self.__iterate_copy(operand.right_operand,
+                                           variables)),
+                operand.operator)
+        if isinstance(operand, TernaryExpression):
+            return TernaryExpression(
+                (yield self.__iterate_copy(operand.left_operand, variables)),
+                (yield self.__iterate_copy(operand.right_operand,
+                                           variables)),
+                (yield self.__iterate_copy(operand.condition, variables)))
+        return operand
+
+    def __copy_operand(self, operand: Operand,
+                       variables: dict[Variable, Variable]) -> Operand:
+        return run_iteratively(self.__iterate_copy(operand, variables))
+
+    def __copy_instruction(self, instruction,
+                           variables: dict[Variable, Variable]):
+        if isinstance(instruction, VariableInitialization):
+            copy = VariableInitialization(
+                variables[instruction.variable].name, self.context)
+            if instruction.expression is not None:
+                copy.expression = self.__copy_operand(instruction.expression,
+                                                      variables)
+            return copy
+        if isinstance(instruction, DoWhileLoop):
+            return DoWhileLoop(
+                [self.__copy_instruction(item, variables)
+                 for item in instruction.body],
+                self.__copy_operand(instruction.expression, variables))
+        # 'break', 'continue' and empty instructions
+        return instruction
+
+    def __inline_call(self, caller: Function, call: FunctionCall,
+                      statements: list) -> Operand:
+        """Add copy of body of the called function to statements and return
+        operand with its result"""
+        function = call.function
+        variables = dict()
+        for variable in function.get_variables().values():
+            variables[variable] = Variable(
+                variable.type, self.__get_new_name(caller, variable),
+                self.context)
+
+        for argument, value in zip(function.arguments, call.arguments):
+            statements.append(VariableInitialization(
+                variables[argument].name, self.context, expression=value))
+        for instruction in function.body[:-1]:
+            if instruction is not None and not isinstance(instruction,
+                                                          Variable):
+                statements.append(self.__copy_instruction(instruction,
+                                                          variables))
+        return self.__copy_operand(function.body[-1].argument, variables)
+
+    def __iterate_inlining(self, caller: Function, operand: Operand,
+                           statements: list) -> Recursion[Operand]:
+        if isinstance(operand, FunctionCall):
+            arguments = []
+            for argument in operand.arguments:
+                arguments.append((yield self.__iterate_inlining(
+                    caller, argument, statements)))
+            operand.arguments = arguments
+            if self.__can_inline(operand):
+                return self.__inline_call(caller, operand, statements)
+        elif isinstance(operand, UnaryExpression):
+            operand.value = yield self.__iterate_inlining(
+                caller, operand.value, statements)
+        elif isinstance(operand, BinaryExpression):
+            operand.left_operand = yield self.__iterate_inlining(
+                caller, operand.left_operand, statements)
+            if operand.operator not in SHORT_CIRCUIT_OPERATORS:
+                operand.right_operand = yield self.__iterate_inlining(
+                    caller, operand.right_operand, statements)
+        elif isinstance(operand, TernaryExpression):
+            operand.condition = yield self.__iterate_inlining(
+                caller, operand.condition, statements)
+        return operand
+
+    def __inline_operand(self, caller: Function, operand: Operand,
+                         statements: list) -> Operand:
+        """Inline calls, that are always evaluated with the operand"""
+        return run_iteratively(self.__iterate_inlining(caller, operand,
+                                                       statements))
+
+    def __inline_body(self, caller: Function, body: list) -> list:
+        new_body = []
+        for instruction in body:
+            if isinstance(instruction, VariableInitialization):
+                if instruction.expression is not None:
+                    instruction.expression = self.__inline_operand(
+                        caller, instruction.expression, new_body)
+            elif isinstance(instruction, Return):
+                instruction.argument = self.__inline_operand(
+                    caller, instruction.argument, new_body)
+            elif isinstance(instruction, DoWhileLoop):
+                # Condition is evaluated on every iteration, so calls in it
+                # are not inlined
+                instruction.body = self.__inline_body(caller,
+                                                      instruction.body)
+            new_body.append(instruction)
+        return new_body
+
+    def __get_order_of_functions(self) -> list[Function]:
+        """Called functions go before functions, that call them, so their
+        calls are inlined into copied bodies too"""
+        order: list[Optional[Function]] = []
+        visited = set()
+        for function in self.program.contents:
+            if function is None or function.name in visited:
+                continue
+            visited.add(function.name)
+            stack = [(function.name,
+                      iter(self.__call_graph.get(function.name, ())))]
+            while stack:
+                name, callees = stack[-1]
+                for callee in callees:
+                    if callee not in visited:
+                        visited.add(callee)
+                        stack.append(
+                            (callee, iter(self.__call_graph.get(callee, ()))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(self.context.get_function(name))
+        return order
+
+    def inline(self) -> None:
+        if self.threshold <= 0:
+            return
+        for function in self.__get_order_of_functions():
+            # New variables are added to the function, whose calls are
+            # inlined
+            self.context.set_current_function(function.name)
+            function.body = self.__inline_body(function, function.body)
+            self.__inlinable_functions.pop(function, None)
+
+
+def inline_functions(program: Program, threshold: int) -> None:
+    FunctionInliner(program, threshold).inline()
@@ -0,0 +1,327 @@
+"""Module contains three-address intermediate representation of functions
+
+Nodes of a function are lowered into instructions with at most one result
+and two operands: copies, unary and binary operations and calls. Operands
+are temporaries, names of variables and numbers. Instructions are grouped
+into basic blocks, that end with a jump, a conditional branch or a return,
+and blocks with edges between them form control-flow graph of the
+function. Backends of target languages consume functions in this form, so
+optimizations of the graph do not depend on any of them.
+
+Every temporary is defined and used in code of one statement and used
+once, only results of ternary and logical operations are defined on every
+path into the block, that uses them. So temporaries are never live across
+statements and backward edges.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from compiler.options import CompilerOptions
+
+
+class Temporary:
+    """Intermediate value of expression"""
+
+    __slots__ = ('index',)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self):
+        return f't{self.index}'
+
+
+# Temporary, name of variable or number
+Value = Union[Temporary, str, int]
+
+# Conditions of branches and conditions opposite to them
+NEGATED_CONDITIONS = {'==': '!=', '!=': '==', '<': '>=', '>=': '<'}
+
+
+def get_temporaries(*values: Value) -> Iterator[Temporary]:
+    return (value for value in values if isinstance(value, Temporary))
+
+
+class Copy:
+    """destination = source"""
+
+    __slots__ = ('destination', 'source')
+
+    def __init__(self, destination: Union[Temporary, str], source: Value):
+        self.destination = destination
+        self.source = source
+
+    def get_values(self) -> tuple:
+        return self.destination, self.source
+
+    def __str__(self):
+        return f'{self.destination} = {self.source}'
+
+
+class UnaryOperation:
+    """destination = operator value"""
+
+    __slots__ = ('destination', 'operator', 'value')
+
+    def __init__(self, destination: Temporary, operator: str, value: Value):
+        self.destination = destination
+        self.operator = operator
+        self.value = value
+
+    def get_values(self) -> tuple:
+        return self.destination, self.value
+
+    def __str__(self):
+        return f'{self.destination} = {self.operator}{self.value}'
+
+
+class BinaryOperation:
+    """destination = left operand operator right operand"""
+
+    __slots__ = ('destination', 'operator', 'left_operand', 'right_operand')
+
+    def __init__(self, destination: Temporary, operator: str,
+                 left_operand: Value, right_operand: Value):
+        self.destination = destination
+        self.operator = operator
+        self.left_operand = left_operand
+        self.right_operand = right_operand
+
+    def get_values(self) -> tuple:
+        return self.destination, self.left_operand, self.right_operand
+
+    def __str__(self):
+        return (f'{self.destination} = {self.left_operand} '
+                f'{self.operator} {self.right_operand}')
+
+
+class Call:
+    """destination = function(arguments), result of call could be unused"""
+
+    __slots__ = ('destination', 'function_name', 'arguments')
+
+    def __init__(self, destination: Optional[Temporary], function_name: str,
+                 arguments: list[Value]):
+        self.destination = destination
+        self.function_name = function_name
+        self.arguments = arguments
+
+    def get_values(self) -> tuple:
+        return self.destination, *self.arguments
+
+    def __str__(self):
+        arguments = ', '.join(map(str, self.arguments))
+        call = f'call {self.function_name}({arguments})'
+        if self.destination is None:
+            return call
+        return f'{self.destination} = {call}'
+
+
+class Jump:
+
+    __slots__ = ('target',)
+
+    def __init__(self, target: BasicBlock):
+        self.target = target
+
+    def get_values(self) -> tuple:
+        return ()
+
+    def get_successors(self) -> tuple:
+        return self.target,
+
+    def __str__(self):
+        return f'jump {self.target.label}'
+
+
+class Branch:
+    """Jump to one of two blocks by condition, that compares two values"""
+
+    __slots__ = ('condition', 'left_operand', 'right_operand', 'if_true',
+                 'if_false')
+
+    def __init__(self, condition: str, left_operand: Value,
+                 right_operand: Value, if_true: BasicBlock,
+                 if_false: BasicBlock):
+        self.condition = condition
+        self.left_operand = left_operand
+        self.right_operand = right_operand
+        self.if_true = if_true
+        self.if_false = if_false
+
+    def get_values(self) -> tuple:
+        return self.left_operand, self.right_operand
+
+    def get_successors(self) -> tuple:
+        return self.if_true, self.if_false
+
+    def __str__(self):
+        return (f'if {self.left_operand} {self.condition} '
+                f'{self.right_operand} jump {self.if_true.label} '
+                f'else {self.if_false.label}')
+
+
+class Return:
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Optional[Value] = None):
+        self.value = value
+
+    def get_values(self) -> tuple:
+        return self.value,
+
+    def get_successors(self) -> tuple:
+        return ()
+
+    def __str__(self):
+        if self.value is None:
+            return 'return'
+        return f'return {self.value}'
+
+
+Instruction = Union[Copy, UnaryOperation, BinaryOperation, Call]
+Terminator = Union[Jump, Branch, Return]
+
+
+class BasicBlock:
+    """Instructions, that are always executed one after another, and the
+    terminator, that passes control to other blocks"""
+
+    __slots__ = ('label', 'instructions', 'terminator')
+
+    def __init__(self, label: str):
+        self.label = label
+        self.instructions: list[Instruction] = []
+        self.terminator: Optional[Terminator] = None
+
+    def get_successors(self) -> tuple:
+        if self.terminator is None:
+            return ()
+        return self.terminator.get_successors()
+
+    def __repr__(self):
+        return self.label
+
+
+class IRFunction:
+    """Control-flow graph of a function, its first block is the entry and
+    blocks are kept in the order they are laid out in code"""
+
+    __slots__ = ('name', 'arguments', 'variables', 'blocks')
+
+    def __init__(self, name: str, arguments: list[str],
+                 variables: list[str], blocks: list[BasicBlock]):
+        self.name = name
+        self.arguments = arguments
+        self.variables = variables
+        self.blocks = blocks
+
+    def get_predecessors(self) -> dict[BasicBlock, list[BasicBlock]]:
+        predecessors = {block: [] for block in self.blocks}
+        for block in self.blocks:
+            for successor in block.get_successors():
+                predecessors[successor].append(block)
+        return predecessors
+
+    def get_reachable_blocks(self) -> set[BasicBlock]:
+        reachable = {self.blocks[0]}
+        stack = [self.blocks[0]]
+        while stack:
+            for successor in stack.pop().get_successors():
+                if successor not in reachable:
+                    reachable.add(successor)
+                    stack.append(successor)
+        return reachable
+
+    def remove_unreachable_blocks(self) -> None:
+        reachable = self.get_reachable_blocks()
+        self.blocks = [block for block in self.blocks if block in reachable]
+
+    def count_instructions(self) -> int:
+        """Number of instructions and terminators of all blocks"""
+        return sum(len(block.instructions) + 1 for block in self.blocks)
+
+    def format(self) -> list[str]:
+        """Lines of readable representation of the function"""
+        lines = [f'function {self.name}({", ".join(self.arguments)})']
+        for block in self.blocks:
+            lines.append(f'{block.label}:')
+            lines.extend(f'  {instruction}'
+                         for instruction in block.instructions)
+            lines.append(f'  {block.terminator}')
+        return lines
+
+
+class IRBuilder:
+    """Adds instructions of lowered nodes to the current block of a
+    function"""
+
+    def __init__(self, name: str, arguments: list[str], variables: list[str],
+                 options: CompilerOptions):
+        self.options = options
+        self.__function = IRFunction(name, arguments, variables, [])
+        self.__number_of_temporaries = 0
+        self.__number_of_blocks = 0
+        self.__block = self.new_block('entry')
+        self.__function.blocks.append(self.__block)
+        # Block after beginning of the function, that tail calls jump to
+        self.tail_call_target: Optional[BasicBlock] = None
+
+    def new_temporary(self) -> Temporary:
+        temporary = Temporary(self.__number_of_temporaries)
+        self.__number_of_temporaries += 1
+        return temporary
+
+    def new_block(self, name: str) -> BasicBlock:
+        """Block with unique label, that is not laid out yet"""
+        block = BasicBlock(f'{name}{self.__number_of_blocks}')
+        self.__number_of_blocks += 1
+        return block
+
+    def set_block(self, block: BasicBlock) -> None:
+        """Lay out the block after the current one and add instructions to
+        it"""
+        self.__function.blocks.append(block)
+        self.__block = block
+
+    def __get_block(self) -> BasicBlock:
+        # Code after jump or return is unreachable, but it still gets
+        # a block, that is removed later
+        if self.__block.terminator is not None:
+            self.set_block(self.new_block('unreachable'))
+        return self.__block
+
+    def emit(self, instruction: Instruction) -> None:
+        self.__get_block().instructions.append(instruction)
+
+    def terminate(self, terminator: Terminator) -> None:
+        self.__get_block().terminator = terminator
+
+    def load(self, value: Value) -> Temporary:
+        """Temporary with the value, temporaries are not copied, because
+        every one of them is used once"""
+        if isinstance(value, Temporary):
+            return value
+        temporary = self.new_temporary()
+        self.emit(Copy(temporary, value))
+        return temporary
+
+    def jump(self, target: BasicBlock) -> None:
+        self.terminate(Jump(target))
+
+    def branch(self, condition: str, left_operand: Value,
+               right_operand: Value, if_true: BasicBlock,
+               if_false: BasicBlock) -> None:
+        self.terminate(Branch(condition, left_operand, right_operand,
+                              if_true, if_false))
+
+    def finish(self) -> IRFunction:
+        """Function returns after the last statement, when it does not end
+        with 'return'"""
+        if self.__block.terminator is None:
+            self.__block.terminator = Return()
+        return self.__function
@@ -0,0 +1,67 @@
+"""Module contains writer of json, that does not recurse into nested values
+
+Encoder of 'json' module recurses into nested values, so it fails on AST of
+deeply nested expressions. Values are written with explicit stack, which is
+as fast as the encoder of 'json' with indent, that is written in python.
+Without indent the encoder written in C is much faster, so it makes strings,
+unless it fails. Files are written part by part, so json of a big value is
+never kept in memory whole. Output is the same as output of 'json.dumps'
+with the same indent, keys of objects are strings.
+"""
+
+import json
+from typing import Iterator, Optional, TextIO
+
+
+def iterate_json(value, indent: Optional[int] = None) -> Iterator[str]:
+    """Parts of json of the value"""
+    item_separator = ', ' if indent is None else ','
+    # Values with their depth and parts of json with depth of line, that
+    # starts before them, so long indents of deep values are not kept in
+    # the stack until they are written
+    stack = [(False, value, 0)]
+    while stack:
+        is_part, value, depth = stack.pop()
+        if is_part:
+            if depth is not None:
+                yield '\n' + ' ' * (indent * depth)
+            yield value
+            continue
+        if isinstance(value, dict):
+            items = [(f'{json.dumps(key)}: ', item)
+                     for key, item in value.items()]
+            opening, closing = '{', '}'
+        elif isinstance(value, (list, tuple)):
+            items = [('', item) for item in value]
+            opening, closing = '[', ']'
+        else:
+            yield json.dumps(value)
+            continue
+        if not items:
+            yield opening + closing
+            continue
+
+        line_depth = inner_line_depth = None
+        if indent is not None:
+            line_depth, inner_line_depth = depth, depth + 1
+        parts = [(True, opening, None)]
+        for idx, (key, item) in enumerate(items):
+            if idx:
+                parts.append((True, item_separator, None))
+            parts.append((True, key, inner_line_depth))
+            parts.append((False, item, depth + 1))
+        parts.append((True, closing, line_depth))
+        stack.extend(reversed(parts))
+
+
+def dumps(value, indent: Optional[int] = None) -> str:
+    if indent is None:
+        try:
+            return json.dumps(value)
+        except RecursionError:
+            pass
+    return ''.join(iterate_json(value, indent))
+
+
+def dump(value, file: TextIO, indent: Optional[int] = None) -> None:
+    file.writelines(iterate_json(value, indent))
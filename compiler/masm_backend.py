@@ -0,0 +1,339 @@
+"""Module contains backend, that generates masm code of functions from
+their intermediate representation
+
+Every instruction of the representation is selected into x86 instructions
+of 'StatementCode', whose temporaries get registers from the linear scan
+allocator. Code is allocated in parts, between which no temporary is live,
+so allocation of a big function is as fast as allocation of its
+statements. Blocks are laid out in the order of the function, jumps to the
+next block are omitted, and only blocks, that are targets of jumps, get
+labels.
+"""
+
+from typing import Optional, Union
+
+from compiler.context import CompilationContext
+from compiler.ir import (BasicBlock, BinaryOperation, Branch, Call, Copy,
+                         IRFunction, Jump, Return, Temporary, UnaryOperation,
+                         Value, NEGATED_CONDITIONS, get_temporaries)
+from compiler.miscellaneous import is_number
+from compiler.options import CompilerOptions
+from compiler.register_allocator import (Location, StatementCode,
+                                         get_name_of_spill_slot, is_variable)
+from compiler.strength_reduction import (multiply_by_constant,
+                                         divide_by_constant,
+                                         can_multiply_by_constant,
+                                         can_divide_by_constant)
+
+
+# Procedures of AsmCodeGenerator, that compute operations, when they are
+# not generated inline
+HELPERS_OF_OPERATORS = {
+    '/': 'divide',
+    '*': 'multiply',
+    '==': 'compare',
+    '&&': 'logical_and',
+    '||': 'logical_or',
+    '<': 'lcompare',
+    '+': 'summarize',
+    '-': 'subtract',
+}
+# Conditions of 'setcc' and 'jcc' instructions
+CONDITIONS = {'==': 'e', '!=': 'ne', '<': 'l', '>=': 'ge'}
+# Instructions, that compute the rest of operations in place
+INSTRUCTIONS = {'+': 'add', '-': 'sub', '*': 'imul', '||': 'or'}
+
+
+def _get_constant(operand) -> Optional[int]:
+    if isinstance(operand, (int, float)):
+        return int(operand)
+    return None
+
+
+def is_reduced(operator: str, left_operand, right_operand) -> bool:
+    """Operation is multiplication or division by constant, that is done
+    by cheaper instructions"""
+    left_constant = _get_constant(left_operand)
+    right_constant = _get_constant(right_operand)
+    if operator == '*':
+        return any(constant is not None
+                   and can_multiply_by_constant(constant)
+                   for constant in (left_constant, right_constant))
+    return (operator == '/' and right_constant is not None
+            and can_divide_by_constant(right_constant))
+
+
+def get_helper_procedure(operator: str, left_operand, right_operand,
+                         options: CompilerOptions) -> Optional[str]:
+    """Helper procedure, that computes the operation, or None when it is
+    computed by instructions in place. Constant operands are numbers."""
+    if options.inline_operations:
+        return None
+    if options.reduce_strength and is_reduced(operator, left_operand,
+                                              right_operand):
+        return None
+    return HELPERS_OF_OPERATORS[operator]
+
+
+def _get_last_uses(blocks: list[BasicBlock]) -> dict[Temporary, int]:
+    """Positions of the last instructions, that use temporaries"""
+    last_uses = dict()
+    position = 0
+    for block in blocks:
+        for instruction in (*block.instructions, block.terminator):
+            for temporary in get_temporaries(*instruction.get_values()):
+                last_uses[temporary] = position
+            position += 1
+    return last_uses
+
+
+def _get_jumps(terminator: Union[Jump, Branch, Return],
+               next_block: Optional[BasicBlock]) -> list[tuple]:
+    """Jump instructions and their targets, that pass control from the end
+    of a block"""
+    if isinstance(terminator, Jump):
+        if terminator.target is next_block:
+            return []
+        return [('jmp', terminator.target)]
+    if isinstance(terminator, Branch):
+        if terminator.if_true is next_block:
+            condition = NEGATED_CONDITIONS[terminator.condition]
+            return [(f'j{CONDITIONS[condition]}', terminator.if_false)]
+        jumps = [(f'j{CONDITIONS[terminator.condition]}',
+                  terminator.if_true)]
+        if terminator.if_false is not next_block:
+            jumps.append(('jmp', terminator.if_false))
+        return jumps
+    return []
+
+
+def _get_next_block(blocks: list[BasicBlock], idx: int
+                    ) -> Optional[BasicBlock]:
+    return blocks[idx + 1] if idx + 1 < len(blocks) else None
+
+
+class MasmBackend:
+    """Generates code of procedures from functions in intermediate
+    representation"""
+
+    def __init__(self, context: CompilationContext):
+        self.context = context
+        self.options = context.options
+        self.__code = StatementCode(context)
+        self.__locations: dict[Temporary, Location] = dict()
+
+    def __get_location(self, value: Value) -> Location:
+        if isinstance(value, Temporary):
+            return self.__locations[value]
+        return f'{value}'
+
+    def __select_copy(self, instruction: Copy) -> None:
+        source = self.__get_location(instruction.source)
+        destination = instruction.destination
+        if isinstance(destination, Temporary):
+            if destination in self.__locations:
+                self.__code.emit('mov', self.__locations[destination],
+                                 source)
+            elif isinstance(instruction.source, Temporary):
+                # Copied temporary is not used anymore
+                self.__locations[destination] = source
+            else:
+                self.__locations[destination] = self.__code.load(source)
+            return
+
+        if is_variable(source):
+            # There is no 'mov' from memory to memory
+            source = self.__code.load(source)
+        self.__code.emit('mov', destination, source)
+
+    def __select_unary_operation(self, instruction: UnaryOperation) -> None:
+        # Variable is copied, so its value is not changed by 'neg'
+        result = self.__code.load(self.__get_location(instruction.value))
+        self.__code.emit('neg', result)
+        self.__locations[instruction.destination] = result
+
+    def __select_comparison(self, left_operand_in_asm: Location,
+                            right_operand_in_asm: Location) -> None:
+        # 'cmp' does not accept immediate or memory with memory as first
+        # operand
+        if (is_number(left_operand_in_asm)
+                or is_variable(left_operand_in_asm)
+                and is_variable(right_operand_in_asm)):
+            left_operand_in_asm = self.__code.load(left_operand_in_asm)
+        self.__code.emit('cmp', left_operand_in_asm, right_operand_in_asm)
+
+    def __select_inline_operation(self, operator: str,
+                                  left_operand_in_asm: Location,
+                                  right_operand_in_asm: Location
+                                  ) -> Location:
+        code = self.__code
+        if operator == '/':
+            # 'idiv' divides 'edx:eax' and does not accept immediate divisor
+            if is_number(right_operand_in_asm):
+                right_operand_in_asm = code.load(right_operand_in_asm)
+            code.emit('mov', 'eax', left_operand_in_asm)
+            code.emit('cdq')
+            code.emit('idiv', right_operand_in_asm)
+            result = code.new_temporary()
+            code.emit('mov', result, 'eax')
+            return result
+
+        if operator in CONDITIONS:
+            self.__select_comparison(left_operand_in_asm,
+                                     right_operand_in_asm)
+            code.emit(f'set{CONDITIONS[operator]}', 'al')
+        elif operator == '&&':
+            is_true = []
+            for operand_in_asm in (left_operand_in_asm, right_operand_in_asm):
+                if is_number(operand_in_asm):
+                    operand_in_asm = code.load(operand_in_asm)
+                code.emit('cmp', operand_in_asm, '0')
+                code.emit('setne', 'al')
+                is_true.append(code.new_temporary())
+                code.emit('movzx', is_true[-1], 'al')
+            code.emit('and', *is_true)
+            return is_true[0]
+        else:
+            result = code.load(left_operand_in_asm)
+            if operator == '*' and is_number(right_operand_in_asm):
+                code.emit('imul', result, result, right_operand_in_asm)
+            else:
+                code.emit(INSTRUCTIONS[operator], result,
+                          right_operand_in_asm)
+            if operator != '||':
+                return result
+            code.emit('setne', 'al')
+
+        result = code.new_temporary()
+        code.emit('movzx', result, 'al')
+        return result
+
+    def __reduce_strength(self, operator: str, left_operand_in_asm: Location,
+                          right_operand_in_asm: Location
+                          ) -> Optional[Location]:
+        """Location of result of multiplication or division by constant,
+        or None when it is not cheaper"""
+        if operator == '*':
+            if is_number(right_operand_in_asm):
+                return multiply_by_constant(
+                    left_operand_in_asm, int(right_operand_in_asm),
+                    self.__code)
+            if is_number(left_operand_in_asm):
+                return multiply_by_constant(
+                    right_operand_in_asm, int(left_operand_in_asm),
+                    self.__code)
+        elif operator == '/' and is_number(right_operand_in_asm):
+            return divide_by_constant(left_operand_in_asm,
+                                      int(right_operand_in_asm), self.__code)
+        return None
+
+    def __select_binary_operation(self, instruction: BinaryOperation
+                                  ) -> None:
+        operator = instruction.operator
+        left_operand_in_asm = self.__get_location(instruction.left_operand)
+        right_operand_in_asm = self.__get_location(instruction.right_operand)
+
+        result = None
+        if self.options.reduce_strength:
+            result = self.__reduce_strength(operator, left_operand_in_asm,
+                                            right_operand_in_asm)
+        if result is None and self.options.inline_operations:
+            result = self.__select_inline_operation(
+                operator, left_operand_in_asm, right_operand_in_asm)
+        if result is None:
+            self.__code.emit('invoke', HELPERS_OF_OPERATORS[operator],
+                             left_operand_in_asm, right_operand_in_asm)
+            result = self.__code.new_temporary()
+            self.__code.emit('mov', result, 'eax')
+        self.__locations[instruction.destination] = result
+
+    def __select_call(self, instruction: Call) -> None:
+        self.__code.emit('invoke', instruction.function_name,
+                         *map(self.__get_location, instruction.arguments))
+        if instruction.destination is not None:
+            result = self.__code.new_temporary()
+            self.__code.emit('mov', result, 'eax')
+            self.__locations[instruction.destination] = result
+
+    def __select_terminator(self, terminator: Union[Jump, Branch, Return],
+                            next_block: Optional[BasicBlock]) -> None:
+        if isinstance(terminator, Return):
+            if terminator.value is not None:
+                self.__code.emit('mov', 'eax',
+                                 self.__get_location(terminator.value))
+            self.__code.emit('ret')
+            return
+
+        if isinstance(terminator, Branch):
+            self.__select_comparison(
+                self.__get_location(terminator.left_operand),
+                self.__get_location(terminator.right_operand))
+        for mnemonic, target in _get_jumps(terminator, next_block):
+            self.__code.emit(mnemonic, target.label)
+
+    def __select(self, instruction) -> None:
+        if isinstance(instruction, Copy):
+            self.__select_copy(instruction)
+        elif isinstance(instruction, UnaryOperation):
+            self.__select_unary_operation(instruction)
+        elif isinstance(instruction, BinaryOperation):
+            self.__select_binary_operation(instruction)
+        elif isinstance(instruction, Call):
+            self.__select_call(instruction)
+
+    def __generate_code_of_body(self, blocks: list[BasicBlock]) -> list:
+        jump_targets = {
+            target
+            for idx, block in enumerate(blocks)
+            for _, target in _get_jumps(block.terminator,
+                                        _get_next_block(blocks, idx))
+        }
+        last_uses = _get_last_uses(blocks)
+
+        asm_code = []
+        position = 0
+        end_of_part = -1
+        for idx, block in enumerate(blocks):
+            if block in jump_targets:
+                self.__code.emit_label(block.label)
+            for instruction in (*block.instructions, block.terminator):
+                if instruction is block.terminator:
+                    self.__select_terminator(instruction,
+                                             _get_next_block(blocks, idx))
+                else:
+                    self.__select(instruction)
+                for temporary in get_temporaries(*instruction.get_values()):
+                    end_of_part = max(end_of_part, last_uses[temporary])
+                if end_of_part <= position:
+                    # No temporary is live after the instruction
+                    asm_code.extend(self.__code.generate_asm_code())
+                    self.__code = StatementCode(self.context)
+                    self.__locations = dict()
+                position += 1
+        return asm_code
+
+    def generate_code_of_function(self, function: IRFunction) -> list:
+        self.context.reset_function_state()
+        code_of_body = self.__generate_code_of_body(function.blocks)
+
+        arguments_in_asm = ', '.join(f'{argument}:DWORD'
+                                     for argument in function.arguments)
+        # Registers, that are not changed by procedures in 'stdcall', are
+        # saved by 'uses'
+        used_registers = ''.join(f'{register} ' for register in
+                                 self.context.get_used_registers())
+        if used_registers:
+            used_registers = f'uses {used_registers}'
+
+        asm_code = [f'{function.name} proc {used_registers}{arguments_in_asm}']
+        asm_code.extend(f'  local {variable}:DWORD'
+                        for variable in function.variables)
+        asm_code.extend(
+            f'  local {get_name_of_spill_slot(slot)}:DWORD'
+            for slot in range(self.context.get_number_of_spill_slots()))
+        asm_code.extend(code_of_body)
+        asm_code.extend((
+            f'{function.name} endp',
+            ''
+        ))
+        return asm_code
@@ -1,6 +1,13 @@
 """Module contains different misc functions"""
 
 import sys
+from typing import Any, Generator, TypeVar
+
+
+T = TypeVar('T')
+# Generator of recursive function, that yields generators of its recursive
+# calls and gets their results back
+Recursion = Generator[Generator, Any, T]
 
 
 def is_number(obj):
@@ -12,7 +19,31 @@ def is_number(obj):
     return True
 
 
+def to_int32(value: int) -> int:
+    """Value as signed 32-bit integer after wrap-around"""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
 def exit_compiler(code: int = 0):
     """Stop program execution with message"""
     input("Program has finished. To exit press <Enter>\n")
     sys.exit(code)
+
+
+def run_iteratively(recursion: Recursion[T]) -> T:
+    """Result of recursive function, whose calls are kept in explicit
+    stack, so depth of recursion is limited only by memory and not by the
+    stack of the interpreter"""
+    stack = [recursion]
+    result = None
+    while stack:
+        try:
+            call = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+        else:
+            stack.append(call)
+            result = None
+    return result
@@ -1,79 +1,94 @@
 from __future__ import annotations
 
-from typing import Union, Optional, ClassVar, Literal
+from typing import TYPE_CHECKING, Union, Optional, ClassVar, Literal, Iterator
 from abc import ABC, abstractmethod
 
-from compiler.miscellaneous import is_number
+from compiler import ir, json_writer
+from compiler.ir import BasicBlock, IRBuilder, IRFunction, Value
+from compiler.miscellaneous import Recursion, is_number, run_iteratively
+
+if TYPE_CHECKING:
+    from compiler.context import CompilationContext
+    from compiler.options import CompilerOptions
 
 
-Register = Literal['eax', 'ebx', 'ecx', 'edx']
 Operand = Union['Expression', 'Variable', int, float]
 
 
-class BasicNode(ABC):
+def _generate_ast_of_operand(operand: Optional[Operand]
+                             ) -> Recursion[Union[dict, str, None]]:
+    """Expressions are represented as nodes, variables by their names and
+    numbers as strings"""
+    if isinstance(operand, Expression):
+        return (yield operand.iterate_ast())
+    if isinstance(operand, Variable):
+        return operand.name
+    if is_number(operand):
+        return f'{operand}'
+    return None
 
-    __slots__ = ()
 
-    @abstractmethod
-    def generate_ast_representation(self) -> str:
-        pass
+def _generate_ast_of_nodes(nodes: Iterator[BasicNode]) -> Recursion[list]:
+    ast = []
+    for node in nodes:
+        ast.append((yield node.iterate_ast()))
+    return ast
 
 
-class Program(BasicNode):
-    """Represents node of function with its arguments in AST"""
+def _generate_ast_of_operands(operands: list[Operand]) -> Recursion[list]:
+    ast = []
+    for operand in operands:
+        ast.append((yield _generate_ast_of_operand(operand)))
+    return ast
 
-    __slots__ = ('id', 'contents')
 
-    DYNAMIC_SALT: ClassVar[int] = 0
-    __all_functions: ClassVar[dict[str, Function]] = dict()
-    __current_function_name: ClassVar[Optional[str]] = None
+def _lower_statements(body: list, builder: IRBuilder) -> Recursion[None]:
+    for instruction in body:
+        if instruction is None or isinstance(instruction, Variable):
+            continue
+        yield instruction.lower(builder)
 
-    def __init__(self, contents: Union[list, tuple]):
-        self.id: str = 'program'
-        self.contents = contents
 
-    @classmethod
-    def add_function(cls, function: Function) -> None:
-        cls.__all_functions[function.name] = function
+class BasicNode(ABC):
+    """Node of AST, nodes are generated and lowered by generators, whose
+    recursive calls are run with explicit stack, so depth of nested
+    expressions is not limited by the stack of the interpreter"""
 
-    @classmethod
-    def get_function(cls, function_name: str) -> Union[Function, None]:
-        return cls.__all_functions.get(function_name)
+    __slots__ = ()
 
-    @classmethod
-    def get_functions(cls) -> dict:
-        return cls.__all_functions.copy()
+    def generate_ast(self) -> dict:
+        return run_iteratively(self.iterate_ast())
 
-    @classmethod
-    def get_current_function(cls) -> Union[Function, None]:
-        return cls.__all_functions.get(cls.__current_function_name)
+    @abstractmethod
+    def iterate_ast(self) -> Recursion[dict]:
+        """AST of the node, AST of nodes below it is yielded"""
+        pass
 
-    @classmethod
-    def set_current_function(cls, function_unique_name: str) -> None:
-        cls.__current_function_name = function_unique_name
 
-    def generate_asm_code(self) -> list:
-        asm_code = []
-        for function in self.contents:
-            if function is None or function.name == 'main':
-                continue
-            asm_code.extend(function.generate_asm_code())
+class Program(BasicNode):
+    """Represents node of function with its arguments in AST"""
 
-        asm_code.extend(self.get_function('main').generate_asm_code())
+    __slots__ = ('id', 'contents', 'context')
 
-        return asm_code
+    def __init__(self, contents: Union[list, tuple],
+                 context: CompilationContext):
+        self.id: str = 'program'
+        self.contents = contents
+        self.context = context
 
-    def generate_ast_representation(self) -> str:
-        contents = []
-        for function in self.contents:
-            if function is None:
-                continue
-            contents.append(
-                function.generate_ast_representation())
+    def get_function(self, function_name: str) -> Union[Function, None]:
+        return self.context.get_function(function_name)
 
-        stringified_contents = ', '.join(contents)
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'contents': (yield _generate_ast_of_nodes(
+                function for function in self.contents
+                if function is not None))
+        }
 
-        return f'{{"id":"{self.id}", "contents":[{stringified_contents}]}}'
+    def generate_ast_representation(self) -> str:
+        return json_writer.dumps(self.generate_ast())
 
     def __str__(self):
         return self.generate_ast_representation()
@@ -83,11 +98,12 @@ class Function(BasicNode):
     """Represents node of function with its arguments in AST"""
 
     __slots__ = ('id', 'name', 'type', 'arguments', 'body', 'name_with_salt',
-                 'unique_name', '__all_variables')
+                 'unique_name', 'has_tail_calls', 'accumulator',
+                 '__all_variables')
 
     SALT: ClassVar[str] = 'hsl'
 
-    def __init__(self, name: str, type_: str,
+    def __init__(self, name: str, type_: str, context: CompilationContext,
                  arguments: Union[list, tuple] = None,
                  body: Optional[Union[list, tuple]] = None):
         self.id = 'function'
@@ -101,10 +117,15 @@ class Function(BasicNode):
         else:
             self.name_with_salt = f'{self.name}{Function.SALT}'
 
+        # Set by elimination of tail calls, initialization of accumulator
+        # is done before the label, that tail calls jump to
+        self.has_tail_calls = False
+        self.accumulator: Optional[VariableInitialization] = None
+
         self.__all_variables: dict[str, Variable] = dict()
 
-        Program.add_function(self)
-        Program.set_current_function(self.name)
+        context.add_function(self)
+        context.set_current_function(self.name)
 
     def add_variable(self, variable: Variable) -> None:
         self.__all_variables[variable.name] = variable
@@ -118,53 +139,38 @@ class Function(BasicNode):
     def variable_exists(self, variable_name: str) -> bool:
         return variable_name in self.__all_variables.keys()
 
-    def __generate_code_of_local_variables(self):
-        asm_code = []
-        for var in self.__all_variables.values():
-            if not var.is_function_argument:
-                asm_code.append(f'  local {var.name_with_salt}:DWORD')
-        return asm_code
-
-    def generate_asm_code(self) -> list:
-        arguments_in_asm = list()
-        for argument in self.arguments:
-            arguments_in_asm.append(f'{argument.name_with_salt}:DWORD')
-        arguments_in_asm = ', '.join(arguments_in_asm)
-
-        asm_code = [f'{self.name_with_salt} proc {arguments_in_asm}']
-        asm_code.extend(self.__generate_code_of_local_variables())
-        for instruction in self.body:
-            if instruction is None or isinstance(instruction, Variable):
-                continue
-            asm_code.extend(instruction.generate_asm_code())
-
-        asm_code.extend((
-            '  pop eax',
-            '  ret',
-            f'{self.name_with_salt} endp',
-            ''
-        ))
-        return asm_code
-
-    def generate_ast_representation(self) -> str:
-        arguments = []
-        for argument in self.arguments:
-            arguments.append(argument.generate_ast_representation())
-
-        stringified_arguments = ', '.join(arguments)
-
-        body = []
-        for instruction in self.body:
-            if instruction is None:
-                continue
-            body.append(instruction.generate_ast_representation())
-
-        stringified_body = ', '.join(body)
-
-        return (f'{{"id":"{self.id}", "name":"{self.name}",'
-                f' "type":"{self.type}",'
-                f' "arguments":[{stringified_arguments}],'
-                f' "body":[{stringified_body}]}}')
+    def lower(self, options: CompilerOptions) -> IRFunction:
+        """Control-flow graph of the function in intermediate
+        representation"""
+        builder = IRBuilder(
+            self.name_with_salt,
+            [argument.name_with_salt for argument in self.arguments],
+            [variable.name_with_salt
+             for variable in self.__all_variables.values()
+             if not variable.is_function_argument],
+            options)
+        run_iteratively(self.__lower_body(builder))
+        return builder.finish()
+
+    def __lower_body(self, builder: IRBuilder) -> Recursion[None]:
+        if self.has_tail_calls:
+            if self.accumulator is not None:
+                yield self.accumulator.lower(builder)
+            builder.tail_call_target = builder.new_block(TailCall.LABEL)
+            builder.jump(builder.tail_call_target)
+            builder.set_block(builder.tail_call_target)
+        yield _lower_statements(self.body, builder)
+
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'type': self.type,
+            'arguments': (yield _generate_ast_of_nodes(self.arguments)),
+            'body': (yield _generate_ast_of_nodes(
+                instruction for instruction in self.body
+                if instruction is not None))
+        }
 
 
 class DoWhileLoop(BasicNode):
@@ -176,63 +182,33 @@ class DoWhileLoop(BasicNode):
         self.body = body
         self.expression = expression or 1
 
-    def generate_asm_code(self) -> list:
-        salt = Program.DYNAMIC_SALT
-        Program.DYNAMIC_SALT += 1
+    def lower(self, builder: IRBuilder) -> Recursion[None]:
+        loop_block = builder.new_block('continue')
+        break_block = builder.new_block('break')
+        builder.jump(loop_block)
 
-        asm_code = [f'  continue{salt}:']
+        builder.set_block(loop_block)
         for instruction in self.body:
             if instruction is None or isinstance(instruction, Variable):
                 continue
-            if instruction in ('break', 'continue'):
-                asm_code.append(f'  jmp {instruction}{salt}')
+            if instruction == 'break':
+                builder.jump(break_block)
+            elif instruction == 'continue':
+                builder.jump(loop_block)
             else:
-                asm_code.extend(instruction.generate_asm_code())
-
-        asm_code_of_expression,\
-            expression_in_asm = Expression._process_operand(self.expression)
-
-        local_active_regs = []
-
-        if expression_in_asm == 'reg':
-            expression_in_asm = Expression.get_inactive_reg()
-            asm_code_of_expression.append(f'  pop {expression_in_asm}')
-            local_active_regs.append(expression_in_asm)
-        elif is_number(expression_in_asm):
-            reg = Expression.get_inactive_reg()
-            asm_code_of_expression.append(f'  mov {reg}, {expression_in_asm}')
-            expression_in_asm = reg
-            local_active_regs.append(reg)
-
-        asm_code.extend((*asm_code_of_expression,
-                         f'  cmp {expression_in_asm}, 0',
-                         f'  je break{salt}',
-                         f'  jne continue{salt}',
-                         f'  break{salt}:'))
-
-        for reg in local_active_regs:
-            Expression.set_reg_inactive(reg)
-        return asm_code
+                yield instruction.lower(builder)
+        yield Expression.lower_branch(self.expression, builder, loop_block,
+                                      break_block)
+        builder.set_block(break_block)
 
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.expression, Expression):
-            stringified_expression = \
-                self.expression.generate_ast_representation()
-        elif isinstance(self.expression, Variable):
-            stringified_expression = f'"{self.expression.name}"'
-        else:
-            stringified_expression = f'"{self.expression}"'
-
-        body = []
-        for instruction in self.body:
-            if instruction in ('break', 'continue', None):
-                continue
-            body.append(instruction.generate_ast_representation())
-
-        stringified_body = ', '.join(body)
-
-        return (f'{{"id":"{self.id}", "expression":{stringified_expression},'
-                f' "body":[{stringified_body}]}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'expression': (yield _generate_ast_of_operand(self.expression)),
+            'body': (yield _generate_ast_of_nodes(
+                instruction for instruction in self.body
+                if instruction not in ('break', 'continue', None)))
+        }
 
 
 class Return(BasicNode):
@@ -244,26 +220,35 @@ class Return(BasicNode):
         self.id = 'return'
         self.argument = argument
 
-    def generate_asm_code(self) -> list:
-        asm_code = []
-        if isinstance(self.argument, Expression):
-            return self.argument.generate_asm_code()
-        elif isinstance(self.argument, Variable):
-            asm_code.append(f'  mov eax, {self.argument.name_with_salt}')
-        elif is_number(self.argument):
-            asm_code.append(f'  mov eax, {self.argument}')
-        asm_code.append('  push eax')
+    def __lower_returned_operand(self, operand: Operand,
+                                 builder: IRBuilder) -> Recursion[None]:
+        """Return value of the operand or make tail calls in branches of
+        ternary operators"""
+        if isinstance(operand, TailCall):
+            yield operand.lower(builder)
+        elif (isinstance(operand, TernaryExpression)
+                and any(isinstance(node, TailCall)
+                        for node in iterate_nodes(operand))):
+            if_true = builder.new_block('true')
+            if_false = builder.new_block('false')
+            yield operand.lower_condition(builder, if_true, if_false)
+            builder.set_block(if_true)
+            yield self.__lower_returned_operand(operand.left_operand, builder)
+            builder.set_block(if_false)
+            yield self.__lower_returned_operand(operand.right_operand,
+                                                builder)
+        else:
+            builder.terminate(ir.Return(
+                (yield Expression.lower_operand(operand, builder))))
 
-        return asm_code
+    def lower(self, builder: IRBuilder) -> Recursion[None]:
+        return self.__lower_returned_operand(self.argument, builder)
 
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.argument, Expression):
-            stringified_argument = self.argument.generate_ast_representation()
-        elif isinstance(self.argument, Variable):
-            stringified_argument = f'"{self.argument.name}"'
-        else:
-            stringified_argument = f'"{self.argument}"'
-        return f'{{"id":"{self.id}", "argument":{stringified_argument}}}'
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'argument': (yield _generate_ast_of_operand(self.argument))
+        }
 
 
 class Variable(BasicNode):
@@ -275,6 +260,7 @@ class Variable(BasicNode):
     _SALT = 'hsl'
 
     def __init__(self, type_: Literal['int', 'float'], name: str,
+                 context: CompilationContext,
                  is_function_argument: bool = False):
         self.id = 'variable'
         self.type = type_
@@ -282,11 +268,12 @@ class Variable(BasicNode):
         self.is_initialized = False
         self.is_function_argument = is_function_argument
         self.name_with_salt = f'{self.name}{Variable._SALT}'
-        Program.get_current_function().add_variable(self)
+        context.get_current_function().add_variable(self)
 
-    def generate_ast_representation(self) -> str:
-        return (f'{{"id":"{self.id}", "type":"{self.type}",'
-                f' "name":"{self.name}"}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        # There are no nodes below variable
+        yield from ()
+        return {'id': self.id, 'type': self.type, 'name': self.name}
 
 
 class VariableInitialization(BasicNode):
@@ -294,157 +281,98 @@ class VariableInitialization(BasicNode):
     __slots__ = ('id', 'name', 'type', 'expression', 'variable')
 
     def __init__(
-        self, name: str, type_: Literal['int', 'float'] = None,
+        self, name: str, context: CompilationContext,
+        type_: Literal['int', 'float'] = None,
         expression: Optional[Union[Variable, Expression, int, float]] = None
     ):
         self.id = 'variable_initialization'
         self.name = name
         self.type = type_
         self.expression = expression
-        self.variable = Program.get_current_function().get_variable(self.name)
+        self.variable = context.get_current_function().get_variable(self.name)
         if self.variable is None and self.type is not None:
-            self.variable = Variable(type_=self.type, name=self.name)
+            self.variable = Variable(type_=self.type, name=self.name,
+                                     context=context)
         self.variable.is_initialized = True
 
-    def generate_asm_code(self) -> list:
+    def lower(self, builder: IRBuilder) -> Recursion[None]:
         if self.expression is not None:
-            asm_code = []
-            if isinstance(self.expression, Expression):
-                asm_code = self.expression.generate_asm_code()
-                asm_code.append('  pop eax')
-                asm_code.append(f'  mov {self.variable.name_with_salt}, eax')
-            elif isinstance(self.expression, Variable):
-                asm_code.extend((
-                    f'  mov eax, {self.expression.name_with_salt}',
-                    f'  mov {self.variable.name_with_salt}, eax'
-                ))
-            else:
-                asm_code.append(
-                    f'  mov {self.variable.name_with_salt}, {self.expression}')
-        else:
-            return []
-        return asm_code
+            builder.emit(ir.Copy(
+                self.variable.name_with_salt,
+                (yield Expression.lower_operand(self.expression, builder))))
 
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.expression, Expression):
-            stringified_expression = \
-                self.expression.generate_ast_representation()
-        elif isinstance(self.expression, Variable):
-            stringified_expression = f'"{self.expression.name}"'
-        elif is_number(self.expression):
-            stringified_expression = f'"{self.expression}"'
-        else:
-            stringified_expression = ""
-        return (f'{{"id":"{self.id}", "name":"{self.name}",'
-                f' "expression":{stringified_expression}}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'expression': (yield _generate_ast_of_operand(self.expression))
+        }
 
 
 class Expression(BasicNode):
     """Base class for unary and binary operations"""
 
-    __inactive_regs: list[Union[Register, None]] = ['eax', 'ebx', 'ecx', 'edx']
-    __active_regs: list[Union[Register, None]] = list()
-
-    @classmethod
-    def get_inactive_regs(cls) -> list[str]:
-        return cls.__inactive_regs.copy()
-
-    @classmethod
-    def get_active_regs(cls) -> list[str]:
-        return cls.__active_regs.copy()
-
-    @classmethod
-    def get_inactive_reg(cls) -> Register:
-        reg: Register = cls.__inactive_regs.pop(0)
-        cls.__active_regs.append(reg)
-        return reg
+    @abstractmethod
+    def lower(self, builder: IRBuilder) -> Recursion[Value]:
+        """Add instructions, that compute the expression, to the function
+        and return its value"""
+        pass
 
-    @classmethod
-    def set_reg_active(cls, reg: Register) -> None:
-        if reg in cls.__inactive_regs:
-            cls.__inactive_regs.remove(reg)
-            cls.__active_regs.append(reg)
+    def lower_jump(self, builder: IRBuilder, if_true: BasicBlock,
+                   if_false: BasicBlock) -> Recursion[None]:
+        """Jump to one of the blocks by truth of the expression"""
+        builder.branch('!=', (yield self.lower(builder)), 0, if_true,
+                       if_false)
 
-    @classmethod
-    def set_reg_inactive(cls, reg: Register) -> None:
-        if reg in cls.__active_regs:
-            cls.__inactive_regs.append(reg)
-            cls.__active_regs.remove(reg)
+    @staticmethod
+    def lower_operand(operand: Operand, builder: IRBuilder
+                      ) -> Recursion[Value]:
+        if isinstance(operand, Expression):
+            return (yield operand.lower(builder))
+        elif isinstance(operand, Variable):
+            return operand.name_with_salt
+        return int(operand)
 
     @staticmethod
-    def _process_operand(operand) -> tuple[tuple, str]:
-        asm_code = []
-        if isinstance(operand, UnaryExpression):
-            asm_code.extend(operand.generate_asm_code())
-            if isinstance(operand.value, Variable):
-                operand_in_asm = operand.value.name_with_salt
-            else:
-                operand_in_asm = 'reg'
-        elif isinstance(operand, BinaryExpression):
-            asm_code.extend(operand.generate_asm_code())
-            operand_in_asm = 'reg'
+    def lower_branch(operand: Operand, builder: IRBuilder,
+                     if_true: BasicBlock, if_false: BasicBlock
+                     ) -> Recursion[None]:
+        """Jump to one of the blocks by truth of the operand"""
+        if isinstance(operand, Expression):
+            yield operand.lower_jump(builder, if_true, if_false)
         elif isinstance(operand, Variable):
-            operand_in_asm = operand.name_with_salt
-        elif isinstance(operand, FunctionCall):
-            asm_code.extend(operand.generate_asm_code())
-            operand_in_asm = 'reg'
+            builder.branch('!=', operand.name_with_salt, 0, if_true,
+                           if_false)
         else:
-            operand_in_asm = f'{int(operand)}'
-        return asm_code, operand_in_asm
+            builder.jump(if_true if operand != 0 else if_false)
 
 
 class FunctionCall(Expression):
 
     __slots__ = ('id', 'function_name', 'arguments', 'function')
 
-    def __init__(self, function_name: str,
+    def __init__(self, function_name: str, context: CompilationContext,
                  arguments: Union[list, tuple] = None):
         self.id = 'function_call'
         self.function_name = function_name
         self.arguments = arguments or list()
-        self.function = Program.get_function(self.function_name)
+        self.function = context.get_function(self.function_name)
 
-    def generate_asm_code(self) -> list:
-        asm_code = []
-        arguments_in_asm = []
+    def lower(self, builder: IRBuilder) -> Recursion[Value]:
+        arguments = []
         for argument in self.arguments:
-            asm_code_of_argument, _argument_in_asm = \
-                Expression._process_operand(argument)
-            asm_code.extend(asm_code_of_argument)
-            arguments_in_asm.append(_argument_in_asm)
-
-        for idx, argument_in_asm in enumerate(arguments_in_asm):
-            if argument_in_asm == 'reg':
-                reg = Expression.get_inactive_reg()
-                asm_code.append(f'  pop {reg}')
-                arguments_in_asm[idx] = reg
-            elif is_number(argument_in_asm):
-                reg = Expression.get_inactive_reg()
-                asm_code.append(f'  mov {reg}, {int(argument_in_asm)}')
-                arguments_in_asm[idx] = reg
-
-        if len(arguments_in_asm):
-            repr_of_arguments_in_asm = ', '.join(arguments_in_asm)
-            asm_code.append(
-                f'  invoke {self.function.name_with_salt}, '
-                f'{repr_of_arguments_in_asm}'
-            )
-        else:
-            asm_code.append(f'  invoke {self.function.name_with_salt}')
-
-        for reg in Expression.get_active_regs():
-            if reg in arguments_in_asm:
-                Expression.set_reg_inactive(reg)
+            arguments.append(
+                (yield Expression.lower_operand(argument, builder)))
+        result = builder.new_temporary()
+        builder.emit(ir.Call(result, self.function.name_with_salt, arguments))
+        return result
 
-        asm_code.append('  push eax')
-
-        Expression.set_reg_inactive('eax')
-
-        return asm_code
-
-    def generate_ast_representation(self) -> str:
-        return (f'{{"id":"{self.id}", "function_name":"{self.function_name}",'
-                f' "arguments":[]}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'function_name': self.function_name,
+            'arguments': (yield _generate_ast_of_operands(self.arguments))
+        }
 
 
 class UnaryExpression(Expression):
@@ -458,43 +386,19 @@ class UnaryExpression(Expression):
         self.value = value
         self.operator = operator
 
-    def generate_asm_code(self) -> list:
-        asm_code = []
-
-        asm_code_of_expression,\
-            operand_in_asm = Expression._process_operand(
-                self.value)
-        asm_code.extend(asm_code_of_expression)
-
-        reg = Expression.get_inactive_reg()
-
-        if operand_in_asm == 'reg':
-            operand_in_asm = reg
-            asm_code.append(f'  pop {operand_in_asm}')
-        elif is_number(self.value):
-            operand_in_asm = reg
-            asm_code.append(f'  mov {operand_in_asm}, {int(self.value)}')
-
-        asm_code.extend((
-            f'  neg {operand_in_asm}',
-            f'  push {operand_in_asm}'
-        ))
+    def lower(self, builder: IRBuilder) -> Recursion[Value]:
+        result = builder.new_temporary()
+        builder.emit(ir.UnaryOperation(
+            result, self.operator,
+            (yield Expression.lower_operand(self.value, builder))))
+        return result
 
-        Expression.set_reg_inactive(reg)
-        return asm_code
-
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.value, Expression):
-            stringified_value = \
-                self.value.generate_ast_representation()
-        elif isinstance(self.value, Variable):
-            stringified_value = f'"{self.value.name}"'
-        elif is_number(self.value):
-            stringified_value = f'"{self.value}"'
-        else:
-            stringified_value = ""
-        return (f'{{"id":"{self.id}", "operator":"{self.operator}",'
-                f' "value":{stringified_value}}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'operator': self.operator,
+            'value': (yield _generate_ast_of_operand(self.value))
+        }
 
 
 class BinaryExpression(Expression):
@@ -502,6 +406,11 @@ class BinaryExpression(Expression):
 
     __slots__ = ('id', 'left_operand', 'right_operand', 'operator')
 
+    # Operators of comparisons and logical operations with short-circuit
+    # evaluation
+    COMPARISONS: ClassVar[tuple] = ('==', '<')
+    LOGICAL_OPERATORS: ClassVar[tuple] = ('&&', '||')
+
     def __init__(self, left_operand: Operand, right_operand: Operand,
                  operator: Literal['/', '*', '==']):
         self.id = 'binary_op'
@@ -509,120 +418,82 @@ class BinaryExpression(Expression):
         self.right_operand = right_operand
         self.operator = operator
 
-    def generate_asm_code(self) -> list:
-        asm_code = []
-
-        code_of_left_expression,\
-            left_operand_in_asm = Expression._process_operand(
-                self.left_operand)
-        asm_code.extend(code_of_left_expression)
-
-        code_of_right_expression,\
-            right_operand_in_asm = Expression._process_operand(
-                self.right_operand)
-        asm_code.extend(code_of_right_expression)
-
-        local_active_regs = []
-
-        if left_operand_in_asm == 'reg' and right_operand_in_asm == 'reg':
-            left_operand_in_asm = Expression.get_inactive_reg()
-            right_operand_in_asm = Expression.get_inactive_reg()
-            asm_code.extend(
-                (f'  pop {right_operand_in_asm}',
-                 f'  pop {left_operand_in_asm}')
-            )
-            local_active_regs.append(left_operand_in_asm)
-            local_active_regs.append(right_operand_in_asm)
-        elif left_operand_in_asm == 'reg':
-            left_operand_in_asm = Expression.get_inactive_reg()
-            asm_code.append(f'  pop {left_operand_in_asm}')
-            local_active_regs.append(left_operand_in_asm)
-        elif right_operand_in_asm == 'reg':
-            right_operand_in_asm = Expression.get_inactive_reg()
-            asm_code.append(f'  pop {right_operand_in_asm}')
-            local_active_regs.append(right_operand_in_asm)
-
-        if self.operator == '/':
-            asm_code.append(
-                ('  invoke divide, '
-                 f'{left_operand_in_asm}, '
-                 f'{right_operand_in_asm}')
-            )
-        elif self.operator == '*':
-            asm_code.append(
-                ('  invoke multiply, '
-                 f'{left_operand_in_asm}, '
-                 f'{right_operand_in_asm}')
-            )
-        elif self.operator == '==':
-            asm_code.append(
-                ('  invoke compare, '
-                 f'{left_operand_in_asm}, '
-                 f'{right_operand_in_asm}')
-            )
-        elif self.operator == '&&':
-            asm_code.append(
-                ('  invoke logical_and,'
-                 f' {left_operand_in_asm},'
-                 f' {right_operand_in_asm}')
-            )
-        elif self.operator == '||':
-            asm_code.append(
-                ('  invoke logical_or,'
-                 f' {left_operand_in_asm},'
-                 f' {right_operand_in_asm}')
-            )
-        elif self.operator == '<':
-            asm_code.append(
-                ('  invoke lcompare,'
-                 f' {left_operand_in_asm},'
-                 f' {right_operand_in_asm}')
-            )
-        elif self.operator == '+':
-            asm_code.append(
-                ('  invoke summarize,'
-                 f' {left_operand_in_asm},'
-                 f' {right_operand_in_asm}')
-            )
-        elif self.operator == '-':
-            asm_code.append(
-                ('  invoke subtract,'
-                 f' {left_operand_in_asm},'
-                 f' {right_operand_in_asm}')
-            )
-
-        asm_code.append('  push eax')
-
-        for reg in local_active_regs:
-            Expression.set_reg_inactive(reg)
-
-        Expression.set_reg_inactive('eax')
-        return asm_code
-
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.left_operand, Expression):
-            stringified_left_operand = \
-                self.left_operand.generate_ast_representation()
-        elif isinstance(self.left_operand, Variable):
-            stringified_left_operand = f'"{self.left_operand.name}"'
-        elif is_number(self.left_operand):
-            stringified_left_operand = f'"{self.left_operand}"'
+    def __lower_short_circuit(self, builder: IRBuilder) -> Recursion[Value]:
+        """Value of '&&' or '||', whose right operand is evaluated only
+        when the left one does not decide the result"""
+        result = builder.new_temporary()
+        if_true = builder.new_block('true')
+        if_false = builder.new_block('false')
+        end = builder.new_block('continue')
+
+        yield self.__lower_logical_jump(builder, if_true, if_false)
+        builder.set_block(if_true)
+        builder.emit(ir.Copy(result, 1))
+        builder.jump(end)
+        builder.set_block(if_false)
+        builder.emit(ir.Copy(result, 0))
+        builder.jump(end)
+        builder.set_block(end)
+        return result
+
+    def __lower_logical_jump(self, builder: IRBuilder, if_true: BasicBlock,
+                             if_false: BasicBlock) -> Recursion[None]:
+        # Left operand of '&&' decides the result, when it is false,
+        # and left operand of '||', when it is true
+        right_operand_block = builder.new_block('next')
+        if self.operator == '&&':
+            yield Expression.lower_branch(self.left_operand, builder,
+                                          right_operand_block, if_false)
         else:
-            stringified_left_operand = ""
-
-        if isinstance(self.right_operand, (Expression, Variable)):
-            stringified_right_operand = \
-                self.right_operand.generate_ast_representation()
-        elif isinstance(self.right_operand, Variable):
-            stringified_right_operand = f'"{self.right_operand.name}"'
-        elif is_number(self.right_operand):
-            stringified_right_operand = f'"{self.right_operand}"'
+            yield Expression.lower_branch(self.left_operand, builder,
+                                          if_true, right_operand_block)
+        builder.set_block(right_operand_block)
+        yield Expression.lower_branch(self.right_operand, builder, if_true,
+                                      if_false)
+
+    def lower(self, builder: IRBuilder) -> Recursion[Value]:
+        if (self.operator in BinaryExpression.LOGICAL_OPERATORS
+                and builder.options.short_circuit):
+            return (yield self.__lower_short_circuit(builder))
+
+        left_operand = yield Expression.lower_operand(self.left_operand,
+                                                      builder)
+        right_operand = yield Expression.lower_operand(self.right_operand,
+                                                       builder)
+        result = builder.new_temporary()
+        builder.emit(ir.BinaryOperation(result, self.operator, left_operand,
+                                        right_operand))
+        return result
+
+    def lower_jump(self, builder: IRBuilder, if_true: BasicBlock,
+                   if_false: BasicBlock) -> Recursion[None]:
+        """Comparisons branch by their operands without computing 0 or 1,
+        and '&&' and '||' jump past the right operand, when the left one
+        decides the result"""
+        options = builder.options
+        if (self.operator in BinaryExpression.LOGICAL_OPERATORS
+                and options.short_circuit):
+            yield self.__lower_logical_jump(builder, if_true, if_false)
+        elif (self.operator in BinaryExpression.COMPARISONS
+                and options.fuse_comparisons):
+            builder.branch(
+                self.operator,
+                (yield Expression.lower_operand(self.left_operand, builder)),
+                (yield Expression.lower_operand(self.right_operand,
+                                                builder)),
+                if_true, if_false)
         else:
-            stringified_right_operand = ""
+            yield super().lower_jump(builder, if_true, if_false)
 
-        return (f'{{"id":"{self.id}", "operator":"{self.operator}",'
-                f' "left_operand":{stringified_left_operand},'
-                f' "right_operand":{stringified_right_operand}}}')
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'operator': self.operator,
+            'left_operand': (yield _generate_ast_of_operand(
+                self.left_operand)),
+            'right_operand': (yield _generate_ast_of_operand(
+                self.right_operand))
+        }
 
 
 class TernaryExpression(Expression):
@@ -637,96 +508,122 @@ class TernaryExpression(Expression):
         self.right_operand = right_operand
         self.condition = condition
 
-    def generate_asm_code(self) -> list:
-        salt = Program.DYNAMIC_SALT
-        Program.DYNAMIC_SALT += 1
-
-        asm_code = []
-
-        code_of_condition, condition_in_asm = \
-            Expression._process_operand(self.condition)
-
-        code_of_left_expression, left_operand_in_asm = \
-            Expression._process_operand(self.left_operand)
-
-        code_of_right_expression, right_operand_in_asm = \
-            Expression._process_operand(self.right_operand)
-
-        local_active_regs = []
-
-        if condition_in_asm == 'reg':
-            condition_in_asm = Expression.get_inactive_reg()
-            code_of_condition.append(f'  pop {condition_in_asm}')
-            local_active_regs.append(condition_in_asm)
-        elif is_number(condition_in_asm):
-            reg = Expression.get_inactive_reg()
-            code_of_condition.append(f'  mov {reg}, {condition_in_asm}')
-            condition_in_asm = reg
-            local_active_regs.append(reg)
-
-        if not code_of_left_expression:
-            reg = Expression.get_inactive_reg()
-            code_of_left_expression = (f'  mov {reg}, {left_operand_in_asm}',
-                                       f'  push {reg}')
-            Expression.set_reg_inactive(reg)
-
-        if not code_of_right_expression:
-            reg = Expression.get_inactive_reg()
-            code_of_right_expression = (f'  mov {reg}, {right_operand_in_asm}',
-                                        f'  push {reg}')
-            Expression.set_reg_inactive(reg)
-
-        indentation_separator = '\n  '
-
-        asm_code.extend((
-            *code_of_condition,
-            f'  cmp {condition_in_asm}, 0',
-            f'  je false{salt}',
-            f'  jne true{salt}',
-            f'  true{salt}:',
-            f'  {indentation_separator.join(code_of_left_expression)}',
-            f'    jmp continue{salt}',
-            f'  false{salt}:',
-            f'  {indentation_separator.join(code_of_right_expression)}',
-            f'    jmp continue{salt}',
-            '',
-            f'  continue{salt}:'
-        ))
-
-        for reg in local_active_regs:
-            Expression.set_reg_inactive(reg)
-        return asm_code
-
-    def generate_ast_representation(self) -> str:
-        if isinstance(self.condition, Expression):
-            stringified_condition = \
-                self.condition.generate_ast_representation()
-        elif isinstance(self.condition, Variable):
-            stringified_condition = f'"{self.condition.name}"'
-        elif is_number(self.condition):
-            stringified_condition = f'"{self.condition}"'
-        else:
-            stringified_condition = ""
-
-        if isinstance(self.left_operand, Expression):
-            stringified_left_operand = \
-                self.left_operand.generate_ast_representation()
-        elif isinstance(self.left_operand, Variable):
-            stringified_left_operand = f'"{self.left_operand.name}"'
-        elif is_number(self.left_operand):
-            stringified_left_operand = f'"{self.left_operand}"'
-        else:
-            stringified_left_operand = ""
-
-        if isinstance(self.right_operand, Expression):
-            stringified_right_operand = \
-                self.right_operand.generate_ast_representation()
-        elif isinstance(self.right_operand, Variable):
-            stringified_right_operand = f'"{self.right_operand.name}"'
-        elif is_number(self.right_operand):
-            stringified_right_operand = f'"{self.right_operand}"'
-        else:
-            stringified_right_operand = ""
-        return (f'{{"id":"{self.id}", "condition":{stringified_condition},'
-                f' "left_operand":{stringified_left_operand},'
-                f' "right_operand":{stringified_right_operand}}}')
+    def lower_condition(self, builder: IRBuilder, if_true: BasicBlock,
+                        if_false: BasicBlock) -> Recursion[None]:
+        return Expression.lower_branch(self.condition, builder, if_true,
+                                       if_false)
+
+    def lower(self, builder: IRBuilder) -> Recursion[Value]:
+        result = builder.new_temporary()
+        if_true = builder.new_block('true')
+        if_false = builder.new_block('false')
+        end = builder.new_block('continue')
+
+        yield self.lower_condition(builder, if_true, if_false)
+        builder.set_block(if_true)
+        builder.emit(ir.Copy(result, (yield Expression.lower_operand(
+            self.left_operand, builder))))
+        builder.jump(end)
+        builder.set_block(if_false)
+        builder.emit(ir.Copy(result, (yield Expression.lower_operand(
+            self.right_operand, builder))))
+        builder.jump(end)
+        builder.set_block(end)
+        return result
+
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'condition': (yield _generate_ast_of_operand(self.condition)),
+            'left_operand': (yield _generate_ast_of_operand(
+                self.left_operand)),
+            'right_operand': (yield _generate_ast_of_operand(
+                self.right_operand))
+        }
+
+
+class TailCall(BasicNode):
+    """Call of the function by itself, whose result is returned, it is
+    compiled as jump to the beginning of the function with new values of
+    arguments. Accumulation is the new value of accumulator, that keeps
+    operations left after recursive calls."""
+
+    __slots__ = ('id', 'call', 'accumulator', 'accumulation')
+
+    # Name of block after beginning of function, that tail calls jump to
+    LABEL: ClassVar[str] = 'tail_call'
+
+    def __init__(self, call: FunctionCall,
+                 accumulator: Optional[Variable] = None,
+                 accumulation: Optional[Operand] = None):
+        self.id = 'tail_call'
+        self.call = call
+        self.accumulator = accumulator
+        self.accumulation = accumulation
+
+    def lower(self, builder: IRBuilder) -> Recursion[None]:
+        # All values are computed before arguments are changed, because
+        # they could depend on old values of arguments
+        accumulation = None
+        if self.accumulation is not None:
+            accumulation = builder.load(
+                (yield Expression.lower_operand(self.accumulation, builder)))
+        values = []
+        for argument in self.call.arguments:
+            value = yield Expression.lower_operand(argument, builder)
+            if not isinstance(value, int):
+                value = builder.load(value)
+            values.append(value)
+
+        if accumulation is not None:
+            builder.emit(ir.Copy(self.accumulator.name_with_salt,
+                                 accumulation))
+        for argument, value in zip(self.call.function.arguments, values):
+            builder.emit(ir.Copy(argument.name_with_salt, value))
+        builder.jump(builder.tail_call_target)
+
+    def iterate_ast(self) -> Recursion[dict]:
+        return {
+            'id': self.id,
+            'call': (yield self.call.iterate_ast()),
+            'accumulation': (yield _generate_ast_of_operand(
+                self.accumulation))
+        }
+
+
+def iterate_children(node: BasicNode) -> Iterator[BasicNode]:
+    """Nodes right below the node, numbers, 'break' and 'continue' are
+    skipped"""
+    if isinstance(node, Program):
+        children = node.contents
+    elif isinstance(node, Function):
+        children = node.body
+    elif isinstance(node, DoWhileLoop):
+        children = (*node.body, node.expression)
+    elif isinstance(node, Return):
+        children = (node.argument,)
+    elif isinstance(node, VariableInitialization):
+        children = (node.expression,)
+    elif isinstance(node, FunctionCall):
+        children = node.arguments
+    elif isinstance(node, UnaryExpression):
+        children = (node.value,)
+    elif isinstance(node, BinaryExpression):
+        children = (node.left_operand, node.right_operand)
+    elif isinstance(node, TernaryExpression):
+        children = (node.condition, node.left_operand, node.right_operand)
+    elif isinstance(node, TailCall):
+        children = (node.call, node.accumulation)
+    else:
+        children = ()
+    return (child for child in children if isinstance(child, BasicNode))
+
+
+def iterate_nodes(node: BasicNode) -> Iterator[BasicNode]:
+    """Node and all nodes below it, without recursion, so depth of
+    expressions is not limited by the stack of the interpreter"""
+    stack = [node] if isinstance(node, BasicNode) else []
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(iterate_children(node))
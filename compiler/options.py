@@ -0,0 +1,147 @@
+"""Module contains options that control phases and output of compilation"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from compiler.peephole import RULES as PEEPHOLE_RULES
+
+
+# Phases of compilation in the order they are run
+PHASES = ('read', 'lex', 'parse', 'ast', 'optimize', 'codegen', 'write')
+# Kinds of output files and phases that produce them
+EMIT_KINDS = {'asm': 'codegen', 'ast': 'ast'}
+# Options, that differ from defaults at optimization levels, the default
+# options are level 2
+OPTIMIZATION_LEVELS = {
+    0: {'fold_constants': False, 'peephole_rules': frozenset(),
+        'eliminate_dead_functions': False, 'inline_threshold': 0,
+        'eliminate_tail_calls': False, 'reduce_strength': False,
+        'fuse_comparisons': False, 'thread_jumps': False,
+        'duplicate_returns': False, 'remove_unreachable_blocks': False,
+        'inline_operations': False},
+    1: {'inline_threshold': 0, 'eliminate_tail_calls': False},
+    2: {},
+}
+
+
+@dataclass(frozen=True)
+class CompilerOptions:
+    """What compiler should produce and where it should stop
+
+    'emit' is a set of output files to write: 'asm' and/or 'ast'. With
+    empty 'emit' only diagnostics are reported. 'stop_after' is the name of
+    the last phase to run, phases after it are skipped. 'fold_constants'
+    enables constant folding and propagation before code generation,
+    'peephole_rules' are names of enabled rules of peephole optimizer.
+    With 'inline_operations' arithmetic, comparisons and logical operations
+    are computed by instructions in place instead of calls of helper
+    procedures. With 'eliminate_dead_functions' functions, that could not
+    be called from 'main', are not generated, 'warn_dead_functions' reports
+    them as warnings. Calls of not recursive functions, whose bodies have
+    at most 'inline_threshold' nodes, are replaced by their bodies, zero
+    disables inlining. With 'eliminate_tail_calls' returned recursive
+    calls are compiled as jumps and linear recursion as a loop. With
+    'reduce_strength' multiplication and division by constants are done
+    by shifts, 'lea' and multiplication by magic numbers. With
+    'fuse_comparisons' conditions of loops and ternary operators jump by
+    flags of comparisons without computing their values. With
+    'short_circuit' the right operand of '&&' and '||' is evaluated only
+    when the left one does not decide the result. 'thread_jumps',
+    'duplicate_returns' and 'remove_unreachable_blocks' enable passes,
+    that simplify control-flow graph of intermediate representation.
+    With 'measure_passes' pass manager counts instructions before and
+    after every pass, which lowers the whole program after passes over
+    AST, so it is slow and enabled only for reports.
+
+    With 'profile' time, memory, tokens and nodes of every phase are
+    recorded in results of compilation.
+
+    Optimization levels are presets of these options: level 0 disables
+    all optimizations, level 1 runs only fast local ones and level 2,
+    the default, runs all of them. 'short_circuit' stays enabled at every
+    level, because 'C' does not evaluate the right operand, when the left
+    one decides the result, and the right one could divide by zero.
+    """
+
+    emit: frozenset = field(default_factory=lambda: frozenset({'asm'}))
+    stop_after: Optional[str] = None
+    fold_constants: bool = True
+    peephole_rules: frozenset = frozenset(PEEPHOLE_RULES)
+    inline_operations: bool = True
+    eliminate_dead_functions: bool = True
+    warn_dead_functions: bool = False
+    inline_threshold: int = 16
+    eliminate_tail_calls: bool = True
+    reduce_strength: bool = True
+    fuse_comparisons: bool = True
+    short_circuit: bool = True
+    thread_jumps: bool = True
+    duplicate_returns: bool = True
+    remove_unreachable_blocks: bool = True
+    measure_passes: bool = False
+    profile: bool = False
+
+    def __post_init__(self):
+        unknown_kinds = set(self.emit) - EMIT_KINDS.keys()
+        if unknown_kinds:
+            raise ValueError(f'Unknown kinds of output: {unknown_kinds}')
+        if self.stop_after is not None and self.stop_after not in PHASES:
+            raise ValueError(f'Unknown phase: {self.stop_after}')
+        unknown_rules = set(self.peephole_rules) - PEEPHOLE_RULES.keys()
+        if unknown_rules:
+            raise ValueError(f'Unknown peephole rules: {unknown_rules}')
+        if self.inline_threshold < 0:
+            raise ValueError(
+                f'Negative threshold of inlining: {self.inline_threshold}')
+        object.__setattr__(self, 'emit', frozenset(self.emit))
+        object.__setattr__(self, 'peephole_rules',
+                           frozenset(self.peephole_rules))
+
+    @classmethod
+    def at_level(cls, level: int, **options) -> 'CompilerOptions':
+        """Options of optimization level, that are changed by the passed
+        ones"""
+        if level not in OPTIMIZATION_LEVELS:
+            raise ValueError(f'Unknown optimization level: {level}')
+        return cls(**{**OPTIMIZATION_LEVELS[level], **options})
+
+    @classmethod
+    def check_only(cls) -> 'CompilerOptions':
+        """Report lexing, parsing and semantic errors without any output"""
+        return cls(emit=frozenset(), stop_after='parse')
+
+    def reaches(self, phase: str) -> bool:
+        """Phase is not after the last phase"""
+        if self.stop_after is None:
+            return True
+        return PHASES.index(phase) <= PHASES.index(self.stop_after)
+
+    def runs_phase(self, phase: str) -> bool:
+        """Phase is reached and its result is needed"""
+        if not self.reaches(phase):
+            return False
+        if phase == 'optimize':
+            # Optimizations are needed only for generated code
+            return 'asm' in self.emit
+        if phase in EMIT_KINDS.values():
+            return any(EMIT_KINDS[kind] == phase for kind in self.emit)
+        if phase == 'write':
+            return bool(self.emit)
+        return True
+
+    def get_cache_key(self) -> dict:
+        """Options, that change content of generated files or warnings"""
+        return {'emit': sorted(self.emit),
+                'fold_constants': self.fold_constants,
+                'peephole_rules': sorted(self.peephole_rules),
+                'inline_operations': self.inline_operations,
+                'eliminate_dead_functions': self.eliminate_dead_functions,
+                'warn_dead_functions': self.warn_dead_functions,
+                'inline_threshold': self.inline_threshold,
+                'eliminate_tail_calls': self.eliminate_tail_calls,
+                'reduce_strength': self.reduce_strength,
+                'fuse_comparisons': self.fuse_comparisons,
+                'short_circuit': self.short_circuit,
+                'thread_jumps': self.thread_jumps,
+                'duplicate_returns': self.duplicate_returns,
+                'remove_unreachable_blocks': self.remove_unreachable_blocks}
@@ -0,0 +1,92 @@
+"""Module contains driver that compiles many source files in processes
+
+Every worker process builds its own lexer and parser once and reuses them
+for all files it gets. Results are returned in the order of source files,
+and error in one file does not stop compilation of the others.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from compiler.compiler import Compiler, CompilationResult
+from compiler.compilation_cache import CompilationCache, DEFAULT_MAX_SIZE
+from compiler.function_cache import FunctionCodeCache
+from compiler.options import CompilerOptions
+from compiler.lexer_wrapper import lexer_generator
+from compiler.parse_table_cache import build_parser
+
+
+# Lexer, parser and caches of the current worker process
+_worker_lexer = None
+_worker_parser = None
+_worker_cache = None
+_worker_function_code_cache = None
+_worker_options = None
+
+
+def _initialize_worker(cache_directory: Optional[str], cache_max_size: int,
+                       options: CompilerOptions) -> None:
+    global _worker_lexer, _worker_parser, _worker_cache, \
+        _worker_function_code_cache, _worker_options
+    _worker_lexer = lexer_generator.build()
+    _worker_parser = build_parser()
+    if cache_directory is not None:
+        _worker_cache = CompilationCache(cache_directory, cache_max_size)
+    _worker_function_code_cache = FunctionCodeCache(
+        storage=_worker_cache, options=options.get_cache_key())
+    _worker_options = options
+
+
+def _compile_in_worker(paths: tuple[str, str]) -> CompilationResult:
+    path_to_source_file, path_to_output_file = paths
+    compiler = Compiler(path_to_source_file, path_to_output_file,
+                        lexer=_worker_lexer, parser=_worker_parser,
+                        cache=_worker_cache,
+                        function_code_cache=_worker_function_code_cache,
+                        options=_worker_options)
+    try:
+        return compiler.try_compile()
+    except BaseException as err:
+        # Even 'sys.exit' in a worker must not break the whole pool
+        return CompilationResult(
+            path_to_source_file=path_to_source_file,
+            path_to_output_file=path_to_output_file,
+            succeeded=False,
+            message=f'INTERNAL ERROR: {err!r}'
+        )
+
+
+def compile_in_parallel(paths_to_source_files: Iterable[str],
+                        output_directory: Optional[str] = None,
+                        workers: Optional[int] = None,
+                        cache_directory: Optional[str] = None,
+                        cache_max_size: int = DEFAULT_MAX_SIZE,
+                        options: Optional[CompilerOptions] = None
+                        ) -> list[CompilationResult]:
+    """Compile source files in pool of 'workers' processes
+
+    By default number of workers equals to number of processors. Workers
+    share compilation cache when 'cache_directory' is passed.
+    """
+    options = options or CompilerOptions()
+    jobs = [
+        (path, Compiler.get_output_path(path, output_directory))
+        for path in paths_to_source_files
+    ]
+    if not jobs:
+        return []
+
+    if output_directory is not None:
+        os.makedirs(output_directory, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    # Send files in chunks, because one small file is compiled faster
+    # than it is passed between processes
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(
+            max_workers=workers, initializer=_initialize_worker,
+            initargs=(cache_directory, cache_max_size, options)) as executor:
+        return list(executor.map(_compile_in_worker, jobs,
+                                 chunksize=chunksize))
@@ -0,0 +1,166 @@
+"""Module contains persistent cache of LALR tables of the parser
+
+Generation of LALR tables takes much more time than parsing of small
+programs, so generated tables are saved to a cache file keyed by hash of
+grammar and precedence and loaded on next runs. Tables could also be
+shipped inside the package as precomputed module 'compiler/parsetab.py',
+which is created by running:
+
+    python -m compiler.parse_table_cache
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import pprint
+import tempfile
+from typing import Optional
+
+from appdirs import AppDirs
+from rply import ParserGenerator
+from rply.grammar import Grammar
+from rply.parser import LRParser
+from rply.parsergenerator import LRTable
+
+from compiler.parser_wrapper import parser_generator
+
+
+TABLE_FORMAT_VERSION = 1
+CACHE_DIRECTORY = AppDirs('pyCcompiler').user_cache_dir
+PRECOMPUTED_MODULE = 'compiler.parsetab'
+PATH_TO_PRECOMPUTED_MODULE = os.path.join(os.path.dirname(__file__),
+                                          'parsetab.py')
+
+
+def compute_grammar_hash(generator: ParserGenerator) -> str:
+    """Hash of tokens, precedence and productions of the grammar"""
+    hasher = hashlib.sha256()
+    hasher.update(f'{TABLE_FORMAT_VERSION}'.encode())
+    hasher.update(json.dumps(list(generator.tokens)).encode())
+    hasher.update(json.dumps(generator.precedence).encode())
+    for production_name, symbols, _, precedence in generator.productions:
+        hasher.update(
+            json.dumps([production_name, symbols, precedence]).encode())
+    return hasher.hexdigest()
+
+
+def serialize_table(table: LRTable) -> dict:
+    return {
+        'lr_action': table.lr_action,
+        'lr_goto': table.lr_goto,
+        'default_reductions': table.default_reductions,
+        'sr_conflicts': table.sr_conflicts,
+        'rr_conflicts': table.rr_conflicts,
+    }
+
+
+def get_path_to_cache_file(cache_directory: str, grammar_hash: str) -> str:
+    return os.path.join(cache_directory, f'parsetab-{grammar_hash}.json')
+
+
+def _build_grammar(generator: ParserGenerator) -> Grammar:
+    """Grammar with productions only, enough for parsing with ready table"""
+    grammar = Grammar(generator.tokens)
+    for level, (assoc, terms) in enumerate(generator.precedence, 1):
+        for term in terms:
+            grammar.set_precedence(term, assoc, level)
+    for production_name, symbols, func, precedence in generator.productions:
+        grammar.add_production(production_name, symbols, func, precedence)
+    grammar.set_start()
+    return grammar
+
+
+def _build_parser_from_table(generator: ParserGenerator,
+                             data: dict) -> LRParser:
+    table = LRTable(
+        _build_grammar(generator),
+        data['lr_action'],
+        data['lr_goto'],
+        data['default_reductions'],
+        data['sr_conflicts'],
+        data['rr_conflicts']
+    )
+    return LRParser(table, generator.error_handler)
+
+
+def _load_precomputed_table(grammar_hash: str) -> Optional[dict]:
+    try:
+        parsetab = importlib.import_module(PRECOMPUTED_MODULE)
+    except ImportError:
+        return None
+    if getattr(parsetab, 'GRAMMAR_HASH', None) != grammar_hash:
+        return None
+    return parsetab.TABLE
+
+
+def _load_cached_table(path_to_cache_file: str) -> Optional[dict]:
+    try:
+        with open(path_to_cache_file, 'r') as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_table(cache_directory: str, path_to_cache_file: str,
+                        data: dict) -> None:
+    try:
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=cache_directory,
+                                         delete=False) as cache_file:
+            json.dump(data, cache_file)
+        os.replace(cache_file.name, path_to_cache_file)
+    except OSError:
+        # Cache is only an optimization, so read-only location is not
+        # a reason to stop compilation
+        pass
+
+
+def build_parser(generator: ParserGenerator = parser_generator,
+                 cache_directory: Optional[str] = CACHE_DIRECTORY,
+                 use_precomputed: bool = True) -> LRParser:
+    """Build parser, reusing previously generated tables if possible
+
+    Tables are searched in precomputed module first, then in cache file.
+    If both are missing, tables are generated and saved to cache file.
+    Pass None as 'cache_directory' to disable the cache file.
+    """
+    grammar_hash = compute_grammar_hash(generator)
+
+    if use_precomputed:
+        data = _load_precomputed_table(grammar_hash)
+        if data is not None:
+            return _build_parser_from_table(generator, data)
+
+    if cache_directory is not None:
+        path_to_cache_file = get_path_to_cache_file(cache_directory,
+                                                    grammar_hash)
+        data = _load_cached_table(path_to_cache_file)
+        if data is not None:
+            return _build_parser_from_table(generator, data)
+
+    parser = generator.build()
+    if cache_directory is not None:
+        _write_cached_table(cache_directory, path_to_cache_file,
+                            serialize_table(parser.lr_table))
+    return parser
+
+
+def write_precomputed_module(
+        generator: ParserGenerator = parser_generator,
+        path_to_module: str = PATH_TO_PRECOMPUTED_MODULE) -> None:
+    """Generate tables and save them as importable python module"""
+    table = generator.build().lr_table
+    with open(path_to_module, 'w') as module_file:
+        module_file.write(
+            '"""Precomputed LALR tables of the parser, generated by'
+            ' parse_table_cache"""\n\n'
+            f'GRAMMAR_HASH = {compute_grammar_hash(generator)!r}\n\n'
+            f'TABLE = {pprint.pformat(serialize_table(table), compact=True)}'
+            '\n'
+        )
+
+
+if __name__ == '__main__':
+    write_precomputed_module()
+    print(f'Parser tables are written to {PATH_TO_PRECOMPUTED_MODULE}')
@@ -26,19 +26,21 @@ precedence = (
     ('left', ['*', '/']),
     ('left', ['('])
 )
+# Every production receives CompilationContext, that is passed to the parser
+# as 'state', before parsed symbols
 parser_generator = ParserGenerator(token_names, precedence=precedence)
 
 
 @parser_generator.production('program : contents')
-def program(parsed):
-    if 'main' not in Program.get_functions().keys():
+def program(context, parsed):
+    if 'main' not in context.get_functions().keys():
         raise errors.MainFunctionDoesNotExistsError()
-    return Program(contents=parsed[0])
+    return Program(contents=parsed[0], context=context)
 
 
 @parser_generator.production('contents : function')
 @parser_generator.production('contents : contents function')
-def contents(parsed):
+def contents(context, parsed):
     _contents = []
     if (_len_of_parsed := len(parsed)) == 1:
         _contents.append(parsed[0])
@@ -52,7 +54,7 @@ def contents(parsed):
     'function : function_initializer ( arguments ) { body }')
 @parser_generator.production(
     'function : function_initializer ( arguments ) semicolons')
-def function(parsed):
+def function(context, parsed):
     _function, prev_declared_arguments = parsed[0]
     if prev_declared_arguments is not None:
         declared_arguments = tuple(
@@ -80,8 +82,8 @@ def function(parsed):
 
 
 @parser_generator.production('function_initializer : TYPE IDENTIFIER')
-def function_initializer(parsed):
-    prev_declaration = Program.get_function(parsed[1].value)
+def function_initializer(context, parsed):
+    prev_declaration = context.get_function(parsed[1].value)
     declared_arguments = None
     if prev_declaration is not None:
         if prev_declaration.body != []:
@@ -91,6 +93,7 @@ def function_initializer(parsed):
     _function = Function(
         name=parsed[1].value,
         type_=parsed[0].value,
+        context=context
     )
     return _function, declared_arguments
 
@@ -98,20 +101,23 @@ def function_initializer(parsed):
 @parser_generator.production('arguments : ')
 @parser_generator.production('arguments : TYPE IDENTIFIER')
 @parser_generator.production('arguments : arguments , TYPE IDENTIFIER')
-def arguments(parsed):
+def arguments(context, parsed):
     _arguments = []
-    if (len_of_parsed := len(parsed)) in (2, 3):
-        argument = Variable(type_=parsed[0].value, name=parsed[1].value,
-                            is_function_argument=True)
-        if len_of_parsed == 3:
-            _arguments.extend(parsed[0])
-        _arguments.append(argument)
+    if (len_of_parsed := len(parsed)) == 2:
+        _arguments.append(Variable(type_=parsed[0].value,
+                                   name=parsed[1].value, context=context,
+                                   is_function_argument=True))
+    elif len_of_parsed == 4:
+        _arguments.extend(parsed[0])
+        _arguments.append(Variable(type_=parsed[2].value,
+                                   name=parsed[3].value, context=context,
+                                   is_function_argument=True))
     return _arguments
 
 
 @parser_generator.production('body : instruction semicolons')
 @parser_generator.production('body : body instruction semicolons')
-def body(parsed):
+def body(context, parsed):
     _body = []
     if (len_of_parsed := len(parsed)) == 2:
         _body.append(parsed[0])
@@ -130,25 +136,27 @@ def body(parsed):
 @parser_generator.production('instruction : CONTINUE')
 @parser_generator.production(
     'instruction : DO { loop_body } WHILE ( loop_expression )')
-def instruction(parsed):
-    current_function = Program.get_current_function()
+def instruction(context, parsed):
+    current_function = context.get_current_function()
 
     if parsed[0].name == 'TYPE':
         if current_function.variable_exists(parsed[1].value):
             raise errors.VariableAlreadyExistsError(parsed[1])
 
         var_assignment = VariableInitialization(type_=parsed[0].value,
-                                                name=parsed[1].value)
+                                                name=parsed[1].value,
+                                                context=context)
         if len(parsed) == 4:
             var_assignment.expression = parsed[3]
             return var_assignment
         return
     elif parsed[0].name == 'IDENTIFIER':
-        var_assignment = VariableInitialization(name=parsed[0].value)
+        var_assignment = VariableInitialization(name=parsed[0].value,
+                                                context=context)
         if parsed[1].name == '=':
             var_assignment.expression = parsed[2]
         elif parsed[1].name == '/=':
-            var = variable([parsed[0]])
+            var = variable(context, [parsed[0]])
             var_assignment.expression = BinaryExpression(
                 left_operand=var,
                 right_operand=parsed[2],
@@ -167,7 +175,7 @@ def instruction(parsed):
 @parser_generator.production('loop_body : BREAK semicolons')
 @parser_generator.production('loop_body : CONTINUE semicolons')
 @parser_generator.production('loop_body : loop_body instruction semicolons')
-def loop_body(parsed):
+def loop_body(context, parsed):
     _body = []
     if (len_of_parsed := len(parsed)) == 2:
         if isinstance(parsed[0], Token):
@@ -182,7 +190,7 @@ def loop_body(parsed):
 
 @parser_generator.production('loop_expression : ')
 @parser_generator.production('loop_expression : expression')
-def loop_expression(parsed):
+def loop_expression(context, parsed):
     return parsed[0] if len(parsed) == 1 else None
 
 
@@ -200,12 +208,12 @@ def loop_expression(parsed):
 @parser_generator.production(
     'expression : expression ? expression COLON expression')
 @parser_generator.production('expression : ( expression )')
-def expression(parsed):
+def expression(context, parsed):
     if (_len_of_parsed := len(parsed)) == 2:
         return UnaryExpression(parsed[1])
     elif _len_of_parsed == 3:
         if isinstance(parsed[0], Token) and parsed[0].value == '(':
-            return expression([parsed[1]])
+            return expression(context, [parsed[1]])
         else:
             return BinaryExpression(left_operand=parsed[0],
                                     right_operand=parsed[2],
@@ -220,31 +228,32 @@ def expression(parsed):
 
 
 @parser_generator.production('function_call : IDENTIFIER ( passed_arguments )')
-def function_call(parsed):
-    func = Program.get_function(parsed[0].value)
+def function_call(context, parsed):
+    func = context.get_function(parsed[0].value)
     if func is None:
         raise errors.FunctionDoesNotExistsError(parsed[0])
 
-    return FunctionCall(function_name=func.name, arguments=parsed[2])
+    return FunctionCall(function_name=func.name, context=context,
+                        arguments=parsed[2])
 
 
 @parser_generator.production('passed_arguments : ')
 @parser_generator.production('passed_arguments : expression')
 @parser_generator.production(
     'passed_arguments : passed_arguments , expression')
-def passed_arguments(parsed):
+def passed_arguments(context, parsed):
     _passed_arguments = []
     if (len_of_parsed := len(parsed)) == 1:
         _passed_arguments.append(parsed[0])
-    elif len_of_parsed == 2:
+    elif len_of_parsed == 3:
         _passed_arguments.extend(parsed[0])
-        _passed_arguments.append(parsed[1])
+        _passed_arguments.append(parsed[2])
     return _passed_arguments
 
 
 @parser_generator.production('variable : IDENTIFIER')
-def variable(parsed):
-    var = Program.get_current_function().get_variable(parsed[0].value)
+def variable(context, parsed):
+    var = context.get_current_function().get_variable(parsed[0].value)
     if var is None:
         raise errors.VariableDoesNotExistsError(parsed[0])
 
@@ -255,7 +264,7 @@ def variable(parsed):
 
 
 @parser_generator.production('number : DECIMAL | HEX')
-def number(parsed):
+def number(context, parsed):
     if parsed[0].name == 'DECIMAL':
         parsed[0].value = int(float(parsed[0].value))
     elif parsed[0].name == 'HEX':
@@ -264,10 +273,10 @@ def number(parsed):
 
 
 @parser_generator.production('semicolons : ; | semicolons ;')
-def semicolons(parsed):
+def semicolons(context, parsed):
     pass
 
 
 @parser_generator.error
-def error_handler(token):
+def error_handler(context, token):
     raise errors.CodeError(token)
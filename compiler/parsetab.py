@@ -0,0 +1,576 @@
+"""Precomputed LALR tables of the parser, generated by parse_table_cache"""
+
+GRAMMAR_HASH = 'c945ae9284965e12fc2f56834474524ce14a79a3dadb0ad72d292407e07b2ee5'
+
+TABLE = {'default_reductions': [0, 0, -3, 0, 0, 0, -2, -6, 0, 0, 0, 0, 0, -8, -47, 0, 0,
+                        0, -48, 0, 0, 0, 0, 0, -13, 0, -14, -7, 0, -38, -36, 0,
+                        -46, -39, 0, 0, -45, 0, 0, -5, 0, 0, 0, 0, 0, 0, 0, 0,
+                        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -14, -13, 0, 0,
+                        0, 0, 0, 0, -30, 0, -31, 0, -26, 0, 0, 0, 0, 0, 0, 0, 0,
+                        0, -40, 0, 0, 0, 0, 0, 0, 0, 0, -12],
+ 'lr_action': [{'TYPE': 3}, {'$end': -1, 'TYPE': 3}, {'$end': -3, 'TYPE': -3},
+               {'IDENTIFIER': 7}, {'(': 8}, {'$end': 0},
+               {'$end': -2, 'TYPE': -2}, {'(': -6},
+               {')': -9, ',': -9, 'TYPE': 10}, {')': 11, ',': 12},
+               {'IDENTIFIER': 13}, {';': 14, '{': 16}, {'TYPE': 17},
+               {')': -8, ',': -8},
+               {'$end': -47,
+                ';': -47,
+                'BREAK': -47,
+                'CONTINUE': -47,
+                'DO': -47,
+                'IDENTIFIER': -47,
+                'RETURN': -47,
+                'TYPE': -47,
+                '}': -47},
+               {'$end': -4, ';': 18, 'TYPE': -4},
+               {'BREAK': 26,
+                'CONTINUE': 24,
+                'DO': 25,
+                'IDENTIFIER': 23,
+                'RETURN': 20,
+                'TYPE': 22},
+               {'IDENTIFIER': 27},
+               {'$end': -48,
+                ';': -48,
+                'BREAK': -48,
+                'CONTINUE': -48,
+                'DO': -48,
+                'IDENTIFIER': -48,
+                'RETURN': -48,
+                'TYPE': -48,
+                '}': -48},
+               {';': 14},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'BREAK': 26,
+                'CONTINUE': 24,
+                'DO': 25,
+                'IDENTIFIER': 23,
+                'RETURN': 20,
+                'TYPE': 22,
+                '}': 39},
+               {'IDENTIFIER': 40}, {'/=': 42, '=': 41}, {';': -13}, {'{': 43},
+               {';': -14}, {')': -7, ',': -7},
+               {';': 18,
+                'BREAK': -11,
+                'CONTINUE': -11,
+                'DO': -11,
+                'IDENTIFIER': -11,
+                'RETURN': -11,
+                'TYPE': -11,
+                '}': -11},
+               {')': -38,
+                '*': -38,
+                '+': -38,
+                ',': -38,
+                '-': -38,
+                '/': -38,
+                ';': -38,
+                '<': -38,
+                '==': -38,
+                '?': -38,
+                'AND': -38,
+                'COLON': -38,
+                'OR': -38},
+               {')': -36,
+                '*': -36,
+                '+': -36,
+                ',': -36,
+                '-': -36,
+                '/': -36,
+                ';': -36,
+                '<': -36,
+                '==': -36,
+                '?': -36,
+                'AND': -36,
+                'COLON': -36,
+                'OR': -36},
+               {'*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                ';': -19,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {')': -46,
+                '*': -46,
+                '+': -46,
+                ',': -46,
+                '-': -46,
+                '/': -46,
+                ';': -46,
+                '<': -46,
+                '==': -46,
+                '?': -46,
+                'AND': -46,
+                'COLON': -46,
+                'OR': -46},
+               {')': -39,
+                '*': -39,
+                '+': -39,
+                ',': -39,
+                '-': -39,
+                '/': -39,
+                ';': -39,
+                '<': -39,
+                '==': -39,
+                '?': -39,
+                'AND': -39,
+                'COLON': -39,
+                'OR': -39},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 54,
+                ')': -44,
+                '*': -44,
+                '+': -44,
+                ',': -44,
+                '-': -44,
+                '/': -44,
+                ';': -44,
+                '<': -44,
+                '==': -44,
+                '?': -44,
+                'AND': -44,
+                'COLON': -44,
+                'OR': -44},
+               {')': -45,
+                '*': -45,
+                '+': -45,
+                ',': -45,
+                '-': -45,
+                '/': -45,
+                ';': -45,
+                '<': -45,
+                '==': -45,
+                '?': -45,
+                'AND': -45,
+                'COLON': -45,
+                'OR': -45},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {';': 14}, {'$end': -5, 'TYPE': -5}, {';': -16, '=': 57},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'BREAK': 61,
+                'CONTINUE': 62,
+                'DO': 25,
+                'IDENTIFIER': 23,
+                'RETURN': 20,
+                'TYPE': 22},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {')': 73,
+                '*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {'(': 34,
+                ')': -43,
+                ',': -43,
+                '-': 37,
+                'DECIMAL': 36,
+                'HEX': 32,
+                'IDENTIFIER': 35},
+               {')': -37,
+                '*': 51,
+                '+': -37,
+                ',': -37,
+                '-': -37,
+                '/': 49,
+                ';': -37,
+                '<': -37,
+                '==': -37,
+                '?': -37,
+                'AND': -37,
+                'COLON': -37,
+                'OR': -37},
+               {';': 18,
+                'BREAK': -10,
+                'CONTINUE': -10,
+                'DO': -10,
+                'IDENTIFIER': -10,
+                'RETURN': -10,
+                'TYPE': -10,
+                '}': -10},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                ';': -18,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {'*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                ';': -17,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {'BREAK': 26,
+                'CONTINUE': 24,
+                'DO': 25,
+                'IDENTIFIER': 23,
+                'RETURN': 20,
+                'TYPE': 22,
+                '}': 77},
+               {';': -14}, {';': -13}, {';': 14},
+               {')': -29,
+                '*': 51,
+                '+': -29,
+                ',': -29,
+                '-': -29,
+                '/': 49,
+                ';': -29,
+                '<': -29,
+                '==': -29,
+                '?': -29,
+                'AND': -29,
+                'COLON': -29,
+                'OR': -29},
+               {')': -32,
+                '*': 51,
+                '+': 44,
+                ',': -32,
+                '-': 50,
+                '/': 49,
+                ';': -32,
+                '<': 52,
+                '==': 47,
+                '?': -32,
+                'AND': -32,
+                'COLON': -32,
+                'OR': -32},
+               {')': -33,
+                '*': 51,
+                '+': 44,
+                ',': -33,
+                '-': 50,
+                '/': 49,
+                ';': -33,
+                '<': 52,
+                '==': 47,
+                '?': -33,
+                'AND': 45,
+                'COLON': -33,
+                'OR': -33},
+               {')': -35,
+                '*': 51,
+                '+': 44,
+                ',': -35,
+                '-': 50,
+                '/': 49,
+                ';': -35,
+                '<': 52,
+                '==': -35,
+                '?': -35,
+                'AND': -35,
+                'COLON': -35,
+                'OR': -35},
+               {'*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'COLON': 82,
+                'OR': 46},
+               {')': -30,
+                '*': -30,
+                '+': -30,
+                ',': -30,
+                '-': -30,
+                '/': -30,
+                ';': -30,
+                '<': -30,
+                '==': -30,
+                '?': -30,
+                'AND': -30,
+                'COLON': -30,
+                'OR': -30},
+               {')': -28,
+                '*': 51,
+                '+': -28,
+                ',': -28,
+                '-': -28,
+                '/': 49,
+                ';': -28,
+                '<': -28,
+                '==': -28,
+                '?': -28,
+                'AND': -28,
+                'COLON': -28,
+                'OR': -28},
+               {')': -31,
+                '*': -31,
+                '+': -31,
+                ',': -31,
+                '-': -31,
+                '/': -31,
+                ';': -31,
+                '<': -31,
+                '==': -31,
+                '?': -31,
+                'AND': -31,
+                'COLON': -31,
+                'OR': -31},
+               {')': -34,
+                '*': 51,
+                '+': 44,
+                ',': -34,
+                '-': 50,
+                '/': 49,
+                ';': -34,
+                '<': -34,
+                '==': -34,
+                '?': -34,
+                'AND': -34,
+                'COLON': -34,
+                'OR': -34},
+               {')': -26,
+                '*': -26,
+                '+': -26,
+                ',': -26,
+                '-': -26,
+                '/': -26,
+                ';': -26,
+                '<': -26,
+                '==': -26,
+                '?': -26,
+                'AND': -26,
+                'COLON': -26,
+                'OR': -26},
+               {')': -42,
+                '*': 51,
+                '+': 44,
+                ',': -42,
+                '-': 50,
+                '/': 49,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {')': 83, ',': 84},
+               {'*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                ';': -15,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {'WHILE': 85}, {';': 14},
+               {';': 18,
+                'BREAK': -22,
+                'CONTINUE': -22,
+                'DO': -22,
+                'IDENTIFIER': -22,
+                'RETURN': -22,
+                'TYPE': -22,
+                '}': -22},
+               {';': 18,
+                'BREAK': -21,
+                'CONTINUE': -21,
+                'DO': -21,
+                'IDENTIFIER': -21,
+                'RETURN': -21,
+                'TYPE': -21,
+                '}': -21},
+               {';': 18,
+                'BREAK': -23,
+                'CONTINUE': -23,
+                'DO': -23,
+                'IDENTIFIER': -23,
+                'RETURN': -23,
+                'TYPE': -23,
+                '}': -23},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {')': -40,
+                '*': -40,
+                '+': -40,
+                ',': -40,
+                '-': -40,
+                '/': -40,
+                ';': -40,
+                '<': -40,
+                '==': -40,
+                '?': -40,
+                'AND': -40,
+                'COLON': -40,
+                'OR': -40},
+               {'(': 34, '-': 37, 'DECIMAL': 36, 'HEX': 32, 'IDENTIFIER': 35},
+               {'(': 89},
+               {';': 18,
+                'BREAK': -20,
+                'CONTINUE': -20,
+                'DO': -20,
+                'IDENTIFIER': -20,
+                'RETURN': -20,
+                'TYPE': -20,
+                '}': -20},
+               {')': -27,
+                '*': 51,
+                '+': 44,
+                ',': -27,
+                '-': 50,
+                '/': 49,
+                ';': -27,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'COLON': -27,
+                'OR': 46},
+               {')': -41,
+                '*': 51,
+                '+': 44,
+                ',': -41,
+                '-': 50,
+                '/': 49,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {'(': 34,
+                ')': -25,
+                '-': 37,
+                'DECIMAL': 36,
+                'HEX': 32,
+                'IDENTIFIER': 35},
+               {')': -24,
+                '*': 51,
+                '+': 44,
+                '-': 50,
+                '/': 49,
+                '<': 52,
+                '==': 47,
+                '?': 48,
+                'AND': 45,
+                'OR': 46},
+               {')': 92}, {';': -12}],
+ 'lr_goto': [{'contents': 1,
+              'function': 2,
+              'function_initializer': 4,
+              'program': 5},
+             {'function': 6, 'function_initializer': 4}, {}, {}, {}, {}, {}, {},
+             {'arguments': 9}, {}, {}, {'semicolons': 15}, {}, {}, {}, {},
+             {'body': 21, 'instruction': 19}, {}, {}, {'semicolons': 28},
+             {'expression': 31,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'instruction': 38}, {}, {}, {}, {}, {}, {}, {}, {}, {}, {}, {},
+             {},
+             {'expression': 53,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {}, {},
+             {'expression': 55,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'semicolons': 56}, {}, {},
+             {'expression': 58,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 59,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'instruction': 63, 'loop_body': 60},
+             {'expression': 64,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 65,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 66,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 67,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 68,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 69,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 70,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 71,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {'expression': 72,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {},
+             {'expression': 74,
+              'function_call': 30,
+              'number': 29,
+              'passed_arguments': 75,
+              'variable': 33},
+             {}, {},
+             {'expression': 76,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {}, {}, {'instruction': 78}, {'semicolons': 79},
+             {'semicolons': 80}, {'semicolons': 81}, {}, {}, {}, {}, {}, {}, {},
+             {}, {}, {}, {}, {}, {}, {}, {'semicolons': 86}, {}, {}, {},
+             {'expression': 87,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {},
+             {'expression': 88,
+              'function_call': 30,
+              'number': 29,
+              'variable': 33},
+             {}, {}, {}, {},
+             {'expression': 90,
+              'function_call': 30,
+              'loop_expression': 91,
+              'number': 29,
+              'variable': 33},
+             {}, {}, {}],
+ 'rr_conflicts': [],
+ 'sr_conflicts': []}
@@ -0,0 +1,130 @@
+"""Module contains pass manager, that runs optimization passes in order
+
+Passes over AST transform the whole program after parsing, and passes over
+intermediate representation transform every function after it is lowered
+and before masm code is generated from it. Every pass is enabled by an
+option of the compiler, so optimization levels and single passes are
+switched by options. Manager measures time of every pass and, when
+'measure_passes' is set, number of instructions of intermediate
+representation, that the pass adds or removes.
+"""
+
+import time
+from dataclasses import dataclass, fields
+from typing import Callable, Union
+
+from compiler.call_graph import (warn_about_dead_functions,
+                                 eliminate_dead_functions)
+from compiler.constant_folding import fold_constants
+from compiler.control_flow import (thread_jumps, duplicate_returns,
+                                   remove_unreachable_blocks)
+from compiler.inlining import inline_functions
+from compiler.ir import IRFunction
+from compiler.nodes import Program
+from compiler.options import CompilerOptions
+from compiler.tail_calls import eliminate_tail_calls
+
+
+@dataclass(frozen=True)
+class Pass:
+    """Transformation of program ('ast') or function ('ir'), that runs,
+    when option with the name is set"""
+
+    kind: str
+    run: Callable
+    option: str
+
+    def is_enabled(self, options: CompilerOptions) -> bool:
+        return bool(getattr(options, self.option))
+
+
+def _inline_functions(program: Program) -> None:
+    inline_functions(program, program.context.options.inline_threshold)
+
+
+# Passes in the order they are run, constants passed to inlined functions
+# are propagated into their bodies by folding after inlining, and inlining
+# and folding could remove calls, so functions are eliminated after them
+PASSES: dict[str, Pass] = {
+    'inline_functions': Pass('ast', _inline_functions, 'inline_threshold'),
+    'fold_constants': Pass('ast', fold_constants, 'fold_constants'),
+    'eliminate_tail_calls': Pass('ast', eliminate_tail_calls,
+                                 'eliminate_tail_calls'),
+    'warn_dead_functions': Pass('ast', warn_about_dead_functions,
+                                'warn_dead_functions'),
+    'eliminate_dead_functions': Pass('ast', eliminate_dead_functions,
+                                     'eliminate_dead_functions'),
+    'thread_jumps': Pass('ir', thread_jumps, 'thread_jumps'),
+    'duplicate_returns': Pass('ir', duplicate_returns, 'duplicate_returns'),
+    'remove_unreachable_blocks': Pass('ir', remove_unreachable_blocks,
+                                      'remove_unreachable_blocks'),
+}
+
+
+def get_options_of_pass(name: str, enabled: bool) -> dict:
+    """Options, that enable or disable the pass, enabled pass gets default
+    value of its option"""
+    option = PASSES[name].option
+    default = next(field.default for field in fields(CompilerOptions)
+                   if field.name == option)
+    if not enabled:
+        return {option: type(default)()}
+    # Options of passes, that are disabled by default, are flags
+    return {option: default or True}
+
+
+@dataclass
+class PassStatistics:
+    """Number of runs of a pass, their time and change of number of
+    instructions, which is counted only with 'measure_passes'"""
+
+    runs: int = 0
+    elapsed_time: float = 0.0
+    instruction_delta: int = 0
+
+    def add(self, other: 'PassStatistics') -> None:
+        self.runs += other.runs
+        self.elapsed_time += other.elapsed_time
+        self.instruction_delta += other.instruction_delta
+
+
+class PassManager:
+    """Runs enabled passes and collects statistics of every one of them"""
+
+    def __init__(self, options: CompilerOptions):
+        self.options = options
+        self.passes = [(name, optimization_pass)
+                       for name, optimization_pass in PASSES.items()
+                       if optimization_pass.is_enabled(options)]
+        self.statistics: dict[str, PassStatistics] = {
+            name: PassStatistics() for name, _ in self.passes}
+
+    def __count_instructions(self, target: Union[Program, IRFunction]
+                             ) -> int:
+        if isinstance(target, IRFunction):
+            return target.count_instructions()
+        return sum(function.lower(self.options).count_instructions()
+                   for function in target.contents if function is not None)
+
+    def __run_passes(self, kind: str,
+                     target: Union[Program, IRFunction]) -> None:
+        for name, optimization_pass in self.passes:
+            if optimization_pass.kind != kind:
+                continue
+            statistics = self.statistics[name]
+            if self.options.measure_passes:
+                statistics.instruction_delta -= \
+                    self.__count_instructions(target)
+            start_time = time.perf_counter()
+            optimization_pass.run(target)
+            statistics.elapsed_time += time.perf_counter() - start_time
+            statistics.runs += 1
+            if self.options.measure_passes:
+                statistics.instruction_delta += \
+                    self.__count_instructions(target)
+
+    def run_ast_passes(self, program: Program) -> None:
+        self.__run_passes('ast', program)
+
+    def run_ir_passes(self, function: IRFunction) -> None:
+        self.__run_passes('ir', function)
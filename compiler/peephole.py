@@ -0,0 +1,183 @@
+"""Module contains peephole optimizer of generated masm code
+
+Optimizer looks at short sequences of instructions of one function and
+replaces them with shorter equivalents. Every rule is a function, that
+receives lines of code and index of current line, changes lines in place
+and returns number of removed instructions, or None when it does not match.
+Blank lines are skipped when neighbouring instructions are looked for.
+"""
+
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+
+REGISTERS = frozenset(('eax', 'ebx', 'ecx', 'edx', 'esi', 'edi', 'ebp', 'esp'))
+COMPLEMENTARY_JUMPS = {
+    'je': 'jne', 'jne': 'je',
+    'jz': 'jnz', 'jnz': 'jz',
+    'jl': 'jge', 'jge': 'jl',
+    'jg': 'jle', 'jle': 'jg',
+}
+JUMPS = frozenset(('jmp', *COMPLEMENTARY_JUMPS))
+
+
+def split_instruction(line: str) -> tuple[str, list[str]]:
+    """Mnemonic of the instruction and list of its operands"""
+    parts = line.split(None, 1)
+    if not parts:
+        return '', []
+    if len(parts) == 1:
+        return parts[0], []
+    return parts[0], [operand.strip() for operand in parts[1].split(',')]
+
+
+def get_label(line: str) -> Optional[str]:
+    """Name of the label, when line is a label"""
+    line = line.strip()
+    if line.endswith(':') and ' ' not in line:
+        return line[:-1]
+    return None
+
+
+def _get_indentation(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _get_next_index(lines: list, idx: int) -> Optional[int]:
+    """Index of the next not blank line"""
+    for next_idx in range(idx + 1, len(lines)):
+        if lines[next_idx].strip():
+            return next_idx
+    return None
+
+
+def _get_following_labels(lines: list, idx: int) -> set:
+    """Labels between the line and the next instruction"""
+    labels = set()
+    next_idx = _get_next_index(lines, idx)
+    while next_idx is not None and (label := get_label(lines[next_idx])):
+        labels.add(label)
+        next_idx = _get_next_index(lines, next_idx)
+    return labels
+
+
+def _get_next_instruction(lines: list, idx: int
+                          ) -> tuple[Optional[int], str, list[str]]:
+    next_idx = _get_next_index(lines, idx)
+    if next_idx is None:
+        return None, '', []
+    return (next_idx, *split_instruction(lines[next_idx]))
+
+
+def _is_memory(operand: str) -> bool:
+    return operand not in REGISTERS and not operand.lstrip('-').isdigit()
+
+
+def remove_push_pop(lines: list, idx: int) -> Optional[int]:
+    """push X / pop X"""
+    mnemonic, operands = split_instruction(lines[idx])
+    if mnemonic != 'push':
+        return None
+    next_idx, next_mnemonic, next_operands = _get_next_instruction(lines, idx)
+    if next_mnemonic != 'pop' or next_operands != operands:
+        return None
+    del lines[next_idx]
+    del lines[idx]
+    return 2
+
+
+def replace_push_pop_with_mov(lines: list, idx: int) -> Optional[int]:
+    """push X / pop Y -> mov Y, X"""
+    mnemonic, operands = split_instruction(lines[idx])
+    if mnemonic != 'push':
+        return None
+    next_idx, next_mnemonic, next_operands = _get_next_instruction(lines, idx)
+    if next_mnemonic != 'pop' or len(next_operands) != 1:
+        return None
+    source, destination = operands[0], next_operands[0]
+    if _is_memory(source) and _is_memory(destination):
+        # There is no 'mov' from memory to memory
+        return None
+    lines[idx] = f'{_get_indentation(lines[idx])}mov {destination}, {source}'
+    del lines[next_idx]
+    return 1
+
+
+def remove_reload_of_stored_value(lines: list, idx: int) -> Optional[int]:
+    """mov X, reg / mov reg, X -> mov X, reg"""
+    mnemonic, operands = split_instruction(lines[idx])
+    if (mnemonic != 'mov' or len(operands) != 2
+            or operands[1] not in REGISTERS):
+        return None
+    next_idx, next_mnemonic, next_operands = _get_next_instruction(lines, idx)
+    if next_mnemonic != 'mov' or next_operands != operands[::-1]:
+        return None
+    del lines[next_idx]
+    return 1
+
+
+def remove_jump_to_next_label(lines: list, idx: int) -> Optional[int]:
+    """jmp L / L: -> L:"""
+    mnemonic, operands = split_instruction(lines[idx])
+    if mnemonic not in JUMPS:
+        return None
+    if operands[0] not in _get_following_labels(lines, idx):
+        return None
+    del lines[idx]
+    return 1
+
+
+def remove_complementary_jump(lines: list, idx: int) -> Optional[int]:
+    """je X / jne Y / X: -> jne Y / X:"""
+    mnemonic, operands = split_instruction(lines[idx])
+    if mnemonic not in COMPLEMENTARY_JUMPS:
+        return None
+    next_idx, next_mnemonic, _ = _get_next_instruction(lines, idx)
+    if next_mnemonic != COMPLEMENTARY_JUMPS[mnemonic]:
+        return None
+    if operands[0] not in _get_following_labels(lines, next_idx):
+        return None
+    del lines[idx]
+    return 1
+
+
+# Rules in the order they are tried
+RULES: dict[str, Callable[[list, int], Optional[int]]] = {
+    'push_pop': remove_push_pop,
+    'push_pop_to_mov': replace_push_pop_with_mov,
+    'store_reload': remove_reload_of_stored_value,
+    'jump_to_next_label': remove_jump_to_next_label,
+    'complementary_jumps': remove_complementary_jump,
+}
+
+
+class PeepholeOptimizer:
+    """Applies enabled rules to code of functions until none of them
+    matches and counts removed instructions of every rule"""
+
+    def __init__(self, rules: Iterable[str] = RULES):
+        rules = set(rules)
+        unknown_rules = rules - RULES.keys()
+        if unknown_rules:
+            raise ValueError(f'Unknown peephole rules: {unknown_rules}')
+        self.rules = [(name, rule) for name, rule in RULES.items()
+                      if name in rules]
+        self.removed_instructions: Counter[str] = Counter()
+
+    def optimize(self, asm_code: list) -> list:
+        lines = list(asm_code)
+        is_changed = True
+        while is_changed:
+            is_changed = False
+            idx = 0
+            while idx < len(lines):
+                for name, rule in self.rules:
+                    removed_instructions = rule(lines, idx)
+                    if removed_instructions is not None:
+                        self.removed_instructions[name] += \
+                            removed_instructions
+                        is_changed = True
+                        break
+                else:
+                    idx += 1
+        return lines
@@ -0,0 +1,197 @@
+"""Module contains profiler of phases of compilation
+
+Every phase is measured separately: wall and processor time, peak of
+memory allocated while it runs, number of tokens it read and number of
+nodes of the program after it. Tokens are produced lazily by the lexer, so
+they are counted when the parser takes them and time of lexing is mostly
+included into time of parsing. When code is streamed into the file, it is
+generated in 'write' phase. Memory is traced by 'tracemalloc', which
+slows compilation down, so phases are profiled only with 'profile' option.
+
+Profiles of many compilations are written as JSON report, and the whole
+run could be written as 'cProfile' statistics or as collapsed stacks, that
+are read by flame graph tools.
+"""
+
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, Iterator, Optional
+
+from compiler.nodes import BasicNode, iterate_children
+
+
+@dataclass
+class PhaseProfile:
+    """Resources, that one phase of compilation used"""
+
+    phase: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int = 0
+    tokens: int = 0
+    nodes: Optional[int] = None
+
+
+class CountingTokens:
+    """Stream of tokens, that counts tokens taken from it"""
+
+    def __init__(self, tokens: Iterable):
+        self.__tokens = iter(tokens)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = next(self.__tokens)
+        self.count += 1
+        return token
+
+
+def count_nodes(node: BasicNode) -> int:
+    number_of_nodes = 0
+    stack = [node]
+    while stack:
+        number_of_nodes += 1
+        stack.extend(iterate_children(stack.pop()))
+    return number_of_nodes
+
+
+class PhaseProfiler:
+    """Measures phases of one compilation one after another"""
+
+    def __init__(self):
+        self.profiles: list[PhaseProfile] = []
+        self.tokens: Optional[CountingTokens] = None
+        self.__counted_tokens = 0
+        self.__traces_memory = False
+
+    def start(self) -> None:
+        # Memory could be traced already by profiler of the whole run
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__traces_memory = True
+
+    def stop(self) -> None:
+        if self.__traces_memory:
+            tracemalloc.stop()
+            self.__traces_memory = False
+
+    def count_tokens(self, tokens: Iterable) -> CountingTokens:
+        self.tokens = CountingTokens(tokens)
+        self.__counted_tokens = 0
+        return self.tokens
+
+    def run_phase(self, phase: str, run: Callable[[], None]
+                  ) -> PhaseProfile:
+        profile = PhaseProfile(phase)
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        start_cpu_time = time.process_time()
+        start_wall_time = time.perf_counter()
+        try:
+            run()
+        finally:
+            profile.wall_time = time.perf_counter() - start_wall_time
+            profile.cpu_time = time.process_time() - start_cpu_time
+            _, peak_memory = tracemalloc.get_traced_memory()
+            profile.peak_memory = max(peak_memory - memory_before, 0)
+            if self.tokens is not None:
+                profile.tokens = self.tokens.count - self.__counted_tokens
+                self.__counted_tokens = self.tokens.count
+            self.profiles.append(profile)
+        return profile
+
+
+def make_profile_report(results: Iterable) -> dict:
+    """Report with profiles of phases of every compiled file and their
+    totals"""
+    files = []
+    totals: dict[str, Counter] = dict()
+    for result in results:
+        files.append({
+            'path': result.path_to_source_file,
+            'succeeded': result.succeeded,
+            'from_cache': result.from_cache,
+            'phases': [asdict(profile) for profile in result.profile],
+        })
+        for profile in result.profile:
+            total = totals.setdefault(profile.phase, Counter())
+            total.update(wall_time=profile.wall_time,
+                         cpu_time=profile.cpu_time, tokens=profile.tokens,
+                         nodes=profile.nodes or 0)
+            # Peaks of phases are not summed, files are compiled one by one
+            total['peak_memory'] = max(total['peak_memory'],
+                                       profile.peak_memory)
+    return {
+        'files': files,
+        'totals': {phase: dict(total) for phase, total in totals.items()},
+    }
+
+
+def write_profile_report(path: str, results: Iterable) -> None:
+    with open(path, 'w') as report_file:
+        json.dump(make_profile_report(results), report_file, indent=4)
+
+
+def _get_name_of_function(function: tuple) -> str:
+    file_name, line, name = function
+    if file_name == '~':
+        # Built-in functions
+        return name
+    return f'{name} ({file_name}:{line})'
+
+
+def iterate_collapsed_stacks(statistics: pstats.Stats
+                             ) -> Iterator[tuple[str, int]]:
+    """Stacks of calls and their own time in microseconds
+
+    'cProfile' keeps only edges between callers and callees, so time of a
+    function is split between its callers in proportion to time of calls
+    from them, and recursive calls are not followed.
+    """
+    stats = statistics.stats
+    callees: dict[tuple, list[tuple]] = {function: [] for function in stats}
+    for function, (*_, callers) in stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(function)
+
+    roots = [function for function, (*_, callers) in stats.items()
+             if not callers]
+    # Function, its share of time in the stack and names of stack
+    stack = [(function, 1.0, (_get_name_of_function(function),))
+             for function in roots]
+    while stack:
+        function, share, names = stack.pop()
+        _, _, own_time, cumulative_time, _ = stats[function]
+        own_microseconds = round(own_time * share * 1_000_000)
+        if own_microseconds:
+            yield ';'.join(names), own_microseconds
+        if not cumulative_time:
+            continue
+        for callee in callees.get(function, ()):
+            name = _get_name_of_function(callee)
+            if name in names:
+                continue
+            callee_time = stats[callee][3]
+            *_, edge_time = stats[callee][4][function]
+            # Calls, that take less than a microsecond in the stack, are
+            # dropped
+            if edge_time * share >= 1e-6:
+                stack.append((callee, share * edge_time / callee_time,
+                              (*names, name)))
+
+
+def write_collapsed_stacks(path: str, profile: cProfile.Profile) -> None:
+    stacks = Counter()
+    for stack, own_microseconds in iterate_collapsed_stacks(
+            pstats.Stats(profile)):
+        stacks[stack] += own_microseconds
+    with open(path, 'w') as stacks_file:
+        stacks_file.writelines(f'{stack} {microseconds}\n'
+                               for stack, microseconds in stacks.items())
@@ -0,0 +1,356 @@
+"""Module contains linear scan register allocator of expression temporaries
+
+Code of every statement is built as a list of instructions, whose operands
+are registers, variables, numbers and temporaries. Live interval of a
+temporary spans from its first to its last appearance, which is exact for
+code of a statement, because it has only forward jumps. Temporaries get
+registers, that are not used by instructions with fixed registers (like
+'idiv' or 'invoke') during their intervals, and are spilled to stack slots
+when registers run out.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+from compiler.miscellaneous import is_number
+
+if TYPE_CHECKING:
+    from compiler.context import CompilationContext
+
+
+# Registers in the order they are given to temporaries, registers that are
+# not changed by procedures go last, because they are saved on entry
+ALLOCATABLE_REGISTERS = ('eax', 'ecx', 'edx', 'ebx', 'esi', 'edi')
+CALLEE_SAVED_REGISTERS = ('ebx', 'esi', 'edi')
+# Register, that moves values between two memory operands, it is reserved
+# only when some temporaries are spilled
+SCRATCH_REGISTER = 'edi'
+REGISTER_PARTS = {'al': 'eax', 'dl': 'edx'}
+
+# Registers read and written by instructions besides their operands
+IMPLICIT_READS = {'cdq': ('eax',), 'idiv': ('eax', 'edx'), 'ret': ('eax',)}
+IMPLICIT_WRITES = {'cdq': ('edx',), 'idiv': ('eax', 'edx'),
+                   'invoke': ('eax', 'ecx', 'edx')}
+# Instructions that only read their operands
+READING_MNEMONICS = frozenset(('cmp', 'test', 'push', 'invoke', 'idiv'))
+# Instructions that only write their first operand
+WRITING_MNEMONICS = frozenset(('mov', 'movzx', 'lea'))
+
+
+class Temporary:
+    """Intermediate value of expression"""
+
+    __slots__ = ('index',)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self):
+        return f't{self.index}'
+
+
+Location = Union[str, Temporary]
+
+
+class Address:
+    """Address 'base + base * scale' computed by 'lea'"""
+
+    __slots__ = ('base', 'scale')
+
+    def __init__(self, base: Location, scale: int):
+        self.base = base
+        self.scale = scale
+
+    def __str__(self):
+        return f'[{self.base}+{self.base}*{self.scale}]'
+
+
+Operand = Union[Location, Address]
+
+
+def get_temporaries(operand: Operand) -> tuple:
+    """Temporaries, that are read or written through the operand"""
+    if isinstance(operand, Address):
+        operand = operand.base
+    return (operand,) if isinstance(operand, Temporary) else ()
+
+
+def get_name_of_spill_slot(slot: int) -> str:
+    return f'spill{slot}'
+
+
+def is_register(operand: Location) -> bool:
+    return operand in ALLOCATABLE_REGISTERS or operand in REGISTER_PARTS
+
+
+def is_memory(operand: str) -> bool:
+    return not is_register(operand) and not is_number(operand)
+
+
+def is_variable(operand: Location) -> bool:
+    """Location is a variable in memory, but not a temporary"""
+    return isinstance(operand, str) and is_memory(operand)
+
+
+class Instruction:
+    """Instruction, label (mnemonic ends with ':') or blank line"""
+
+    __slots__ = ('mnemonic', 'operands')
+
+    def __init__(self, mnemonic: str, *operands: Operand):
+        self.mnemonic = mnemonic
+        self.operands = operands
+
+    def is_label(self) -> bool:
+        return self.mnemonic == '' or self.mnemonic.endswith(':')
+
+    def get_fixed_registers(self) -> tuple[set, set]:
+        """Registers read and written by the instruction"""
+        reads = set(IMPLICIT_READS.get(self.mnemonic, ()))
+        writes = set(IMPLICIT_WRITES.get(self.mnemonic, ()))
+        if self.mnemonic == 'imul' and len(self.operands) == 1:
+            # One operand form multiplies 'eax' into 'edx:eax'
+            reads.add('eax')
+            writes.update(('eax', 'edx'))
+        for idx, operand in enumerate(self.operands):
+            if not is_register(operand):
+                continue
+            register = REGISTER_PARTS.get(operand, operand)
+            if (idx > 0 or self.mnemonic in READING_MNEMONICS
+                    or self.mnemonic.startswith('j')):
+                reads.add(register)
+            elif (self.mnemonic in WRITING_MNEMONICS
+                    or self.mnemonic.startswith('set')):
+                writes.add(register)
+            else:
+                reads.add(register)
+                writes.add(register)
+        return reads, writes
+
+
+class LiveInterval:
+
+    __slots__ = ('temporary', 'start', 'end', 'register', 'spill_slot')
+
+    def __init__(self, temporary: Temporary, start: int):
+        self.temporary = temporary
+        self.start = start
+        self.end = start
+        self.register: Optional[str] = None
+        self.spill_slot: Optional[int] = None
+
+    def overlaps(self, start: int, end: int) -> bool:
+        # Interval could start where other one ends, because instruction
+        # reads its operands before it writes the result
+        return self.start < end and start < self.end
+
+
+def build_live_intervals(instructions: list) -> list[LiveInterval]:
+    intervals: dict[Temporary, LiveInterval] = dict()
+    for position, instruction in enumerate(instructions):
+        for operand in instruction.operands:
+            for temporary in get_temporaries(operand):
+                if temporary in intervals:
+                    intervals[temporary].end = position
+                else:
+                    intervals[temporary] = LiveInterval(temporary, position)
+    return sorted(intervals.values(), key=lambda interval: interval.start)
+
+
+def build_fixed_intervals(instructions: list) -> dict[str, list]:
+    """Intervals, during which registers keep values of fixed registers
+    of instructions"""
+    fixed_intervals = {register: [] for register in ALLOCATABLE_REGISTERS}
+    open_intervals: dict[str, list] = dict()
+    for position, instruction in enumerate(instructions):
+        reads, writes = instruction.get_fixed_registers()
+        for register in reads:
+            open_intervals.setdefault(register, [0, position])[1] = position
+        for register in writes:
+            if register in open_intervals:
+                fixed_intervals[register].append(open_intervals[register])
+            open_intervals[register] = [position, position]
+    for register, interval in open_intervals.items():
+        fixed_intervals[register].append(interval)
+    return fixed_intervals
+
+
+class LinearScanAllocator:
+    """Assigns registers to live intervals, that are sorted by start, and
+    spills interval that ends last, when there is no free register"""
+
+    def __init__(self, registers: tuple = ALLOCATABLE_REGISTERS):
+        self.registers = registers
+
+    @staticmethod
+    def __fits(interval: LiveInterval, register: str,
+               fixed_intervals: dict[str, list]) -> bool:
+        return not any(interval.overlaps(start, end)
+                       for start, end in fixed_intervals[register])
+
+    def allocate(self, instructions: list) -> list[LiveInterval]:
+        intervals = build_live_intervals(instructions)
+        fixed_intervals = build_fixed_intervals(instructions)
+
+        active: list[LiveInterval] = []
+        spilled: list[LiveInterval] = []
+        for interval in intervals:
+            for active_interval in active.copy():
+                if active_interval.end <= interval.start:
+                    active.remove(active_interval)
+
+            busy_registers = {active_interval.register
+                              for active_interval in active}
+            for register in self.registers:
+                if (register not in busy_registers
+                        and self.__fits(interval, register, fixed_intervals)):
+                    interval.register = register
+                    active.append(interval)
+                    break
+            else:
+                victims = [
+                    active_interval for active_interval in active
+                    if active_interval.end > interval.end
+                    and self.__fits(interval, active_interval.register,
+                                    fixed_intervals)
+                ]
+                if victims:
+                    victim = max(victims, key=lambda victim: victim.end)
+                    interval.register = victim.register
+                    victim.register = None
+                    active.remove(victim)
+                    active.append(interval)
+                    spilled.append(victim)
+                else:
+                    spilled.append(interval)
+
+        self.__assign_spill_slots(spilled)
+        return intervals
+
+    @staticmethod
+    def __assign_spill_slots(spilled: list[LiveInterval]) -> None:
+        occupied_slots: list[LiveInterval] = []
+        for interval in sorted(spilled, key=lambda interval: interval.start):
+            free_slots = set(range(len(spilled)))
+            for other_interval in occupied_slots:
+                if other_interval.end > interval.start:
+                    free_slots.discard(other_interval.spill_slot)
+            interval.spill_slot = min(free_slots)
+            occupied_slots.append(interval)
+
+
+class StatementCode:
+    """Instructions of one statement, whose temporaries are replaced by
+    registers or spill slots when code is generated"""
+
+    __slots__ = ('context', 'instructions', '__number_of_temporaries')
+
+    def __init__(self, context: CompilationContext):
+        self.context = context
+        self.instructions: list[Instruction] = []
+        self.__number_of_temporaries = 0
+
+    def new_temporary(self) -> Temporary:
+        temporary = Temporary(self.__number_of_temporaries)
+        self.__number_of_temporaries += 1
+        return temporary
+
+    def emit(self, mnemonic: str, *operands: Operand) -> None:
+        self.instructions.append(Instruction(mnemonic, *operands))
+
+    def emit_label(self, label: str) -> None:
+        self.instructions.append(Instruction(f'{label}:'))
+
+    def load(self, operand: Location) -> Temporary:
+        """Temporary with value of the operand, temporaries are not copied,
+        because every one of them is used once"""
+        if isinstance(operand, Temporary):
+            return operand
+        temporary = self.new_temporary()
+        self.emit('mov', temporary, operand)
+        return temporary
+
+    def __allocate(self) -> tuple[dict, Optional[str]]:
+        intervals = LinearScanAllocator().allocate(self.instructions)
+        scratch_register = None
+        if any(interval.register is None for interval in intervals):
+            scratch_register = SCRATCH_REGISTER
+            intervals = LinearScanAllocator(tuple(
+                register for register in ALLOCATABLE_REGISTERS
+                if register != scratch_register
+            )).allocate(self.instructions)
+
+        locations = dict()
+        for interval in intervals:
+            if interval.register is not None:
+                locations[interval.temporary] = interval.register
+                if interval.register in CALLEE_SAVED_REGISTERS:
+                    self.context.use_register(interval.register)
+            else:
+                locations[interval.temporary] = \
+                    get_name_of_spill_slot(interval.spill_slot)
+                self.context.use_spill_slot(interval.spill_slot)
+        if scratch_register is not None:
+            self.context.use_register(scratch_register)
+        return locations, scratch_register
+
+    @staticmethod
+    def __legalize(mnemonic: str, operands: list,
+                   scratch_register: Optional[str]) -> list[tuple]:
+        """Instructions with spilled temporaries are rewritten through
+        the scratch register, when they do not accept memory operands"""
+        if mnemonic == 'mov' and operands[0] == operands[1]:
+            return []
+        if mnemonic == 'lea' and is_memory(operands[1].base):
+            # Address is computed only from registers
+            return [('mov', [scratch_register, operands[1].base]),
+                    ('lea', [scratch_register,
+                             Address(scratch_register, operands[1].scale)]),
+                    ('mov', [operands[0], scratch_register])]
+        if len(operands) < 2 or not is_memory(operands[0]):
+            return [(mnemonic, operands)]
+
+        destination, source = operands[0], operands[1]
+        if mnemonic == 'imul':
+            if len(operands) == 3:
+                return [('imul', [scratch_register, *operands[1:]]),
+                        ('mov', [destination, scratch_register])]
+            return [('mov', [scratch_register, destination]),
+                    ('imul', [scratch_register, source]),
+                    ('mov', [destination, scratch_register])]
+        if mnemonic == 'movzx':
+            return [('movzx', [scratch_register, source]),
+                    ('mov', [destination, scratch_register])]
+        if is_memory(source) and mnemonic != 'invoke':
+            return [('mov', [scratch_register, source]),
+                    (mnemonic, [destination, scratch_register])]
+        return [(mnemonic, operands)]
+
+    @staticmethod
+    def __get_location(operand: Operand, locations: dict) -> Operand:
+        if isinstance(operand, Address):
+            return Address(locations.get(operand.base, operand.base),
+                           operand.scale)
+        if isinstance(operand, Temporary):
+            return locations.get(operand, operand)
+        return f'{operand}'
+
+    def generate_asm_code(self) -> list:
+        locations, scratch_register = self.__allocate()
+
+        asm_code = []
+        for instruction in self.instructions:
+            if instruction.is_label():
+                asm_code.append(f'  {instruction.mnemonic}'.rstrip())
+                continue
+            operands = [self.__get_location(operand, locations)
+                        for operand in instruction.operands]
+            for mnemonic, operands in self.__legalize(
+                    instruction.mnemonic, operands, scratch_register):
+                if operands:
+                    asm_code.append(
+                        f'  {mnemonic} {", ".join(map(str, operands))}')
+                else:
+                    asm_code.append(f'  {mnemonic}')
+        return asm_code
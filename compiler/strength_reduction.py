@@ -0,0 +1,155 @@
+"""Module contains strength reduction of operations with constants
+
+Multiplication by a constant is done by shifts, 'lea' and additions, when
+the constant has a short form, and division by a constant by shifts or by
+multiplication with a magic number, whose high half of the product is the
+quotient (T. Granlund, P. Montgomery, "Division by invariant integers
+using multiplication"). Results are the same as results of 'imul' and
+'idiv', including negative operands and wrap-around.
+"""
+
+from typing import Optional
+
+from compiler.miscellaneous import is_number, to_int32
+from compiler.register_allocator import (Address, Location, StatementCode,
+                                         Temporary)
+
+
+# Factors, that 'lea' multiplies by, and their scales
+LEA_FACTORS = {3: 2, 5: 4, 9: 8}
+
+
+def _get_power_of_two(value: int) -> Optional[int]:
+    if value > 0 and value & (value - 1) == 0:
+        return value.bit_length() - 1
+    return None
+
+
+def get_magic_number(divisor: int) -> tuple[int, int]:
+    """Signed 32-bit multiplier and shift of division by the divisor, which
+    is not -1, 0, 1 or power of two"""
+    two_31 = 2 ** 31
+    absolute_divisor = abs(divisor)
+    t = two_31 + (divisor < 0)
+    absolute_nc = t - 1 - t % absolute_divisor
+    power = 31
+    q1, r1 = divmod(two_31, absolute_nc)
+    q2, r2 = divmod(two_31, absolute_divisor)
+    while True:
+        power += 1
+        q1, r1 = 2 * q1, 2 * r1
+        if r1 >= absolute_nc:
+            q1, r1 = q1 + 1, r1 - absolute_nc
+        q2, r2 = 2 * q2, 2 * r2
+        if r2 >= absolute_divisor:
+            q2, r2 = q2 + 1, r2 - absolute_divisor
+        delta = absolute_divisor - r2
+        if not (q1 < delta or q1 == delta and r1 == 0):
+            break
+    multiplier = to_int32(q2 + 1)
+    if divisor < 0:
+        multiplier = to_int32(-multiplier)
+    return multiplier, power - 32
+
+
+def _get_short_form(multiplier: int) -> Optional[tuple]:
+    """Operation and its parameters, that multiply by positive constant
+    faster than 'imul', or None"""
+    if (shift := _get_power_of_two(multiplier)) is not None:
+        return 'shl', shift
+    for factor, scale in LEA_FACTORS.items():
+        if (multiplier % factor == 0
+                and (shift := _get_power_of_two(multiplier // factor))
+                is not None):
+            return 'lea', scale, shift
+    if (shift := _get_power_of_two(multiplier - 1)) is not None:
+        return 'add', shift
+    if (shift := _get_power_of_two(multiplier + 1)) is not None:
+        return 'sub', shift
+    return None
+
+
+def can_multiply_by_constant(multiplier: int) -> bool:
+    # Multiplier -2 ** 31 has absolute value 2 ** 31, and shift by 31 gives
+    # the same product
+    return _get_short_form(abs(to_int32(multiplier))) is not None
+
+
+def can_divide_by_constant(divisor: int) -> bool:
+    # Division by zero and overflow of division by -1 trap in 'idiv'
+    return to_int32(divisor) not in (-1, 0)
+
+
+def multiply_by_constant(operand_in_asm: Location, multiplier: int,
+                         code: StatementCode) -> Optional[Temporary]:
+    """Temporary with product or None, when 'imul' is better"""
+    if not can_multiply_by_constant(multiplier):
+        return None
+
+    multiplier = to_int32(multiplier)
+    short_form = _get_short_form(abs(multiplier))
+    result = code.load(operand_in_asm)
+    operation, *parameters = short_form
+    if operation == 'shl':
+        if parameters[0]:
+            code.emit('shl', result, f'{parameters[0]}')
+    elif operation == 'lea':
+        scale, shift = parameters
+        code.emit('lea', result, Address(result, scale))
+        if shift:
+            code.emit('shl', result, f'{shift}')
+    else:
+        copy = code.new_temporary()
+        code.emit('mov', copy, result)
+        code.emit('shl', result, f'{parameters[0]}')
+        code.emit(operation, result, copy)
+    if multiplier < 0:
+        code.emit('neg', result)
+    return result
+
+
+def divide_by_constant(operand_in_asm: Location, divisor: int,
+                       code: StatementCode) -> Optional[Temporary]:
+    """Temporary with quotient truncated toward zero or None, when division
+    traps and has to be done by 'idiv'"""
+    if not can_divide_by_constant(divisor):
+        return None
+
+    divisor = to_int32(divisor)
+    if divisor == 1:
+        return code.load(operand_in_asm)
+
+    if (shift := _get_power_of_two(abs(divisor))) is not None:
+        # Negative dividend is rounded toward zero by adding divisor - 1
+        # before arithmetic shift
+        result = code.load(operand_in_asm)
+        correction = code.new_temporary()
+        code.emit('mov', correction, result)
+        if shift > 1:
+            code.emit('sar', correction, '31')
+        code.emit('shr', correction, f'{32 - shift}')
+        code.emit('add', result, correction)
+        code.emit('sar', result, f'{shift}')
+        if divisor < 0:
+            code.emit('neg', result)
+        return result
+
+    multiplier, shift = get_magic_number(divisor)
+    dividend = operand_in_asm
+    if is_number(dividend):
+        # One operand 'imul' does not accept immediate
+        dividend = code.load(dividend)
+    code.emit('mov', 'eax', f'{multiplier}')
+    code.emit('imul', dividend)
+    if divisor > 0 and multiplier < 0:
+        code.emit('add', 'edx', dividend)
+    elif divisor < 0 and multiplier > 0:
+        code.emit('sub', 'edx', dividend)
+    if shift:
+        code.emit('sar', 'edx', f'{shift}')
+    # Quotient is rounded toward zero by adding its sign bit
+    result = code.new_temporary()
+    code.emit('mov', result, 'edx')
+    code.emit('shr', result, '31')
+    code.emit('add', result, 'edx')
+    return result
@@ -0,0 +1,145 @@
+"""Module contains elimination of tail calls of functions by themselves
+
+Returned call of the function by itself, also in branches of ternary
+operators, is replaced by jump to the beginning of the function with new
+values of arguments. When returned value is result of '+' or '*' of such
+call and other operand, the operand is added to accumulator before the
+jump, and every returned value is combined with accumulator, so linear
+recursion becomes a loop too. Operations are done in 32-bit wrap-around
+arithmetic, so changed order of them does not change results.
+"""
+
+from typing import Callable
+
+from compiler.miscellaneous import Recursion, run_iteratively
+from compiler.nodes import (DoWhileLoop, Function, Return, BinaryExpression,
+                            TernaryExpression, FunctionCall,
+                            VariableInitialization, Variable, Program,
+                            Operand, TailCall)
+
+
+# Operations, that could be accumulated, and initial values of accumulator
+ACCUMULATED_OPERATORS = {'+': 0, '*': 1}
+
+
+def _get_returns(body: list) -> list[Return]:
+    returns = []
+    for instruction in body:
+        if isinstance(instruction, Return):
+            returns.append(instruction)
+        elif isinstance(instruction, DoWhileLoop):
+            returns.extend(_get_returns(instruction.body))
+    return returns
+
+
+def _get_returned_operands(operand: Operand) -> list[Operand]:
+    """Operands, whose values are returned, in branches of ternaries"""
+    returned_operands = []
+    stack = [operand]
+    while stack:
+        operand = stack.pop()
+        if isinstance(operand, TernaryExpression):
+            stack.extend((operand.right_operand, operand.left_operand))
+        else:
+            returned_operands.append(operand)
+    return returned_operands
+
+
+def _iterate_replacement(operand: Operand,
+                         replace: Callable[[Operand], Operand]
+                         ) -> Recursion[Operand]:
+    if isinstance(operand, TernaryExpression):
+        operand.left_operand = yield _iterate_replacement(
+            operand.left_operand, replace)
+        operand.right_operand = yield _iterate_replacement(
+            operand.right_operand, replace)
+        return operand
+    return replace(operand)
+
+
+def _replace_returned_operands(operand: Operand,
+                               replace: Callable[[Operand], Operand]
+                               ) -> Operand:
+    return run_iteratively(_iterate_replacement(operand, replace))
+
+
+class TailCallEliminator:
+    """Replaces returned recursive calls of one function by jumps"""
+
+    def __init__(self, function: Function, program: Program):
+        self.function = function
+        self.context = program.context
+
+    def __is_recursive_call(self, operand: Operand) -> bool:
+        return (isinstance(operand, FunctionCall)
+                and operand.function is self.function
+                and len(operand.arguments) == len(self.function.arguments))
+
+    def __get_accumulated_call(self, operand: Operand
+                               ) -> tuple[FunctionCall, Operand]:
+        """Recursive call and the other operand of accumulated operation"""
+        if self.__is_recursive_call(operand.right_operand):
+            return operand.right_operand, operand.left_operand
+        return operand.left_operand, operand.right_operand
+
+    def __is_accumulated_call(self, operand: Operand) -> bool:
+        return (isinstance(operand, BinaryExpression)
+                and operand.operator in ACCUMULATED_OPERATORS
+                and (self.__is_recursive_call(operand.left_operand)
+                     or self.__is_recursive_call(operand.right_operand)))
+
+    def __create_accumulator(self, operator: str) -> Variable:
+        name = 'accumulator'
+        number = 0
+        while (self.function.variable_exists(name)
+               or self.context.get_function(name) is not None):
+            number += 1
+            name = f'accumulator_{number}'
+        self.context.set_current_function(self.function.name)
+        accumulator = Variable('int', name, self.context)
+        self.function.accumulator = VariableInitialization(
+            name, self.context,
+            expression=ACCUMULATED_OPERATORS[operator])
+        return accumulator
+
+    def eliminate(self) -> None:
+        returns = _get_returns(self.function.body)
+        returned_operands = [operand for instruction in returns
+                             for operand in
+                             _get_returned_operands(instruction.argument)]
+        operators = {operand.operator for operand in returned_operands
+                     if self.__is_accumulated_call(operand)}
+        if (not operators and not any(self.__is_recursive_call(operand)
+                                      for operand in returned_operands)):
+            return
+
+        accumulator = None
+        operator = None
+        if len(operators) == 1:
+            # Accumulator keeps results of only one kind of operations
+            operator = operators.pop()
+            accumulator = self.__create_accumulator(operator)
+
+        def replace(operand: Operand) -> Operand:
+            if self.__is_recursive_call(operand):
+                return TailCall(operand)
+            if (accumulator is not None
+                    and self.__is_accumulated_call(operand)):
+                call, accumulated_operand = \
+                    self.__get_accumulated_call(operand)
+                return TailCall(call, accumulator, BinaryExpression(
+                    accumulator, accumulated_operand, operator))
+            if accumulator is not None:
+                return BinaryExpression(accumulator, operand, operator)
+            return operand
+
+        for instruction in returns:
+            instruction.argument = _replace_returned_operands(
+                instruction.argument, replace)
+        self.function.has_tail_calls = True
+
+
+def eliminate_tail_calls(program: Program) -> None:
+    for function in program.contents:
+        if function is not None:
+            TailCallEliminator(function, program).eliminate()
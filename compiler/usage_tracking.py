@@ -0,0 +1,90 @@
+"""Module contains pass, that finds runtime code used by a program
+
+Generated program needs helper procedures only for operations, that are
+not generated inline, and libraries only for routines, that are called by
+its code. Pass walks over nodes of every function and records both, so
+code generator emits nothing the program does not use.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from compiler.masm_backend import get_helper_procedure
+from compiler.nodes import (BinaryExpression, DoWhileLoop, TernaryExpression,
+                            Program, iterate_children)
+from compiler.options import CompilerOptions
+
+
+# Libraries of routines, that are called by start up code of every program
+START_UP_ROUTINES = ('printf', 'input', 'exit')
+ROUTINE_LIBRARIES = {
+    'printf': ('msvcrt',),
+    'input': ('masm32', 'kernel32'),
+    'exit': ('kernel32',),
+}
+
+
+@dataclass
+class RuntimeUsage:
+    """Helper procedures and libraries referenced by a program"""
+
+    helper_procedures: set = field(default_factory=set)
+    libraries: set = field(default_factory=set)
+
+    def use_routine(self, routine: str) -> None:
+        self.libraries.update(ROUTINE_LIBRARIES[routine])
+
+
+def _iterate_operations(program: Program, options: CompilerOptions
+                        ) -> Iterator[tuple[BinaryExpression, bool]]:
+    """Binary operations and whether they are conditions of jumps"""
+    stack = [(node, False) for node in iterate_children(program)]
+    while stack:
+        node, is_condition = stack.pop()
+        if isinstance(node, BinaryExpression):
+            yield node, is_condition
+            # Operands of short-circuit logical operations are conditions
+            # of jumps
+            is_condition = (options.short_circuit
+                            and node.operator
+                            in BinaryExpression.LOGICAL_OPERATORS)
+            stack.extend((operand, is_condition)
+                         for operand in iterate_children(node))
+        elif isinstance(node, DoWhileLoop):
+            stack.extend((instruction, False) for instruction in node.body)
+            stack.append((node.expression, True))
+        elif isinstance(node, TernaryExpression):
+            stack.append((node.condition, True))
+            stack.append((node.left_operand, False))
+            stack.append((node.right_operand, False))
+        else:
+            stack.extend((child, False) for child in iterate_children(node))
+
+
+def _get_helper_procedure(operation: BinaryExpression, is_condition: bool,
+                          options: CompilerOptions) -> Optional[str]:
+    """Helper procedure of the operation, logical operations with
+    short-circuit evaluation and comparisons fused with jumps are lowered
+    into branches and do not need any"""
+    if (operation.operator in BinaryExpression.LOGICAL_OPERATORS
+            and options.short_circuit):
+        return None
+    if (is_condition and options.fuse_comparisons
+            and operation.operator in BinaryExpression.COMPARISONS):
+        return None
+    return get_helper_procedure(operation.operator, operation.left_operand,
+                                operation.right_operand, options)
+
+
+def collect_runtime_usage(program: Program) -> RuntimeUsage:
+    usage = RuntimeUsage()
+    for routine in START_UP_ROUTINES:
+        usage.use_routine(routine)
+
+    options = program.context.options
+    for operation, is_condition in _iterate_operations(program, options):
+        helper_procedure = _get_helper_procedure(operation, is_condition,
+                                                 options)
+        if helper_procedure is not None:
+            usage.helper_procedures.add(helper_procedure)
+    return usage
@@ -2,8 +2,6 @@ import json
 # import sys
 
 
-# sys.setrecursionlimit(10**5)
-
 # if not sys.warnoptions:
 #     import warnings
 #     warnings.simplefilter("ignore")